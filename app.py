@@ -1,23 +1,18 @@
 # import 문을 먼저 선언
 import os
 import streamlit as st
-import subprocess
-import io
-import re
-import tempfile
-import sys
 import platform
-import numpy as np
 from PIL import Image
 import time
-import shutil
-import base64
-from io import BytesIO
 import json
+import hashlib
+import uuid
+from collections import OrderedDict
 
-# 추가 검증 모듈 불러오기
+# 추가 검증 모듈 불러오기 (페이지간 검증 자체는 검출 엔진의 validate_document에서 수행)
 try:
-    from validator_addon import validate_pages_p_values, validate_pages_s_values, process_page_validation
+    from validator_addon import (validate_pages_p_values, validate_pages_s_values, process_page_validation,
+                                 validate_cross_page, display_page_validation)
 except ImportError:
     # 모듈이 없는 경우를 처리
     st.warning("페이지간 검증 기능을 사용할 수 없습니다. validator_addon.py 파일을 확인하세요.")
@@ -31,6 +26,40 @@ except ImportError:
         
     def process_page_validation(page_results, slide_images, page_tabs, session_state):
         return page_results
+    
+    def validate_cross_page(page_results, validation_mode):
+        return page_results
+    
+    def display_page_validation(page_results, slide_images, page_tabs, validation_mode):
+        pass
+
+# 디코딩 결과 캐시 모듈 불러오기
+try:
+    from decode_cache import DecodeCache
+    HAVE_DECODE_CACHE = True
+except ImportError:
+    HAVE_DECODE_CACHE = False
+    st.warning("디코딩 결과 캐시 기능을 사용할 수 없습니다. decode_cache.py 파일을 확인하세요.")
+
+# Office 변환 서버 모듈 불러오기
+try:
+    from office_converter import (OfficeConverterPool, CommandConverterPool, ConversionMetrics, ConversionCache,
+                                  have_uno)
+    HAVE_OFFICE_CONVERTER = True
+except ImportError:
+    HAVE_OFFICE_CONVERTER = False
+    st.warning("Office 변환 감시 기능을 사용할 수 없습니다. office_converter.py 파일을 확인하세요.")
+    
+    # 폴백 함수 정의
+    def have_uno():
+        return False
+
+# 검출/검증 엔진 (추출 -> 검출 -> 검증 파이프라인, 일괄 검증 CLI와 공유)
+from datamatrix_engine import (DEFAULT_CONFIG, DECODE_CACHE_DB, CONVERSION_CACHE_DIR, PDF_RENDER_SCALE,
+                               probe_dependencies, message_handler, configure_opencv_threads,
+                               get_page_worker_count, run_page_detection, render_pdf_page_thumbnail,
+                               extract_document_pages, detect_document_pages, validate_detections,
+                               summarize_page_results, get_validation_config)
 
 # 디버그 메시지 표시 함수
 def debug_info(message):
@@ -38,6 +67,21 @@ def debug_info(message):
     if st.session_state.get('admin_mode', False):
         st.info(message)
 
+def show_engine_message(level, message):
+    """검출 엔진의 처리 메시지를 Streamlit UI에 표시 (디버그 메시지는 관리자에게만 표시)
+
+    main()을 실행하는 스크립트 스레드에만 지정하며, 작업자 프로세스의 검출 메시지도 엔진이 이 스레드로
+    가져와 전달합니다.
+    """
+    if level == "debug":
+        debug_info(message)
+    elif level == "error":
+        st.error(message)
+    elif level == "warning":
+        st.warning(message)
+    else:
+        st.info(message)
+
 # 설정 파일 경로 (절대 경로 사용)
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datamatrix_config.json")
 # 디버그: 설정 파일 경로 정의
@@ -45,18 +89,15 @@ print(f"설정 파일 경로: {CONFIG_FILE}")
 
 def load_config():
     """설정 파일에서 구성 불러오기"""
-    default_config = {
-        "b_range_check": False,
-        "b_min_value": 80,
-        "b_max_value": 250,
-        "i_n_check": True,
-        "i_to_n_mapping": {str(i): 10 for i in range(10, 60)}
-    }
+    default_config = dict(DEFAULT_CONFIG)
     
     try:
         if os.path.exists(CONFIG_FILE):
             with open(CONFIG_FILE, 'r') as f:
-                return json.load(f)
+                # 이전 버전 설정 파일에 없는 항목은 기본값으로 채움
+                config = dict(default_config)
+                config.update(json.load(f))
+                return config
         else:
             # 설정 파일이 없으면 기본 설정 저장
             with open(CONFIG_FILE, 'w') as f:
@@ -96,7 +137,15 @@ def save_current_config():
         "b_min_value": st.session_state.b_min_value,
         "b_max_value": st.session_state.b_max_value,
         "i_n_check": st.session_state.i_n_check,
-        "i_to_n_mapping": st.session_state.i_to_n_mapping
+        "i_to_n_mapping": st.session_state.i_to_n_mapping,
+        "page_decode_budget_sec": st.session_state.page_decode_budget_sec,
+        "page_workers": st.session_state.page_workers,
+        "decode_threads": st.session_state.decode_threads,
+        "decode_cache_mb": st.session_state.decode_cache_mb,
+        "decode_cache_disk": st.session_state.decode_cache_disk,
+        "office_pool_size": st.session_state.office_pool_size,
+        "office_direct_first": st.session_state.office_direct_first,
+        "conversion_cache_mb": st.session_state.conversion_cache_mb
     }
     
     result = save_config(config)
@@ -112,14 +161,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 초기 설정 스크립트 실행 (페이지 설정 이후)
-try:
-    if os.path.exists("init_script.sh"):
-        subprocess.run(["bash", "init_script.sh"], check=True)
-        st.success("시스템 라이브러리 설치 완료")
-except Exception as e:
-    st.warning(f"시스템 라이브러리 설치 중 오류 발생: {str(e)}")
-
 # CSS 스타일 적용
 st.markdown("""
 <style>
@@ -170,69 +211,34 @@ background-color: #4CAF50;
 </style>
 """, unsafe_allow_html=True)
 
-# 각 라이브러리 개별 로드 시도
-# OpenCV 로드 시도
-try:
-    import cv2
-    HAVE_CV2 = True
-except ImportError:
-    HAVE_CV2 = False
+# 각 라이브러리 설치 여부 안내 (라이브러리는 검출 엔진이 처음 사용할 때 불러오며, 설치 여부는 프로세스당 한 번만 확인)
+dependencies = probe_dependencies()
+
+if not dependencies["cv2"]:
     st.warning("OpenCV (cv2) 라이브러리를 불러올 수 없습니다. 이미지 처리 기능이 제한됩니다.")
 
-# pylibdmtx 로드 시도
-try:
-    from pylibdmtx.pylibdmtx import decode
-    HAVE_PYLIBDMTX = True
-except ImportError:
-    HAVE_PYLIBDMTX = False
-    import platform
+if not dependencies["pylibdmtx"]:
     if platform.system() == "Windows":
         st.warning("pylibdmtx 라이브러리를 불러올 수 없습니다.")
         st.info("Windows에서 pylibdmtx 설치하기: pip install pylibdmtx 후 libdmtx.dll 파일을 Python 실행 폴더에 복사하세요.")
     else:
         st.warning("pylibdmtx 라이브러리를 불러올 수 없습니다. 바코드 검출 기능을 사용할 수 없습니다.")
         st.info("pylibdmtx 설치를 위해서는 libdmtx 시스템 라이브러리가 필요합니다.")
-    
-    # 폴백 함수 정의
-    def decode(image, **kwargs):
-        return []
 
-# pdf2image 로드 시도
-try:
-    import pdf2image
-    HAVE_PDF2IMAGE = True
-except ImportError:
-    HAVE_PDF2IMAGE = False
+if not dependencies["pdf2image"]:
     st.warning("pdf2image 라이브러리를 불러올 수 없습니다. PDF 이미지 추출 기능이 제한됩니다.")
 
-# pypdfium2 로드 시도
-try:
-    import pypdfium2 as pdfium
-    HAVE_PDFIUM = True
-except ImportError:
-    HAVE_PDFIUM = False
+if not dependencies["pdfium"]:
     st.warning("pypdfium2 라이브러리를 불러올 수 없습니다. PDF 처리 기능이 제한됩니다.")
 
-# Office 관련 라이브러리 로드 시도
-try:
-    from openpyxl import load_workbook
-    HAVE_OPENPYXL = True
-except ImportError:
-    HAVE_OPENPYXL = False
+# Office 관련 라이브러리
+if not dependencies["openpyxl"]:
     st.warning("openpyxl 라이브러리를 불러올 수 없습니다. Excel 파일 처리 기능을 사용할 수 없습니다.")
 
-try:
-    from pptx import Presentation
-    HAVE_PPTX = True
-except ImportError:
-    HAVE_PPTX = False
+if not dependencies["pptx"]:
     st.warning("python-pptx 라이브러리를 불러올 수 없습니다. PowerPoint 파일 처리 기능을 사용할 수 없습니다.")
 
-try:
-    from PyPDF2 import PdfReader
-    HAVE_PYPDF2 = True
-except ImportError:
-    HAVE_PYPDF2 = False
+if not dependencies["PyPDF2"]:
     st.warning("PyPDF2 라이브러리를 불러올 수 없습니다. PDF 텍스트 추출 기능을 사용할 수 없습니다.")
 
 # 필요한 라이브러리 설치 확인 메시지
@@ -240,725 +246,101 @@ st.info("라이브러리 로드가 완료되었습니다. 일부 라이브러리
 
 # 필요한 시스템 패키지 확인 (서버에 미리 설치되어 있어야 함)
 def check_system_dependencies():
-    """시스템에 필요한 라이브러리가 설치되어 있는지 확인"""
-    # 운영체제 확인
-    import platform
-    
+    """시스템에 필요한 라이브러리가 설치되어 있는지 확인 (probe_dependencies 결과 사용, 설치는 하지 않음)"""
     current_os = platform.system()
+    dependencies = probe_dependencies()
     
-    # Windows에서는 다른 검사 방법 사용
+    # Windows에서는 다른 안내 표시
     if current_os == "Windows":
-        # Windows용 검사 코드
-        try:
-            # pylibdmtx가 로드되었는지만 확인
-            if not HAVE_PYLIBDMTX:
-                st.warning("pylibdmtx 라이브러리를 불러올 수 없습니다. Windows용 설치 방법을 확인하세요.")
-                st.info("Windows에 libdmtx를 설치하려면 https://github.com/dmtx/libdmtx/releases 에서 다운로드하세요.")
-            
-            # LibreOffice 확인 (Windows 방식)
-            import os
-            libreoffice_paths = [
-                "C:\\Program Files\\LibreOffice\\program\\soffice.exe",
-                "C:\\Program Files (x86)\\LibreOffice\\program\\soffice.exe"
-            ]
-            libreoffice_found = any(os.path.exists(path) for path in libreoffice_paths)
-            
-            if not libreoffice_found:
-                st.warning("LibreOffice가 설치되어 있지 않습니다. Office 파일 변환이 작동하지 않을 수 있습니다.")
-                st.info("LibreOffice를 https://www.libreoffice.org/download/download/ 에서 다운로드하세요.")
-                
-        except Exception as e:
-            st.warning(f"시스템 확인 중 오류 발생: {str(e)}")
-            st.info("일부 기능이 제한될 수 있지만, 앱은 계속 작동합니다.")
-        
+        # pylibdmtx가 설치되었는지만 확인 (Windows용 pylibdmtx는 libdmtx DLL 포함)
+        if not dependencies["pylibdmtx"]:
+            st.warning("pylibdmtx 라이브러리를 불러올 수 없습니다. Windows용 설치 방법을 확인하세요.")
+            st.info("Windows에 libdmtx를 설치하려면 https://github.com/dmtx/libdmtx/releases 에서 다운로드하세요.")
+        
+        if not dependencies["libreoffice"]:
+            st.warning("LibreOffice가 설치되어 있지 않습니다. Office 파일 변환이 작동하지 않을 수 있습니다.")
+            st.info("LibreOffice를 https://www.libreoffice.org/download/download/ 에서 다운로드하세요.")
         return
     
-    # Linux/macOS 검사 코드 (기존 코드)
-    try:
-        # libdmtx 확인
-        result = subprocess.run(["pkg-config", "--exists", "libdmtx"],
-                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if result.returncode != 0:
-            st.warning("libdmtx가 설치되어 있지 않습니다. 바코드 검출이 작동하지 않을 수 있습니다.")
-            if current_os == "Darwin":  # macOS
-                st.info("macOS에서는 'brew install libdmtx'로 설치할 수 있습니다.")
-            else:  # Linux
-                st.info("Ubuntu에서는 'sudo apt-get install libdmtx0a libdmtx-dev'로 설치할 수 있습니다.")
-    
-    except Exception as e:
-        st.warning(f"시스템 의존성 확인 중 오류 발생: {str(e)}")
-        st.info("이 앱이 정상적으로 작동하려면 libdmtx, libreoffice, poppler-utils가 필요합니다.")
+    # Linux/macOS
+    if not dependencies["libdmtx"]:
+        st.warning("libdmtx가 설치되어 있지 않습니다. 바코드 검출이 작동하지 않을 수 있습니다.")
+        if current_os == "Darwin":  # macOS
+            st.info("macOS에서는 'brew install libdmtx'로 설치할 수 있습니다.")
+        else:  # Linux
+            st.info("Ubuntu에서는 'sudo apt-get install libdmtx0a libdmtx-dev'로 설치할 수 있습니다.")
 
-# =========================================================
-# 유효성 검증 함수
-# =========================================================
-
-def validate_44x44_matrix(data, b_range_check=False, b_min_value=0, b_max_value=9999, i_n_check=False, i_to_n_mapping=None):
-    """44x44 매트릭스 데이터 검증 함수"""
-    result = {"valid": False, "errors": [], "warnings": [], "data": {}, "pattern_match": False}
-    
-    # 잘못된 구분자(,) 사용 확인
-    if re.search(r'C[A-Za-z0-9]{3},', data) or re.search(r'I\d{2},', data) or re.search(r'W(?:LO|SE),', data):
-        result["errors"].append("잘못된 구분자(,)를 사용했습니다. 구분자는 '.'(마침표)여야 합니다.")
-        # 어떤 식별자에서 잘못된 구분자를 사용했는지 확인
-        if re.search(r'C[A-Za-z0-9]{3},', data):
-            result["errors"].append("C 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'I\d{2},', data):
-            result["errors"].append("I 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'W(?:LO|SE),', data):
-            result["errors"].append("W 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'T\d{2},', data):
-            result["errors"].append("T 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'N\d{3},', data):
-            result["errors"].append("N 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'D\d{8},', data):
-            result["errors"].append("D 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'S\d{3},', data):
-            result["errors"].append("S 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'B[0-9]{120},', data):
-            result["errors"].append("B 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        return result
-
-    # 바코드 데이터에서 패턴 확인
-    pattern = r'^C([A-Za-z0-9]{3})\.I(\d{2})\.W(LO|SE)\.T(\d{2})\.N(\d{3})\.D(\d{8})\.S(\d{3})\.B([0-9]{120})\.$'
-    match = re.search(pattern, data)
-    
-    if not match:
-        result["errors"].append("44x44 매트릭스 형식이 맞지 않습니다.")
-        
-        # 개별 패턴 확인으로 어떤 부분이 문제인지 디버깅
-        C_match = re.search(r'C([A-Za-z0-9]{3})\.', data)
-        if not C_match:
-            result["errors"].append("C 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
-        
-        I_match = re.search(r'I(\d{2})\.', data)
-        if not I_match:
-            result["errors"].append("I 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
-        
-        W_match = re.search(r'W(LO|SE)\.', data)
-        if not W_match:
-            result["errors"].append("W 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (LO 또는 SE 값이어야 함)")
-        
-        T_match = re.search(r'T(\d{2})\.', data)
-        if not T_match:
-            result["errors"].append("T 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
-        
-        N_match = re.search(r'N(\d{3})\.', data)
-        if not N_match:
-            result["errors"].append("N 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
-        
-        D_match = re.search(r'D(\d{8})\.', data)
-        if not D_match:
-            result["errors"].append("D 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (YYYYMMDD 형식)")
-        
-        S_match = re.search(r'S(\d{3})\.', data)
-        if not S_match:
-            result["errors"].append("S 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
-        
-        B_match = re.search(r'B([0-9]{120})\.', data)
-        if not B_match:
-            result["errors"].append("B 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (120자리 숫자)")
-        
-        return result
-    
-    C_val, I_val, W_val, T_val, N_val, D_val, S_val, B_val = match.groups()
-    
-    # 데이터 저장
-    result["data"] = {
-        "C": C_val,
-        "I": I_val,
-        "W": W_val,
-        "T": T_val,
-        "N": N_val,
-        "D": D_val,
-        "S": S_val,
-        "B": B_val
-    }
-    
-    result["pattern_match"] = True
-    
-    # 추가 검증
-    # D: 날짜 형식 검증 (YYYYMMDD)
-    try:
-        year = int(D_val[:4])
-        month = int(D_val[4:6])
-        day = int(D_val[6:8])
-        
-        if not (1900 <= year <= 2100):
-            result["errors"].append(f"D 식별자: 연도 범위가 올바르지 않습니다 ({year})")
-        if not (1 <= month <= 12):
-            result["errors"].append(f"D 식별자: 월 범위가 올바르지 않습니다 ({month})")
-        if not (1 <= day <= 31):
-            result["errors"].append(f"D 식별자: 일 범위가 올바르지 않습니다 ({day})")
-    except ValueError:
-        result["errors"].append("D 식별자: 날짜 형식이 올바르지 않습니다")
-    
-    # B: 숫자 세트 검증
-    B_sets = []
-    non_zero_sets_count = 0
-    
-    for i in range(0, len(B_val), 4):
-        if i+4 <= len(B_val):
-            B_set = B_val[i:i+4]
-            B_sets.append(B_set)
-            if B_set != '0000':
-                non_zero_sets_count += 1
-    
-    # N: B의 세트 수와 일치하는지 확인
-    if int(N_val) != non_zero_sets_count:
-        result["errors"].append(f"N 식별자: 값 {N_val}이 B 식별자의 비어있지 않은 세트 수 {non_zero_sets_count}와 일치하지 않습니다")
-    
-    # I 값에 따른 N 최대값 검증
-    if i_n_check and i_to_n_mapping and I_val:
-        try:
-            i_val_int = int(I_val)
-            current_n_value = int(N_val)
-            
-            # I 값에 해당하는 최대 N 값 찾기
-            i_val_str = str(i_val_int)
-            if i_val_str in i_to_n_mapping:
-                max_n = i_to_n_mapping[i_val_str]
-                if current_n_value > max_n:
-                    result["errors"].append(f"N 식별자: I{I_val}에 대한 N 값이 최대 허용치({max_n})를 초과했습니다 (현재 값: {current_n_value})")
-        except (ValueError, TypeError):
-            # I 값이나 N 값이 정수로 변환할 수 없는 경우
-            pass
-    
-    # B 값 범위 검사 (활성화된 경우에만 수행 + W가 'LO'가 아닐 경우에만 수행)
-    if b_range_check and W_val != 'LO':
-        out_of_range_sets = []
-        for B_set in B_sets:
-            if B_set != '0000':
-                b_val = int(B_set)
-                if b_val < b_min_value or b_val > b_max_value:
-                    out_of_range_sets.append(f"{B_set} ({b_val})")
-        
-        if out_of_range_sets:
-            error_msg = f"B 식별자: 다음 값들이 지정된 범위({b_min_value}~{b_max_value})를 벗어납니다: {', '.join(out_of_range_sets)}"
-            result["errors"].append(error_msg)
-    elif b_range_check and W_val == 'LO':
-        # W가 'LO'인 경우 B 값 범위 검사 제외
-        result["warnings"].append(f"W 식별자가 'LO'이미로 B 값 범위 검사를 건너뜁니다.")
-    
-    # B: 숫자 세트가 오름차순인지 및 큰 점프가 있는지 확인
-    prev_set = None
-    for B_set in B_sets:
-        if B_set != '0000':
-            if prev_set:
-                # 오름차순 확인 - 여기를 경고로 변경
-                if int(B_set) <= int(prev_set):
-                    result["warnings"].append(f"B 식별자: 숫자 세트가 오름차순이 아닙니다 ({prev_set} -> {B_set})")
-                # 큰 점프 확인 (100 초과)
-                elif int(B_set) - int(prev_set) > 100:
-                    result["warnings"].append(f"B 식별자: 숫자 세트 간에 큰 점프가 있습니다 ({prev_set} -> {B_set}, 차이: {int(B_set) - int(prev_set)})")
-                # 숫자 하나를 건너뛬어도 경고 표시
-                elif int(B_set) - int(prev_set) > 1:
-                    result["warnings"].append(f"B 식별자: 숫자 세트 간에 순차가 건너뛰어졌습니다 ({prev_set} -> {B_set}, 누락 값: {int(B_set) - int(prev_set) - 1}개)")
-            prev_set = B_set
-    
-    result["valid"] = len(result["errors"]) == 0
-    result["has_warnings"] = len(result["warnings"]) > 0
-    
-    return result
-    
-def validate_18x18_matrix(data):
-    """18x18 매트릭스 데이터 검증 함수"""
-    result = {"valid": False, "errors": [], "data": {}, "pattern_match": False}
-    
-    # 잘못된 구분자(,) 사용 확인
-    if re.search(r'M[A-Za-z0-9]{4},', data) or re.search(r'I\d{2},', data) or re.search(r'C[A-Za-z0-9]{3},', data):
-        result["errors"].append("잘못된 구분자(,)를 사용했습니다. 구분자는 '.'(마침표)여야 합니다.")
-        # 어떤 식별자에서 잘못된 구분자를 사용했는지 확인
-        if re.search(r'M[A-Za-z0-9]{4},', data):
-            result["errors"].append("M 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'I\d{2},', data):
-            result["errors"].append("I 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'C[A-Za-z0-9]{3},', data):
-            result["errors"].append("C 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        if re.search(r'P\d{3},', data):
-            result["errors"].append("P 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
-        return result
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_pdf_thumbnail(file_hash, page_num, _file_content):
+    """미리보기용 PDF 페이지 썸네일 렌더링 (검출용 고해상도 이미지는 보관하지 않으므로 필요할 때 다시 렌더링)"""
+    return render_pdf_page_thumbnail(_file_content, page_num)
 
-    # 바코드 데이터에서 패턴 확인
-    pattern = r'^M([A-Za-z0-9]{4})\.I(\d{2})\.C([A-Za-z0-9]{3})\.P(\d{3})\.$'
-    match = re.search(pattern, data)
-    
-    if not match:
-        result["errors"].append("18x18 매트릭스 형식이 맞지 않습니다.")
-        
-        # 개별 패턴 확인으로 어떤 부분이 문제인지 디버깅
-        M_match = re.search(r'M([A-Za-z0-9]{4})\.', data)
-        if not M_match:
-            result["errors"].append("M 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (4자리 문자+숫자 조합)")
-        
-        I_match = re.search(r'I(\d{2})\.', data)
-        if not I_match:
-            result["errors"].append("I 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (2자리 숫자)")
-        
-        C_match = re.search(r'C([A-Za-z0-9]{3})\.', data)
-        if not C_match:
-            result["errors"].append("C 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (3자리 문자+숫자 조합)")
-        
-        P_match = re.search(r'P(\d{3})\.', data)
-        if not P_match:
-            result["errors"].append("P 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (3자리 숫자)")
-        
-        return result
-    
-    M_val, I_val, C_val, P_val = match.groups()
-    
-    # 데이터 저장
-    result["data"] = {
-        "M": M_val,
-        "I": I_val,
-        "C": C_val,
-        "P": P_val
-    }
-    
-    result["pattern_match"] = True
-    
-    # 여기에 필요한 추가 검증 로직 추가
-    
-    result["valid"] = len(result["errors"]) == 0
-    
-    return result
+@st.cache_resource
+def get_office_converter(pool_size):
+    """미리 실행해 둔 LibreOffice 변환 서버 풀 (세션 간 공유, 풀 크기별로 하나씩 생성)
 
-def cross_validate_matrices(matrix_44x44, matrix_18x18):
-    """두 매트릭스 간의 교차 검증
-    
-    고정부(18x18 매트릭스)와 변동부(44x44 매트릭스) 간의 일관성을 확인하는 검증을 수행합니다.
-    다음 사항을 검증합니다:
-    1. 18x18의 I 값과 44x44의 I 값 일치 여부
-    2. 18x18의 C 값과 44x44의 C 값 일치 여부
+    pool_size가 0이거나 UNO 모듈/LibreOffice를 찾을 수 없으면 None을 반환하며, 이때는 파일마다
+    LibreOffice를 새로 실행하여 변환합니다.
     """
-    errors = []
-    
-    # 둘 중 하나라도 패턴 매치가 실패한 경우
-    if not matrix_44x44["pattern_match"] or not matrix_18x18["pattern_match"]:
-        return ["교차 검증을 수행할 수 없습니다. 두 매트릭스의 기본 형식이 올바르지 않습니다."]
-    
-    # 1. [18x18]의 I 값과 [44x44]의 I 값이 동일한지 확인
-    if matrix_18x18["data"]["I"] != matrix_44x44["data"]["I"]:
-        errors.append(f"교차 검증 실패: [18x18]의 I({matrix_18x18['data']['I']})와 [44x44]의 I({matrix_44x44['data']['I']})가 일치하지 않습니다.")
-    
-    # 2. [18x18]의 C 값과 [44x44]의 C 값이 일치하는지 확인
-    if matrix_18x18["data"]["C"] != matrix_44x44["data"]["C"]:
-        errors.append(f"교차 검증 실패: [18x18]의 C({matrix_18x18['data']['C']})와 [44x44]의 C({matrix_44x44['data']['C']})가 일치하지 않습니다.")
-    
-    return errors if errors else ["교차 검증이 성공적으로 완료되었습니다."]
+    if not (HAVE_OFFICE_CONVERTER and have_uno()) or int(pool_size) <= 0:
+        return None
+    converter = OfficeConverterPool(size=int(pool_size))
+    return converter if converter.available else None
 
-# =========================================================
-# 이미지 처리 및 바코드 검출 함수
-# =========================================================
+@st.cache_resource
+def get_office_command_converter(slot_count):
+    """soffice --convert-to 실행 슬롯 풀 (세션 간 공유, 슬롯마다 전용 프로필 사용)
 
-def split_image_for_detection(image):
-    """이미지를 여러 영역으로 분할하여 바코드 인식률 향상"""
-    width, height = image.size
-    sections = []
-    
-    # 원본 이미지 추가
-    sections.append(image)
-    
-    # 이미지를 상하좌우로 분할 (4분할)
-    half_width = width // 2
-    half_height = height // 2
-    
-    # 좌상단
-    sections.append(image.crop((0, 0, half_width, half_height)))
-    # 우상단
-    sections.append(image.crop((half_width, 0, width, half_height)))
-    # 좌하단
-    sections.append(image.crop((0, half_height, half_width, height)))
-    # 우하단
-    sections.append(image.crop((half_width, half_height, width, height)))
-    
-    # 이미지를 가로로 3등분
-    third_height = height // 3
-    sections.append(image.crop((0, 0, width, third_height)))
-    sections.append(image.crop((0, third_height, width, 2*third_height)))
-    sections.append(image.crop((0, 2*third_height, width, height)))
-    
-    # 이미지를 세로로 3등분
-    third_width = width // 3
-    sections.append(image.crop((0, 0, third_width, height)))
-    sections.append(image.crop((third_width, 0, 2*third_width, height)))
-    sections.append(image.crop((2*third_width, 0, width, height)))
-    
-    return sections
+    office_converter 모듈을 불러올 수 없거나 LibreOffice를 찾을 수 없으면 None을 반환합니다.
+    """
+    if not HAVE_OFFICE_CONVERTER:
+        return None
+    converter = CommandConverterPool(size=max(1, int(slot_count)))
+    return converter if converter.available else None
 
-# @st.cache_data 데코레이터 제거 (UnhashableParamError 오류 방지)
-def enhance_image_for_detection(image):
-    """이미지 전처리를 통해 DataMatrix 인식률 향상 (개선 버전)"""
-    # OpenCV로 이미지 처리
-    img_array = np.array(image)
-    
-    results = [image]  # 원본 이미지 포함
-    
-    # 그레이스케일로 변환
-    if len(img_array.shape) == 3:  # 컬러 이미지인 경우
-        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-    else:  # 이미 그레이스케일인 경우
-        gray = img_array
-    
-    # 기본 처리: 노이즈 제거
-    denoised = cv2.GaussianBlur(gray, (5, 5), 0)
-    
-    # 이미지 크기 조정 (확대)
-    height, width = gray.shape
-    scale_factors = [1.5, 2.0]
-    for scale in scale_factors:
-        resized = cv2.resize(gray, (int(width * scale), int(height * scale)),
-                            interpolation=cv2.INTER_CUBIC)
-        results.append(Image.fromarray(resized))
-    
-    # 여러 이진화 방법 적용
-    # 1. 적응형 이진화 (Adaptive Thresholding)
-    binary_adaptive = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                           cv2.THRESH_BINARY, 11, 2)
-    results.append(Image.fromarray(binary_adaptive))
-    
-    # 2. Otsu 이진화
-    _, binary_otsu = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    results.append(Image.fromarray(binary_otsu))
-    
-    # 3. 반전된 이진화 (바코드가 역상인 경우)
-    _, binary_inv = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-    results.append(Image.fromarray(binary_inv))
-    
-    # 대비 향상 (CLAHE)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    enhanced = clahe.apply(gray)
-    results.append(Image.fromarray(enhanced))
-    
-    # CLAHE 적용 후 이진화
-    _, clahe_binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    results.append(Image.fromarray(clahe_binary))
-    
-    # 모폴로지 연산
-    kernels = [(3, 3), (5, 5)]
-    for k_size in kernels:
-        kernel = np.ones(k_size, np.uint8)
-        
-        # 열림 연산 (침식 후 팽창) - 작은 노이즈 제거
-        morph_open = cv2.morphologyEx(binary_adaptive, cv2.MORPH_OPEN, kernel)
-        results.append(Image.fromarray(morph_open))
-        
-        # 닫힘 연산 (팽창 후 침식) - 작은 구멍 채우기
-        morph_close = cv2.morphologyEx(binary_adaptive, cv2.MORPH_CLOSE, kernel)
-        results.append(Image.fromarray(morph_close))
-    
-    # 엣지 검출
-    edges = cv2.Canny(denoised, 50, 150)
-    results.append(Image.fromarray(edges))
-    
-    # 선명화 필터
-    sharpen_kernel = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
-    sharpened = cv2.filter2D(gray, -1, sharpen_kernel)
-    results.append(Image.fromarray(sharpened))
-    
-    return results
+@st.cache_resource
+def get_office_conversion_metrics():
+    """Office 변환 지연 시간/제한 시간 초과 통계 (세션 간 공유)"""
+    if not HAVE_OFFICE_CONVERTER:
+        return None
+    return ConversionMetrics()
 
-def detect_datamatrix(image, progress_callback=None):
-    """이미지에서 DataMatrix 바코드 검출 (개선 버전)"""
+@st.cache_resource
+def get_conversion_cache(max_mb):
+    """변환된 PDF 디스크 캐시 (세션 간 공유, 크기 설정별로 하나씩 생성)
 
-    # 원본 이미지 전처리
-    processed_images = enhance_image_for_detection(image)
-    
-    all_results = []
-    
-    # 원본 이미지의 다양한 처리 버전에서 바코드 검출 시도
-    for i, img in enumerate(processed_images):
-        if progress_callback:
-            progress_callback(10 + (i * 30) // len(processed_images))
-        try:
-            results = decode(img, timeout=5000, max_count=10)
-            if results:
-                all_results.extend(results)
-        except Exception as e:
-            st.warning(f"디코딩 중 오류 발생: {str(e)}")
-    
-    # 이미지가 복잡하거나 바코드가 작을 경우를 위해 이미지 분할 접근
-    if len(all_results) < 2:  # 아직 두 개의 바코드를 찾지 못했다면
-        # 이미지 분할
-        sections = split_image_for_detection(image)
-        
-        # 각 섹션에 전처리 적용 및 바코드 검출
-        for i, section in enumerate(sections):
-            if progress_callback:
-                progress_callback(50 + (i * 40) // len(sections))
-                
-            # 섹션 전처리
-            section_processed = enhance_image_for_detection(section)
-            
-            # 처리된 각 섹션에서 바코드 검출
-            for img in section_processed:
-                try:
-                    results = decode(img, timeout=5000, max_count=10)
-                    if results:
-                        all_results.extend(results)
-                except Exception as e:
-                    continue  # 에러는 무시하고 계속 진행
-    
-    # 중복 제거 (바코드 값 기준)
-    unique_data = set()
-    decoded_data = []
-    
-    for result in all_results:
-        try:
-            data = result.data.decode('utf-8', errors='replace')
-            if data not in unique_data:
-                unique_data.add(data)
-                decoded_data.append(data)
-        except Exception as e:
-            st.warning(f"결과 디코딩 중 오류 발생: {str(e)}")
-    
-    if progress_callback:
-        progress_callback(100)
-        
-    return decoded_data
+    max_mb가 0이거나 캐시 디렉토리를 만들 수 없으면 None을 반환합니다.
+    """
+    if not HAVE_OFFICE_CONVERTER or int(max_mb) <= 0:
+        return None
+    try:
+        return ConversionCache(CONVERSION_CACHE_DIR, max_bytes=int(max_mb) * 1024 * 1024)
+    except OSError:
+        return None
 
-# =========================================================
-# 파일 처리 함수
-# =========================================================
+def get_office_services():
+    """현재 세션 설정에 맞는 Office 변환 공유 객체 (검출 엔진의 office 인자)"""
+    pool_size = st.session_state.get('office_pool_size', 0)
+    return {
+        "pool": get_office_converter(pool_size),
+        "command_pool": get_office_command_converter(pool_size),
+        "cache": get_conversion_cache(st.session_state.get('conversion_cache_mb', 0)),
+        "metrics": get_office_conversion_metrics(),
+        "client_id": st.session_state.get('conversion_client_id')
+    }
 
-# 수정된 PDF 처리 함수
-def extract_images_from_pdf(file_content, progress_callback=None):
-    """PDF 파일에서 페이지별 이미지 추출 (오류 방지 기능 추가)"""
-    images = []
-    
-    # 오류 발생 시 표시할 메시지
-    error_messages = []
-    
-    # PDFIUM으로 시도
-    if HAVE_PDFIUM:
-        try:
-            # 임시 파일에 타임스탬프 기반 안전한 이름 사용
-            temp_filename = f"temp_pdf_{time.strftime('%Y%m%d_%H%M%S')}.pdf"
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                temp_file.write(file_content)
-                temp_path = temp_file.name
-            
-            if progress_callback:
-                progress_callback(20)
-                
-            # pypdfium2로 PDF 이미지 추출 (고해상도)
-            pdf = pdfium.PdfDocument(temp_path)
-            
-            total_pages = len(pdf)
-            for page_index in range(total_pages):
-                if progress_callback:
-                    progress_callback(20 + (page_index * 60) // total_pages)
-                    
-                # 페이지 렌더링 (고해상도로 렌더링하여 바코드 인식률 향상)
-                page = pdf[page_index]
-                bitmap = page.render(
-                    scale=3.0,  # 고해상도로 렌더링
-                    rotation=0,
-                    crop=(0, 0, 0, 0)
-                )
-                
-                # 이미지 변환
-                pil_image = bitmap.to_pil()
-                images.append(pil_image)
-                
-            # 임시 파일 삭제
-            os.unlink(temp_path)
-            
-            if images:
-                return images
-            else:
-                error_messages.append("pypdfium2로 이미지 추출 실패")
-        except Exception as e:
-            error_messages.append(f"pypdfium2로 PDF 처리 실패: {str(e)}")
-    else:
-        error_messages.append("pypdfium2 라이브러리가 설치되지 않음")
-    
-    # pdf2image로 시도
-    if HAVE_PDF2IMAGE:
-        try:
-            st.info("pdf2image로 이미지 추출 시도 중...")
-            
-            if progress_callback:
-                progress_callback(50)
-                
-            # 임시 디렉토리 생성
-            temp_dir = tempfile.mkdtemp()
-            temp_pdf_path = os.path.join(temp_dir, 'temp.pdf')
-            
-            # 파일 저장
-            with open(temp_pdf_path, 'wb') as f:
-                f.write(file_content)
-            
-            # pdf2image로 PDF에서 이미지 추출
-            pdf_images = pdf2image.convert_from_path(temp_pdf_path, dpi=300)
-            images.extend(pdf_images)
-            
-            # 임시 디렉토리 삭제
-            shutil.rmtree(temp_dir)
-            
-            if progress_callback:
-                progress_callback(100)
-                
-            if images:
-                return images
-            else:
-                error_messages.append("pdf2image로 이미지 추출 실패")
-        except Exception as e:
-            error_messages.append(f"PDF 파일 처리 실패: {str(e)}")
-    else:
-        error_messages.append("pdf2image 라이브러리가 설치되지 않음")
-    
-    # 모든 방법 실패 시
-    for msg in error_messages:
-        st.error(msg)
-    
-    st.error("PDF에서 이미지를 추출할 수 없습니다. 필요한 라이브러리가 설치되어 있는지 확인하세요.")
-    st.info("PDF 처리를 위해 다음 패키지가 필요합니다: pypdfium2, pdf2image, poppler-utils")
-    
-    return images
+@st.cache_resource
+def configure_decode_threads():
+    """OpenCV 스레드 수를 프로세스 시작 시 한 번 설정 (프로세스 전역 설정이므로 설정 파일 값 기준)"""
+    configure_opencv_threads(load_config()["decode_threads"])
 
-def convert_office_to_pdf(file_content, file_extension, progress_callback=None):
-    """Office 파일(PPTX, XLSX)을 PDF로 변환 (LibreOffice 사용)"""
-    try:
-        if progress_callback:
-            progress_callback(10)
-            
-        # 임시 디렉토리 생성
-        temp_dir = tempfile.mkdtemp()
-        input_path = os.path.join(temp_dir, f'input.{file_extension}')
-        output_path = os.path.join(temp_dir, 'output.pdf')
-        
-        # 입력 파일 저장
-        with open(input_path, 'wb') as f:
-            f.write(file_content)
-            
-        if progress_callback:
-            progress_callback(30)
-            
-        # 운영체제 확인
-        import platform
-        
-        # LibreOffice로 PDF 변환 (OS별 명령어 분기)
-        if platform.system() == "Windows":
-            # Windows용 명령어
-            libreoffice_paths = [
-                "C:\\Program Files\\LibreOffice\\program\\soffice.exe",
-                "C:\\Program Files (x86)\\LibreOffice\\program\\soffice.exe"
-            ]
-            
-            libreoffice_path = None
-            for path in libreoffice_paths:
-                if os.path.exists(path):
-                    libreoffice_path = f'"{path}"'
-                    break
-                    
-            if not libreoffice_path:
-                st.warning("LibreOffice를 찾을 수 없습니다.")
-                return None
-                
-            cmd = f'{libreoffice_path} --headless --convert-to pdf --outdir "{temp_dir}" "{input_path}"'
-        else:
-            # Linux/macOS용 명령어
-            cmd = f'libreoffice --headless --convert-to pdf --outdir {temp_dir} {input_path}'
-        
-        process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        _, stderr = process.communicate()
-                
-        if process.returncode != 0:
-            st.warning(f"LibreOffice 변환 실패: {stderr.decode('utf-8', errors='ignore')}")
-            return None
-            
-        if progress_callback:
-            progress_callback(70)
-            
-        # 생성된 PDF 파일 읽기
-        try:
-            with open(output_path, 'rb') as f:
-                pdf_content = f.read()
-        except FileNotFoundError:
-            st.warning(f"변환된 PDF 파일을 찾을 수 없습니다. LibreOffice가 제대로 설치되어 있는지 확인하세요.")
-            return None
-        
-        # 임시 디렉토리 삭제
-        shutil.rmtree(temp_dir)
-        
-        if progress_callback:
-            progress_callback(100)
-            
-        return pdf_content
-    except Exception as e:
-        st.error(f"파일 변환 중 오류 발생: {str(e)}")
+@st.cache_resource
+def get_decode_cache(max_mb, use_disk):
+    """디코딩 결과 캐시 (세션 간 공유, 설정별로 하나씩 생성)"""
+    if not HAVE_DECODE_CACHE:
         return None
-
-def extract_images_from_office_file(file_content, file_extension, progress_callback=None):
-    """Office 파일에서 이미지 추출 (PDF 변환 후 처리) - 슬라이드 정보 유지"""
-    slide_images = {}  # 슬라이드별 이미지 그룹화
-    
-    # PDF로 변환
-    if progress_callback:
-        progress_callback(10, "Office 파일을 PDF로 변환 중...")
-        
-    pdf_content = convert_office_to_pdf(file_content, file_extension,
-                                       lambda p: progress_callback(p * 0.4, "Office 파일을 PDF로 변환 중..."))
-    
-    if pdf_content:
-        # PDF에서 이미지 추출
-        if progress_callback:
-            progress_callback(50, "PDF에서 이미지 추출 중...")
-            
-        images = extract_images_from_pdf(pdf_content,
-                                       lambda p: progress_callback(50 + p * 0.5, "PDF에서 이미지 추출 중..."))
-        
-        # 각 이미지를 슬라이드 번호별로 저장
-        for i, image in enumerate(images):
-            slide_num = i + 1
-            if slide_num not in slide_images:
-                slide_images[slide_num] = []
-            slide_images[slide_num].append(image)
-    else:
-        st.warning(f"{file_extension.upper()} 파일을 PDF로 변환하지 못했습니다.")
-        
-        # 직접 이미지 추출 시도 (PPTX만 가능)
-        if file_extension.lower() == 'pptx':
-            if progress_callback:
-                progress_callback(60, "PowerPoint에서 직접 이미지 추출 시도 중...")
-                
-            try:
-                # 임시 파일 생성
-                with tempfile.NamedTemporaryFile(suffix='.pptx', delete=False) as temp_file:
-                    temp_file.write(file_content)
-                    temp_path = temp_file.name
-                
-                # 프레젠테이션 열기
-                presentation = Presentation(temp_path)
-                
-                # 슬라이드별로 이미지 추출
-                total_slides = len(presentation.slides)
-                for slide_idx, slide in enumerate(presentation.slides):
-                    if progress_callback:
-                        progress_callback(60 + (slide_idx * 40) // total_slides, "슬라이드에서 이미지 추출 중...")
-                        
-                    slide_num = slide_idx + 1
-                    slide_images[slide_num] = []
-                    
-                    for shape in slide.shapes:
-                        if hasattr(shape, 'image'):
-                            try:
-                                image_bytes = shape.image.blob
-                                image = Image.open(io.BytesIO(image_bytes))
-                                slide_images[slide_num].append(image)
-                            except Exception as e:
-                                st.warning(f"이미지 추출 중 오류: {str(e)}")
-                
-                # 임시 파일 삭제
-                os.unlink(temp_path)
-            except Exception as e:
-                st.error(f"PPTX 직접 처리 중 오류 발생: {str(e)}")
-    
-    if progress_callback:
-        progress_callback(100, "이미지 추출 완료")
-        
-    return slide_images
+    return DecodeCache(max_memory_bytes=int(max_mb) * 1024 * 1024,
+                       db_path=DECODE_CACHE_DB if use_disk else None)
 
 # =========================================================
 # 페이지간 추가 검증 함수
@@ -1131,6 +513,7 @@ def validate_pages_s_values(page_results):
                 page_results[page_num]["s_expected_value"] = invalid_info["s_expected_value"]
     
     return page_results
+
     
 # =========================================================
 # 결과 출력 함수 - Streamlit UI용으로 변환
@@ -1214,6 +597,11 @@ def display_summary_results(page_results):
     # 결과 테이블 데이터 준비
     data = []
     for page_num, result in sorted(page_results.items()):
+        # 바코드가 없는 슬라이드 (텍스트/차트만 있는 슬라이드)
+        if result.get("detection_status") == "not_expected":
+            data.append([page_num, "➖ 해당 없음", "➖ 해당 없음", "➖ 바코드 없는 슬라이드", "➖", "➖"])
+            continue
+        
         # 매트릭스 상태
         if result.get("skip_44x44", False):  # 44x44 검증 생략한 경우
             matrix_44x44 = "🚫 검증 안함"
@@ -1328,91 +716,35 @@ def display_summary_results(page_results):
     df = pd.DataFrame(data, columns=columns)
     st.dataframe(df, use_container_width=True)
     
-    # 최종 결과 출력
-    # 검증 모드에 따라 결과 판단 기준 적용
-    if st.session_state.validation_mode == "44x44":  # 44x44만 검증 모드
-        overall_valid = all(
-            (result["44x44_found"] and result["44x44_valid"] and
-             not result["has_duplicate_44x44"] and
-             not (result.get("s_value_invalid", False) and result.get("s_duplicate_with", None)))
-            for result in page_results.values()
-        )
-        
-        if overall_valid:
-            # 확인 필요 항목이 있는지 확인
-            warnings_exist = any(
-                result.get("s_value_warning", False) or
-                (result.get("s_value_invalid", False) and not result.get("s_duplicate_with", None)) or
-                result["has_warnings"]
-                for result in page_results.values()
-            )
-            
-            if warnings_exist:
-                st.warning("⚠️ 주의: 모든 페이지의 44x44 바코드 검증은 통과했지만, 확인이 필요한 항목이 있습니다.")
-            else:
-                st.success("✅ 성공: 모든 페이지의 44x44 바코드 검증이 통과했습니다.")
+    # 최종 결과 출력 (바코드가 없는 슬라이드는 판단에서 제외)
+    summary = summarize_page_results(page_results, st.session_state.validation_mode)
+    issues_pages = ', '.join(map(str, summary["issue_pages"]))
+    
+    # 검증 모드에 따라 결과 메시지 표시
+    if summary["status"] == "fail" and not summary["issue_pages"]:  # 판단할 페이지가 없는 경우
+        st.error("❌ 실패: 바코드를 검증할 페이지가 없습니다. 모든 슬라이드에 바코드 이미지가 없습니다.")
+    
+    elif st.session_state.validation_mode == "44x44":  # 44x44만 검증 모드
+        if summary["status"] == "warning":
+            st.warning("⚠️ 주의: 모든 페이지의 44x44 바코드 검증은 통과했지만, 확인이 필요한 항목이 있습니다.")
+        elif summary["status"] == "pass":
+            st.success("✅ 성공: 모든 페이지의 44x44 바코드 검증이 통과했습니다.")
         else:
-            issues_pages = [
-                page_num for page_num, result in page_results.items()
-                if not (result["44x44_found"] and result["44x44_valid"]) or
-                result["has_duplicate_44x44"] or
-                (result.get("s_value_invalid", False) and result.get("s_duplicate_with", None))
-            ]
-            if issues_pages:
-                st.error(f"❌ 실패: {', '.join(map(str, sorted(issues_pages)))} 페이지의 44x44 바코드에서 문제가 발견되었습니다.")
+            st.error(f"❌ 실패: {issues_pages} 페이지의 44x44 바코드에서 문제가 발견되었습니다.")
     
     elif st.session_state.validation_mode == "18x18":  # 18x18만 검증 모드
-        overall_valid = all(
-            (result["18x18_found"] and result["18x18_valid"] and not result.get("p_value_duplicate", False))
-            for result in page_results.values()
-        )
-        
-        if overall_valid:
+        if summary["status"] == "pass":
             st.success("✅ 성공: 모든 페이지의 18x18 바코드 검증이 통과했습니다.")
         else:
-            issues_pages = [
-                page_num for page_num, result in page_results.items()
-                if not (result["18x18_found"] and result["18x18_valid"]) or result.get("p_value_duplicate", False)
-            ]
-            if issues_pages:
-                st.error(f"❌ 실패: {', '.join(map(str, sorted(issues_pages)))} 페이지의 18x18 바코드에서 문제가 발견되었습니다.")
+            st.error(f"❌ 실패: {issues_pages} 페이지의 18x18 바코드에서 문제가 발견되었습니다.")
     
     else:  # 둘 다 검증 모드
-        # 심각한 오류(실패)가 있는지 확인
-        critical_issues = any(
-            not result["44x44_found"] or not result["44x44_valid"] or
-            not result["18x18_found"] or not result["18x18_valid"] or
-            not result["cross_valid"] or result["has_duplicate_44x44"] or
-            result.get("p_value_duplicate", False) or
-            (result.get("s_value_invalid", False) and result.get("s_duplicate_with", None))
-            for result in page_results.values()
-        )
-        
-        # 경고(확인 필요)가 있는지 확인
-        warnings_exist = any(
-            result.get("s_value_warning", False) or
-            (result.get("s_value_invalid", False) and not result.get("s_duplicate_with", None)) or
-            result["has_warnings"]
-            for result in page_results.values()
-        )
-        
-        if not critical_issues:
-            if warnings_exist:
-                st.warning("⚠️ 주의: 모든 페이지의 기본 검증은 통과했지만, 확인이 필요한 항목이 있습니다.")
-            else:
-                st.success("✅ 성공: 모든 페이지가 검증을 통과했습니다.")
+        if summary["status"] == "warning":
+            st.warning("⚠️ 주의: 모든 페이지의 기본 검증은 통과했지만, 확인이 필요한 항목이 있습니다.")
+        elif summary["status"] == "pass":
+            st.success("✅ 성공: 모든 페이지가 검증을 통과했습니다.")
         else:
-            issues_pages = [
-                page_num for page_num, result in page_results.items()
-                if not (result["44x44_found"] and result["44x44_valid"] and
-                      result["18x18_found"] and result["18x18_valid"] and
-                      result["cross_valid"]) or
-                result["has_duplicate_44x44"] or
-                result.get("p_value_duplicate", False) or
-                (result.get("s_value_invalid", False) and result.get("s_duplicate_with", None))
-            ]
-            if issues_pages:
-                st.error(f"❌ 실패: {', '.join(map(str, sorted(issues_pages)))} 페이지에서 문제가 발견되었습니다.")
+            st.error(f"❌ 실패: {issues_pages} 페이지에서 문제가 발견되었습니다.")
                 
 def display_format_help():
     """데이터 매트릭스 형식 정보 출력 (Streamlit 버전)"""
@@ -1445,6 +777,65 @@ def display_format_help():
         st.markdown("10. 같은 I 값을 가진 여러 페이지에서 44x44 매트릭스의 S 값은 모두 서로 달라야 합니다.")
         st.markdown("11. 44x44 매트릭스의 S 값은 B 세트의 오름차순 순서와 일치해야 합니다 (S001, S002, S003, ...).")
 
+# =========================================================
+# 문서 결과 저장소 (Streamlit 재실행 시 재처리 방지)
+# =========================================================
+
+# 세션별로 보관할 최근 문서 수 (Office 슬라이드 이미지를 함께 보관하므로 작게 유지)
+DOCUMENT_STORE_LIMIT = 2
+
+def get_stored_document(file_hash):
+    """업로드 파일 해시(SHA-256)로 이 세션에서 이전에 처리한 문서 결과 조회"""
+    store = st.session_state.get("document_store")
+    if not store or file_hash not in store:
+        return None
+    store.move_to_end(file_hash)
+    return store[file_hash]
+
+def store_document(file_hash, slide_images, image_counts, pptx_direct=False):
+    """문서 정보를 문서 결과 저장소에 기록 (오래된 문서부터 제거)
+
+    slide_images는 Office 파일에서 추출한 슬라이드별 이미지이며, 페이지를 하나씩 렌더링해 검출한
+    PDF는 None입니다 (미리보기는 render_pdf_thumbnail로 다시 렌더링). image_counts는 페이지 번호 ->
+    이미지 수입니다. pptx_direct는 slide_images가 슬라이드에서 직접 꺼낸 그림인지(다시 검출할 때도
+    run_pptx_detection으로 필요한 슬라이드를 변환해야 하는지) 여부입니다.
+    """
+    if "document_store" not in st.session_state:
+        st.session_state.document_store = OrderedDict()
+    store = st.session_state.document_store
+    store[file_hash] = {"slide_images": slide_images, "image_counts": image_counts, "pptx_direct": pptx_direct,
+                        "detections": {}}
+    store.move_to_end(file_hash)
+    while len(store) > DOCUMENT_STORE_LIMIT:
+        store.popitem(last=False)
+    return store[file_hash]
+
+def get_stored_detections(document, validation_mode, page_budget_sec):
+    """저장된 페이지별 검출 결과 조회
+
+    같은 검증 모드의 결과가 없으면 '둘 다 검증' 결과(두 바코드를 모두 찾은 결과)를 단일 모드에도
+    사용합니다. 시간 예산 초과로 중단된 페이지가 있으면 같은 시간 예산일 때만 재사용합니다.
+    """
+    if document is None:
+        return None
+    for mode in (validation_mode, "both"):
+        stored = document["detections"].get(mode)
+        if stored is None:
+            continue
+        all_complete = all(d["detection_status"] == "complete" for d in stored["pages"].values())
+        if all_complete or stored["page_budget_sec"] == page_budget_sec:
+            return stored["pages"]
+    return None
+
+def store_detections(document, validation_mode, page_budget_sec, page_detections):
+    """페이지별 검출 결과를 문서 결과 저장소에 기록"""
+    if document is not None:
+        document["detections"][validation_mode] = {
+            "page_budget_sec": page_budget_sec,
+            "pages": page_detections
+        }
+
+
 # =========================================================
 # Streamlit UI 부분
 # =========================================================
@@ -1452,6 +843,7 @@ def display_format_help():
 def main():
     # 설정 파일에서 구성 로드
     config = load_config()
+    configure_decode_threads()
     
     # 디버그: 로드된 설정 출력
     debug_info(f"디버그: 로드된 설정: {config}")
@@ -1471,8 +863,30 @@ def main():
         st.session_state.i_n_check = config["i_n_check"]
     if 'i_to_n_mapping' not in st.session_state:
         st.session_state.i_to_n_mapping = config["i_to_n_mapping"]
+    if 'page_decode_budget_sec' not in st.session_state:
+        st.session_state.page_decode_budget_sec = config["page_decode_budget_sec"]
+    if 'page_workers' not in st.session_state:
+        st.session_state.page_workers = config["page_workers"]
+    if 'decode_threads' not in st.session_state:
+        st.session_state.decode_threads = config["decode_threads"]
+    if 'decode_cache_mb' not in st.session_state:
+        st.session_state.decode_cache_mb = config["decode_cache_mb"]
+    if 'decode_cache_disk' not in st.session_state:
+        st.session_state.decode_cache_disk = config["decode_cache_disk"]
+    if 'office_pool_size' not in st.session_state:
+        st.session_state.office_pool_size = config["office_pool_size"]
+    if 'office_direct_first' not in st.session_state:
+        st.session_state.office_direct_first = config["office_direct_first"]
+    if 'conversion_cache_mb' not in st.session_state:
+        st.session_state.conversion_cache_mb = config["conversion_cache_mb"]
+    if 'conversion_client_id' not in st.session_state:
+        # Office 변환 대기열에서 세션을 구분하는 식별자
+        st.session_state.conversion_client_id = uuid.uuid4().hex
     if 'validation_mode' not in st.session_state:
         st.session_state.validation_mode = "both"  # 기본값: 둘 다 검증
+    
+    # Office 변환 서버는 첫 화면 표시 때 백그라운드에서 미리 시작 (첫 Office 파일 변환 대기 시간 단축)
+    get_office_converter(st.session_state.office_pool_size)
 
     # 메인 페이지
     st.title("DataMatrix 바코드 검증 도구 🔍")
@@ -1620,6 +1034,142 @@ def main():
                                 key=f"i_val_{i_val}_key"
                             )
             
+            # 바코드 검출 설정 UI
+            st.markdown("#### 바코드 검출 설정")
+            st.markdown("페이지 하나의 바코드 검출에 사용할 최대 시간을 설정합니다. 포함 이미지, 후보 영역, 전체 페이지 등 여러 단계로 검출하는 페이지도 모든 단계를 합쳐 이 시간 안에서 검출하며, 시간이 초과되면 해당 페이지의 검출을 중단합니다.")
+            st.session_state.page_decode_budget_sec = st.number_input(
+                "페이지당 검출 시간 예산 (초)",
+                min_value=5,
+                max_value=600,
+                value=int(st.session_state.page_decode_budget_sec),
+                key="page_decode_budget_sec_key"
+            )
+            
+            st.session_state.page_workers = st.number_input(
+                "페이지 병렬 처리 프로세스 수 (0 = CPU 코어 수)",
+                min_value=0,
+                max_value=64,
+                value=int(st.session_state.page_workers),
+                key="page_workers_key"
+            )
+            st.caption(f"현재 적용되는 프로세스 수: {get_page_worker_count(st.session_state.page_workers)}")
+            
+            st.session_state.decode_threads = st.number_input(
+                "페이지 내부 병렬 디코딩 스레드 수 (0 = CPU 코어 수, 1 = 사용 안함)",
+                min_value=0,
+                max_value=64,
+                value=int(st.session_state.decode_threads),
+                key="decode_threads_key"
+            )
+            st.caption("페이지가 하나이거나 프로세스 병렬 처리를 사용할 수 없을 때 적용됩니다. "
+                       "OpenCV 스레드 수는 앱을 시작할 때 저장된 설정 값으로 정해집니다.")
+            
+            # 디코딩 결과 캐시 설정 UI
+            st.markdown("#### 디코딩 결과 캐시")
+            st.markdown("같은 페이지 이미지를 다시 검사할 때 이전 바코드 검출 결과를 재사용합니다.")
+            st.session_state.decode_cache_mb = st.number_input(
+                "메모리 캐시 크기 (MB)",
+                min_value=1,
+                max_value=4096,
+                value=int(st.session_state.decode_cache_mb),
+                key="decode_cache_mb_key"
+            )
+            if 'decode_cache_disk_key' not in st.session_state:
+                st.session_state.decode_cache_disk_key = st.session_state.decode_cache_disk
+            st.session_state.decode_cache_disk = st.checkbox(
+                "디스크 캐시 사용 (재시작 후에도 유지)",
+                key="decode_cache_disk_key"
+            )
+            
+            decode_cache = get_decode_cache(st.session_state.decode_cache_mb, st.session_state.decode_cache_disk)
+            if decode_cache is not None:
+                cache_stats = decode_cache.stats()
+                cache_col1, cache_col2 = st.columns(2)
+                with cache_col1:
+                    st.metric("캐시 적중", cache_stats["hits"])
+                with cache_col2:
+                    st.metric("캐시 미적중", cache_stats["misses"])
+                st.caption(f"메모리 적중 {cache_stats['memory_hits']}회, 디스크 적중 {cache_stats['disk_hits']}회 · "
+                           f"메모리 항목 {cache_stats['memory_entries']}개 ({cache_stats['memory_bytes'] / 1024 / 1024:.1f} MB)")
+                if st.button("캐시 비우기"):
+                    decode_cache.clear()
+                    st.success("디코딩 결과 캐시를 비웠습니다.")
+            
+            # Office 변환 서버 설정 UI
+            st.markdown("#### Office 변환 서버")
+            st.markdown("LibreOffice를 미리 실행해 두고 PPTX/XLSX 파일 변환에 재사용합니다. 0이면 파일마다 LibreOffice를 새로 실행합니다. "
+                        "동시에 변환하는 파일 수도 이 값(최소 1)으로 제한되며, 여러 세션의 요청은 번갈아 처리됩니다.")
+            st.session_state.office_pool_size = st.number_input(
+                "LibreOffice 인스턴스 수 (0 = 사용 안함)",
+                min_value=0,
+                max_value=16,
+                value=int(st.session_state.office_pool_size),
+                key="office_pool_size_key"
+            )
+            conversion_metrics = get_office_conversion_metrics()
+            if conversion_metrics is not None:
+                metrics_stats = conversion_metrics.stats()
+                metrics_col1, metrics_col2 = st.columns(2)
+                with metrics_col1:
+                    st.metric("변환 p95 (초)", f"{metrics_stats['p95']:.1f}" if metrics_stats["p95"] is not None else "-")
+                with metrics_col2:
+                    st.metric("제한 시간 초과", metrics_stats["timeouts"])
+                if metrics_stats["max"] is not None:
+                    st.caption(f"성공 {metrics_stats['conversions']}건 · 실패 {metrics_stats['failures']}건 · "
+                               f"p50 {metrics_stats['p50']:.1f}초 · 최대 {metrics_stats['max']:.1f}초")
+            if 'office_direct_first_key' not in st.session_state:
+                st.session_state.office_direct_first_key = st.session_state.office_direct_first
+            st.session_state.office_direct_first = st.checkbox(
+                "Office 포함 그림 우선 검출 (PowerPoint는 그림에서 바코드를 찾지 못한 슬라이드만, Excel은 벡터 그림이 있을 때만 변환)",
+                key="office_direct_first_key"
+            )
+            office_converter = get_office_converter(st.session_state.office_pool_size)
+            if office_converter is not None:
+                converter_stats = office_converter.stats()
+                office_col1, office_col2 = st.columns(2)
+                with office_col1:
+                    st.metric("변환 완료", converter_stats["conversions"])
+                with office_col2:
+                    st.metric("유휴 인스턴스", f"{converter_stats['idle']}/{converter_stats['size']}")
+                st.caption(f"재시작 {converter_stats['restarts']}회 · 시작 실패 {converter_stats['failures']}회")
+            else:
+                if not have_uno():
+                    st.caption("UNO 모듈(python3-uno)을 불러올 수 없어 파일마다 LibreOffice를 새로 실행합니다 (슬롯마다 전용 프로필 사용).")
+                office_converter = get_office_command_converter(st.session_state.office_pool_size)
+                if office_converter is not None:
+                    converter_stats = office_converter.stats()
+                    office_col1, office_col2 = st.columns(2)
+                    with office_col1:
+                        st.metric("변환 완료", converter_stats["conversions"])
+                    with office_col2:
+                        st.metric("유휴 슬롯", f"{converter_stats['idle']}/{converter_stats['size']}")
+            if office_converter is not None:
+                # 세션 간 공정 대기열 상태
+                wait_p95 = converter_stats["wait_p95"]
+                st.caption(f"변환 대기 {converter_stats['queue_depth']}건 (세션 {converter_stats['waiting_sessions']}개, "
+                           f"최대 {converter_stats['max_queue_depth']}건) · 대기 시간 p95 "
+                           f"{f'{wait_p95:.1f}초' if wait_p95 is not None else '-'}")
+                if converter_stats["last_error"]:
+                    st.caption(f"마지막 오류: {converter_stats['last_error']}")
+            
+            # 변환된 PDF 캐시 설정 UI
+            st.session_state.conversion_cache_mb = st.number_input(
+                "변환 PDF 캐시 크기 (MB, 0 = 사용 안함)",
+                min_value=0,
+                max_value=16384,
+                value=int(st.session_state.conversion_cache_mb),
+                key="conversion_cache_mb_key"
+            )
+            conversion_cache = get_conversion_cache(st.session_state.conversion_cache_mb)
+            if conversion_cache is not None:
+                conversion_cache_stats = conversion_cache.stats()
+                st.caption(f"같은 Office 파일을 다시 올리면 LibreOffice 변환을 생략합니다 · "
+                           f"적중 {conversion_cache_stats['hits']}회, 미적중 {conversion_cache_stats['misses']}회 · "
+                           f"{conversion_cache_stats['entries']}개 파일 ({conversion_cache_stats['bytes'] / 1024 / 1024:.1f} MB)")
+                if st.button("변환 캐시 비우기"):
+                    conversion_cache.clear()
+                    st.success("변환된 PDF 캐시를 비웠습니다.")
+            
             # 설정은 관리자 모드 종료 시 자동으로 저장됩니다
             st.info("설정은 관리자 모드 종료 시 자동으로 저장됩니다.")
             
@@ -1736,165 +1286,179 @@ def main():
             # 파일 내용 읽기
             file_content = uploaded_file.getvalue()
             
-            # 슬라이드별 이미지 그룹화를 위한 딕셔너리
-            slide_images = {}
+            # 같은 파일이면 (위젯 조작으로 인한 재실행 포함) 이전 결과 재사용
+            file_hash = hashlib.sha256(file_content).hexdigest()
+            document = get_stored_document(file_hash)
+            page_detections = get_stored_detections(document, st.session_state.validation_mode,
+                                                    st.session_state.page_decode_budget_sec)
             
-            # 파일 형식에 따라 이미지 추출
-            if file_extension == 'pdf':
-                status_placeholder.markdown("PDF 파일에서 이미지 추출 중...")
-                
+            if page_detections is not None:
+                progress_bar.progress(100)
+                status_placeholder.markdown(f"이전에 처리한 파일입니다. 저장된 {len(page_detections)}개 페이지의 검출 결과를 사용합니다.")
                 
-                # PDF는 페이지별로 이미지 추출
-                images = extract_images_from_pdf(file_content,
-                                              lambda p: progress_bar.progress(p))
-                for i, image in enumerate(images):
-                    slide_num = i + 1
-                    slide_images[slide_num] = [image]  # 각 페이지를 개별 리스트로 포장
+                # 바코드 처리 섹션 헤더
+                st.markdown("### 🔎 바코드 검색 및 검증 결과")
+            else:
+                render_state = {"total": None}
+                pptx_direct = False
+                office = get_office_services() if file_extension != 'pdf' else None
                 
-                if images:
-                    status_placeholder.markdown(f"PDF에서 {len(images)}개 페이지 추출 완료")
+                if document is not None and document["slide_images"] is not None:
+                    # 이전에 추출한 Office 슬라이드 이미지 재사용 (슬라이드 그림이면 필요한 슬라이드는 다시 변환)
+                    slide_images = document["slide_images"]
+                    pptx_direct = document["pptx_direct"]
+                    progress_bar.progress(100)
+                    status_placeholder.markdown(f"이전에 처리한 파일입니다. 저장된 {len(slide_images)}개 페이지를 사용합니다.")
                 else:
-                    status_placeholder.error("PDF에서 이미지를 추출할 수 없습니다.")
+                    # PDF는 페이지를 하나씩 렌더링하면서 바로 검출하므로 slide_images가 None (모든 페이지를 메모리에 올리지 않음)
+                    slide_images, pptx_direct = extract_document_pages(
+                        file_content, file_extension,
+                        direct_first=st.session_state.office_direct_first,
+                        office=office,
+                        progress_callback=progress_bar.progress,
+                        status_callback=status_placeholder.markdown)
                     
-            elif file_extension in ['xlsx', 'xls', 'pptx', 'ppt']:
-                filetype_name = {'xlsx': 'Excel', 'xls': 'Excel', 'pptx': 'PowerPoint', 'ppt': 'PowerPoint'}
-                status_placeholder.markdown(f"{filetype_name[file_extension]} 파일 처리 중...")
+                    # 이미지가 추출되었는지 확인
+                    if slide_images is not None and not slide_images:
+                        status_placeholder.error("이미지를 추출할 수 없습니다. 파일이 올바른지 확인하세요.")
+                        st.stop()
                 
-                # Office 파일에서 슬라이드별 이미지 추출
-                def update_progress(p, status="파일 처리 중..."):
-                    progress_bar.progress(p)
-                    status_placeholder.markdown(status)
+                def update_render_progress(rendered, total_pages):
+                    render_state["total"] = total_pages
+                    progress_bar.progress(int(rendered * 100 / total_pages))
+                    status_placeholder.markdown(f"PDF 페이지 렌더링 중... ({rendered}/{total_pages})")
                 
-                slide_images = extract_images_from_office_file(file_content, file_extension, update_progress)
-                total_images = sum(len(images) for images in slide_images.values())
+                # 바코드 처리 섹션 헤더
+                st.markdown("### 🔎 바코드 검색 및 검증 결과")
                 
-                if total_images > 0:
-                    status_placeholder.markdown(f"{filetype_name[file_extension]}에서 {len(slide_images)}개 슬라이드, {total_images}개 이미지 추출 완료")
-                else:
-                    status_placeholder.error(f"{filetype_name[file_extension]} 파일에서 이미지를 추출할 수 없습니다.")
-            else:
-                status_placeholder.error(f"지원되지 않는 파일 형식: {file_extension}")
-                slide_images = {}
-            
-            # 이미지가 추출되었는지 확인
-            if not slide_images:
-                status_placeholder.error("이미지를 추출할 수 없습니다. 파일이 올바른지 확인하세요.")
-                st.stop()
-            
-            # 페이지별 결과를 저장할 딕셔너리
-            page_results = {}
-            
-            # 44x44 데이터매트릭스 중복 검사를 위한 추적 딕셔너리
-            matrices_44x44_track = {}  # key: 데이터 내용, value: 페이지 번호
+                # 모든 페이지의 바코드 검출 (여러 페이지는 프로세스 풀에서 병렬 처리, 결과는 페이지 순서대로)
+                detection_progress = st.progress(0)
+                detection_status = st.empty()
+                detection_status.markdown("바코드 검색 중...")
+                
+                def update_detection_progress(done_count, total):
+                    total = total or render_state["total"]
+                    if total:
+                        detection_progress.progress(min(100, int(done_count * 100 / total)))
+                        detection_status.markdown(f"바코드 검색 중... ({done_count}/{total} 페이지 완료)")
+                    else:
+                        detection_status.markdown(f"바코드 검색 중... ({done_count} 페이지 완료)")
+                
+                def update_detection_stage(message):
+                    detection_progress.progress(0)
+                    detection_status.markdown(message)
+                
+                def detect_pages(pages, total=None, budgets=None):
+                    return run_page_detection(
+                        pages,
+                        st.session_state.validation_mode,
+                        st.session_state.page_decode_budget_sec,
+                        max_workers=st.session_state.page_workers,
+                        progress_callback=update_detection_progress,
+                        decode_threads=st.session_state.decode_threads,
+                        cache=get_decode_cache(st.session_state.decode_cache_mb, st.session_state.decode_cache_disk),
+                        total=total,
+                        render_scale=PDF_RENDER_SCALE,
+                        page_budgets=budgets)
+                
+                # PDF: 포함 이미지 -> 후보 영역 -> 전체 페이지, PowerPoint: 슬라이드 그림 -> 필요한 슬라이드만 변환 이미지
+                page_detections = detect_document_pages(
+                    file_content, slide_images, st.session_state.validation_mode, detect_pages,
+                    st.session_state.page_decode_budget_sec,
+                    pptx_direct=pptx_direct,
+                    office=office,
+                    render_progress=update_render_progress,
+                    convert_progress=lambda p: progress_bar.progress(int(p)),
+                    stage_callback=update_detection_stage)
+                
+                detection_progress.empty()
+                detection_status.empty()
+                
+                # 이미지가 추출되었는지 확인
+                if not page_detections:
+                    status_placeholder.error("이미지를 추출할 수 없습니다. 파일이 올바른지 확인하세요.")
+                    st.stop()
+                
+                if slide_images is None:
+                    status_placeholder.markdown(f"PDF에서 {len(page_detections)}개 페이지 추출 완료")
+                
+                if document is None:
+                    if slide_images is not None:
+                        image_counts = {slide_num: len(images) for slide_num, images in slide_images.items()}
+                    else:
+                        image_counts = {slide_num: 1 for slide_num in page_detections}
+                    document = store_document(file_hash, slide_images, image_counts, pptx_direct)
+                store_detections(document, st.session_state.validation_mode,
+                                 st.session_state.page_decode_budget_sec, page_detections)
             
-            # 18x18 및 44x44 매트릭스 데이터 저장을 위한 변수
-            all_18x18_data = {}  # 각 페이지의 18x18 매트릭스 데이터 저장
-            all_44x44_data = {}  # 각 페이지의 44x44 매트릭스 데이터 저장
+            slide_images = document["slide_images"]
+            image_counts = document["image_counts"]
             
-            # 바코드 처리 섹션 헤더
-            st.markdown("### 🔎 바코드 검색 및 검증 결과")
+            # 디코딩된 바코드 문자열만으로 문서 전체 검증 (설정 변경 시 재검출 없이 이 단계만 다시 실행)
+            page_results = validate_detections(page_detections, st.session_state.validation_mode,
+                                               get_validation_config(st.session_state))
             
             # 각 슬라이드/페이지 분석 결과를 보여줄 탭
-            page_tabs = st.tabs([f"페이지 {slide_num}" for slide_num in sorted(slide_images.keys())])
+            page_tabs = st.tabs([f"페이지 {slide_num}" for slide_num in sorted(image_counts.keys())])
             
-            # 각 슬라이드/페이지에서 모든 이미지 처리
-            for tab_idx, slide_num in enumerate(sorted(slide_images.keys())):
-                images = slide_images[slide_num]
+            # 각 슬라이드/페이지의 검증 결과를 페이지 순서대로 표시
+            for tab_idx, slide_num in enumerate(sorted(image_counts.keys())):
+                detection = page_detections[slide_num]
+                page_result = page_results[slide_num]
                 
                 with page_tabs[tab_idx]:
                     st.markdown(f"#### 페이지/슬라이드 {slide_num} 분석")
-                    st.write(f"슬라이드에서 추출된 이미지: {len(images)}개")
+                    st.write(f"슬라이드에서 추출된 이미지: {image_counts[slide_num]}개")
                     
                     # 이미지 미리보기 (접을 수 있는 영역)
                     with st.expander("이미지 미리보기", expanded=False):
-                        for img_idx, image in enumerate(images):
-                            st.image(image, caption=f"이미지 #{img_idx+1} ({image.width}x{image.height})", use_column_width=True)
-                    
-                    # 페이지 결과 초기화 - 검증 모드에 따라 다르게 초기화
-                    if st.session_state.validation_mode == "both":
-                        # 둘 다 검증 모드 - 모든 검증 요소 필요
-                        page_results[slide_num] = {
-                            "44x44_found": False,
-                            "18x18_found": False,
-                            "44x44_valid": False,
-                            "18x18_valid": False,
-                            "cross_valid": False,
-                            "has_duplicate_44x44": False,  # 44x44 중복 감지 필드
-                            "duplicate_page": None,  # 중복이 처음 발견된 페이지 번호
-                            "has_warnings": False,  # 경고 상태 표시
-                            "warning_messages": []  # 경고 메시지 저장
-                        }
-                    elif st.session_state.validation_mode == "44x44":
-                        # 44x44만 검증 모드 - 18x18 관련 검증 사용 안함
-                        page_results[slide_num] = {
-                            "44x44_found": False,
-                            "18x18_found": False,  # 검증 안함으로 처리
-                            "44x44_valid": False,
-                            "18x18_valid": False,  # 검증 안함으로 처리
-                            "cross_valid": False,   # 검증 안함으로 처리
-                            "skip_18x18": True,    # 18x18 검증 생략 여부
-                            "has_duplicate_44x44": False,
-                            "duplicate_page": None,
-                            "has_warnings": False,
-                            "warning_messages": []
-                        }
-                    else:  # "18x18" 모드
-                        # 18x18만 검증 모드 - 44x44 관련 검증 사용 안함
-                        page_results[slide_num] = {
-                            "44x44_found": False,  # 검증 안함으로 처리
-                            "18x18_found": False,
-                            "44x44_valid": False,  # 검증 안함으로 처리
-                            "18x18_valid": False,
-                            "cross_valid": False,   # 검증 안함으로 처리
-                            "skip_44x44": True,    # 44x44 검증 생략 여부
-                            "has_duplicate_44x44": False,
-                            "duplicate_page": None,
-                            "has_warnings": False,
-                            "warning_messages": []
-                        }
+                        if slide_images is not None:
+                            for img_idx, image in enumerate(slide_images[slide_num]):
+                                st.image(image, caption=f"이미지 #{img_idx+1} ({image.width}x{image.height})", use_column_width=True)
+                        elif st.checkbox("페이지 미리보기 표시", key=f"preview_{file_hash[:16]}_{slide_num}"):
+                            # PDF 페이지는 검출 후 보관하지 않으므로 썸네일로 다시 렌더링
+                            thumbnail = render_pdf_thumbnail(file_hash, slide_num, file_content)
+                            if thumbnail is not None:
+                                st.image(thumbnail, caption=f"페이지 {slide_num} 미리보기 ({thumbnail.width}x{thumbnail.height})", use_column_width=True)
+                            else:
+                                st.caption("미리보기를 렌더링할 수 없습니다.")
                     
-                    # 이 슬라이드에서 발견된 모든 바코드 저장
-                    all_barcodes = []
+                    all_barcodes = detection["barcodes"]
                     
-                    # 바코드 검출 진행 상태 표시
-                    barcode_progress = st.progress(0)
-                    barcode_status = st.empty()
+                    if detection.get("cached"):
+                        debug_info("이전 검출 결과(디코딩 캐시)를 재사용했습니다.")
                     
-                    # 각 이미지에서 바코드 검출 및 통합
-                    for img_idx, image in enumerate(images):
-                        barcode_status.markdown(f"이미지 #{img_idx+1} 바코드 검색 중...")
-                        
-                        # 이미지에서 데이터매트릭스 검출
-                        start_time = time.time()
-                        decoded_data = detect_datamatrix(image, lambda p: barcode_progress.progress(p))
-                        end_time = time.time()
-                        
-                        if decoded_data:
-                            barcode_status.markdown(f"이미지 #{img_idx+1}에서 {len(decoded_data)}개 바코드 발견 (검색 시간: {end_time - start_time:.2f}초)")
-                            all_barcodes.extend(decoded_data)
-                        else:
-                            barcode_status.warning(f"이미지 #{img_idx+1}에서 바코드를 찾을 수 없습니다 (검색 시간: {end_time - start_time:.2f}초)")
+                    if page_result["detection_status"] == "not_expected":
+                        st.info(f"➖ 페이지/슬라이드 {slide_num}에는 바코드가 있을 만한 그림이나 도형이 없어 검출을 생략했습니다.")
+                        continue
                     
-                    # 진행 상태 플레이스홀더 정리
-                    barcode_progress.empty()
-                    barcode_status.empty()
+                    if detection.get("render_mode") == "vector":
+                        debug_info(f"페이지를 렌더링하지 않고 벡터로 그려진 심볼 {len(detection['image_reports'])}개의 모듈 격자를 재구성하여 디코딩했습니다.")
+                    elif detection.get("render_mode") == "pictures":
+                        debug_info(f"슬라이드를 변환하지 않고 그림 {len(detection['image_reports'])}개에서 바코드를 검색했습니다.")
+                    elif detection.get("render_mode") == "embedded":
+                        debug_info("페이지를 렌더링하지 않고 PDF에 포함된 이미지에서 바코드를 찾았습니다.")
+                    elif detection.get("render_mode") == "regions":
+                        debug_info(f"저해상도 위치 탐색으로 찾은 후보 영역 {len(detection['image_reports'])}곳만 고해상도로 검색했습니다.")
+                    else:
+                        if detection.get("render_mode") == "escalated":
+                            debug_info("후보 영역에서 바코드를 찾지 못해 전체 페이지를 고해상도로 다시 검색했습니다.")
+                        elif detection.get("render_mode") == "converted":
+                            debug_info("슬라이드의 그림에서 바코드를 찾지 못해 LibreOffice로 변환한 슬라이드 이미지에서 다시 검색했습니다.")
+                        for img_idx, image_report in enumerate(detection["image_reports"]):
+                            if not image_report["count"]:
+                                st.caption(f"이미지 #{img_idx+1}에서 바코드를 찾을 수 없습니다 (검색 시간: {image_report['elapsed']:.2f}초)")
                     
-                    # 중복 제거
-                    all_barcodes = list(set(all_barcodes))
+                    if page_result["detection_status"] == "deadline":
+                        st.warning(f"⏱️ 검출 시간 예산({st.session_state.page_decode_budget_sec}초)을 초과하여 이 페이지의 바코드 검출을 중단했습니다.")
                     
                     if not all_barcodes:
                         st.error(f"페이지/슬라이드 {slide_num}에서 DataMatrix 바코드를 찾을 수 없습니다.")
                         continue
                     
-                    st.success(f"페이지/슬라이드 {slide_num}에서 총 {len(all_barcodes)}개의 DataMatrix 바코드를 발견했습니다.")
+                    st.success(f"페이지/슬라이드 {slide_num}에서 총 {len(all_barcodes)}개의 DataMatrix 바코드를 발견했습니다. (검색 시간: {detection['detection_time']:.2f}초)")
                     
-                    # 바코드 데이터 저장 변수
-                    data_44x44 = None
-                    data_18x18 = None
-                    result_44x44 = {"valid": False, "pattern_match": False}
-                    result_18x18 = {"valid": False, "pattern_match": False}
-                    
-                    # 각 바코드 데이터 처리
+                    # 각 바코드 데이터 검증 결과 표시
                     st.markdown("#### 바코드 데이터 검증")
                     
                     # 선택한 검증 모드에 대한 설명 표시
@@ -1903,116 +1467,61 @@ def main():
                     elif st.session_state.validation_mode == "18x18":
                         st.info("현재 18x18 매트릭스만 검증하는 모드입니다.")
                     
-                    for idx, data in enumerate(all_barcodes):
-                        # 검증 모드에 맞는 바코드만 처리
-                        # 44x44 매트릭스 패턴 검사
-                        if re.search(r'C[A-Za-z0-9]{3}[.,]I\d{2}[.,]W(?:LO|SE)[.,]', data) and \
-                           (st.session_state.validation_mode == "both" or st.session_state.validation_mode == "44x44"):
-                            # 이미 44x44 데이터가 있는 경우 기존 것이 유효한지 확인하고 결정
-                            if data_44x44 is None or not result_44x44["valid"]:
-                                result_44x44 = validate_44x44_matrix(
-                                    data,
-                                    b_range_check=st.session_state.b_range_check,
-                                    b_min_value=st.session_state.b_min_value,
-                                    b_max_value=st.session_state.b_max_value,
-                                    i_n_check=st.session_state.i_n_check,
-                                    i_to_n_mapping=st.session_state.i_to_n_mapping
-                                )
-                                data_44x44 = data
-                                
-                                # Streamlit UI 에 결과 표시
-                                st.markdown("##### 44x44 매트릭스 검증")
-                                display_barcode_result(idx, data, result_44x44, "44x44")
-                                
-                                # 결과 업데이트
-                                page_results[slide_num]["44x44_found"] = True
-                                page_results[slide_num]["44x44_valid"] = result_44x44["valid"]
-                                
-                                # 44x44 매트릭스 데이터 저장
-                                all_44x44_data[slide_num] = result_44x44["data"]
-                                page_results[slide_num]["44x44_data"] = result_44x44["data"]
-                                
-                                # 경고 상태 업데이트
-                                if "has_warnings" in result_44x44 and result_44x44["has_warnings"]:
-                                    page_results[slide_num]["has_warnings"] = True
-                                    page_results[slide_num]["warning_messages"].extend(result_44x44["warnings"])
-                                    
-                                    # 경고 메시지 추가 표시
-                                    st.warning("⚠️ 확인 필요:")
-                                    for warning in result_44x44["warnings"]:
-                                        st.write(f"* {warning}")
+                    check_44x44 = page_result.get("44x44_check")
+                    check_18x18 = page_result.get("18x18_check")
+                    
+                    if check_44x44:
+                        st.markdown("##### 44x44 매트릭스 검증")
+                        display_barcode_result(check_44x44["index"], check_44x44["data"], check_44x44["result"], "44x44")
                         
-                        # 18x18 매트릭스 패턴 검사
-                        if re.search(r'M[A-Za-z0-9]{4}\.I\d{2}\.C[A-Za-z0-9]{3}\.', data) and \
-                           (st.session_state.validation_mode == "both" or st.session_state.validation_mode == "18x18"):
-                            # 이미 18x18 데이터가 있는 경우 기존 것이 유효한지 확인하고 결정
-                            if data_18x18 is None or not result_18x18["valid"]:
-                                result_18x18 = validate_18x18_matrix(data)
-                                data_18x18 = data
-                                
-                                # Streamlit UI 에 결과 표시
-                                st.markdown("##### 18x18 매트릭스 검증")
-                                display_barcode_result(idx, data, result_18x18, "18x18")
-                                
-                                # 결과 업데이트
-                                page_results[slide_num]["18x18_found"] = True
-                                page_results[slide_num]["18x18_valid"] = result_18x18["valid"]
-                                
-                                # 18x18 매트릭스 데이터 저장
-                                all_18x18_data[slide_num] = result_18x18["data"]
-                                page_results[slide_num]["18x18_data"] = result_18x18["data"]
+                        # 경고 메시지 추가 표시
+                        if check_44x44["result"].get("has_warnings"):
+                            st.warning("⚠️ 확인 필요:")
+                            for warning in check_44x44["result"]["warnings"]:
+                                st.write(f"* {warning}")
+                    
+                    if check_18x18:
+                        st.markdown("##### 18x18 매트릭스 검증")
+                        display_barcode_result(check_18x18["index"], check_18x18["data"], check_18x18["result"], "18x18")
                     
                     # 페이지에 두 종류의 매트릭스가 모두 있는지 확인
                     missing_matrix = []
-                    if st.session_state.validation_mode in ["both", "44x44"] and not page_results[slide_num]["44x44_found"]:
+                    if st.session_state.validation_mode in ["both", "44x44"] and not page_result["44x44_found"]:
                         missing_matrix.append("44x44 매트릭스")
-                    if st.session_state.validation_mode in ["both", "18x18"] and not page_results[slide_num]["18x18_found"]:
+                    if st.session_state.validation_mode in ["both", "18x18"] and not page_result["18x18_found"]:
                         missing_matrix.append("18x18 매트릭스")
                     
                     if missing_matrix:
                         st.warning(f"⚠️ 경고: 이 페이지에서 {', '.join(missing_matrix)}를 찾을 수 없습니다!")
                     
-                    # 44x44 매트릭스 중복 검사
-                    if data_44x44 and page_results[slide_num]["44x44_valid"]:
-                        if data_44x44 in matrices_44x44_track:
-                            # 중복 발견
-                            original_page = matrices_44x44_track[data_44x44]
-                            page_results[slide_num]["has_duplicate_44x44"] = True
-                            page_results[slide_num]["duplicate_page"] = original_page
-                            st.error(f"❌ 중복 오류: 페이지 {original_page}에 있는 44x44 매트릭스와 동일한 데이터입니다.")
-                        else:
-                            # 처음 발견된 경우 추적 딕셔너리에 추가
-                            matrices_44x44_track[data_44x44] = slide_num
+                    # 44x44 매트릭스 중복 검사 결과
+                    if page_result["has_duplicate_44x44"]:
+                        st.error(f"❌ 중복 오류: 페이지 {page_result['duplicate_page']}에 있는 44x44 매트릭스와 동일한 데이터입니다.")
                     
-                    # 교차 검증 수행 (둘 다 검증 모드일 때만)
+                    # 교차 검증 결과 (둘 다 검증 모드일 때만)
                     if st.session_state.validation_mode == "both":
                         st.markdown("##### 교차 검증 결과")
-                        if data_44x44 and data_18x18:
-                            if result_44x44["pattern_match"] and result_18x18["pattern_match"]:
-                                cross_results = cross_validate_matrices(result_44x44, result_18x18)
-                                
-                                if "교차 검증이 성공적으로 완료되었습니다." in cross_results:
-                                    st.success(cross_results[0])
-                                    page_results[slide_num]["cross_valid"] = True
+                        if check_44x44 and check_18x18:
+                            if "cross_results" in page_result:
+                                if page_result["cross_valid"]:
+                                    st.success(page_result["cross_results"][0])
                                 else:
                                     st.error("교차 검증 실패")
-                                    for msg in cross_results:
+                                    for msg in page_result["cross_results"]:
                                         st.warning(f"- {msg}")
-                                    page_results[slide_num]["cross_valid"] = False
                             else:
                                 st.error("교차 검증을 수행할 수 없습니다. 두 매트릭스 모두 기본 형식이 일치해야 합니다.")
                         else:
                             st.error("페이지에 44x44와 18x18 매트릭스가 모두 필요합니다.")
                     else:
                         # 단일 검증 모드인 경우
-                        if st.session_state.validation_mode == "44x44" and data_44x44:
+                        if st.session_state.validation_mode == "44x44" and check_44x44:
                             st.info("현재 '44x44만 검증' 모드입니다. 교차 검증을 실행하려면 '둘 다 검증' 모드를 선택하세요.")
-                        elif st.session_state.validation_mode == "18x18" and data_18x18:
+                        elif st.session_state.validation_mode == "18x18" and check_18x18:
                             st.info("현재 '18x18만 검증' 모드입니다. 교차 검증을 실행하려면 '둘 다 검증' 모드를 선택하세요.")
             
-            # 페이지간 추가 검증 실행
-            # 외부 모듈의 process_page_validation 함수 호출
-            page_results = process_page_validation(page_results, slide_images, page_tabs, st.session_state)
+            # 페이지간 추가 검증 결과 표시 (검증은 validate_document에서 수행)
+            display_page_validation(page_results, image_counts, page_tabs, st.session_state.validation_mode)
             
             # 진행 상태 표시 제거
             progress_placeholder.empty()
@@ -2033,16 +1542,18 @@ def main():
                 report_text += f"- 처리 날짜: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
                 
                 report_text += f"## 검증 결과 요약\n"
-                issues_pages = [
-                    page_num for page_num, result in page_results.items()
-                    if not (result["44x44_found"] and result["44x44_valid"] and
-                           result["18x18_found"] and result["18x18_valid"] and
-                           result["cross_valid"])
-                ]
+                # 화면 요약, 일괄 검증(CLI)과 같은 판정 사용 (검증 모드, 페이지간 검증 포함)
+                summary = summarize_page_results(page_results, st.session_state.validation_mode)
                 
-                if issues_pages:
+                if summary["status"] == "fail" and not summary["issue_pages"]:
                     report_text += f"- 상태: ❌ 실패\n"
-                    report_text += f"- 문제 페이지: {', '.join(map(str, sorted(issues_pages)))}\n\n"
+                    report_text += f"- 바코드를 검증할 페이지가 없습니다.\n\n"
+                elif summary["status"] == "fail":
+                    report_text += f"- 상태: ❌ 실패\n"
+                    report_text += f"- 문제 페이지: {', '.join(map(str, summary['issue_pages']))}\n\n"
+                elif summary["status"] == "warning":
+                    report_text += f"- 상태: ⚠️ 확인 필요\n"
+                    report_text += f"- 모든 페이지의 기본 검증은 통과했지만, 확인이 필요한 항목이 있습니다.\n\n"
                 else:
                     report_text += f"- 상태: ✅ 성공\n"
                     report_text += f"- 모든 페이지가 검증을 통과했습니다.\n\n"
@@ -2050,6 +1561,11 @@ def main():
                 report_text += f"## 페이지별 상세 결과\n"
                 for page_num, result in sorted(page_results.items()):
                     report_text += f"### 페이지/슬라이드 {page_num}\n"
+                    if result.get("detection_status") == "not_expected":
+                        report_text += f"- 검출 상태: ➖ 바코드 없는 슬라이드 (검출 생략)\n\n"
+                        continue
+                    if result.get("detection_status") == "deadline":
+                        report_text += f"- 검출 상태: ⏱️ 시간 예산 초과로 중단\n"
                     report_text += f"- 44x44 매트릭스: {'발견' if result['44x44_found'] else '없음'}\n"
                     if result['44x44_found']:
                         report_text += f"  - 유효성: {'통과' if result['44x44_valid'] else '실패'}\n"
@@ -2079,4 +1595,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with message_handler(show_engine_message):
+        main()
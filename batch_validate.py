@@ -0,0 +1,223 @@
+"""
+데이터매트릭스 검증기 일괄 검증 CLI
+- 파일/디렉토리/glob 패턴으로 지정한 문서를 Streamlit 없이 검증하고 문서별 결과를 JSON Lines로 출력합니다.
+- 문서는 프로세스 풀에서 병렬로 처리하며, 검출/검증은 웹 앱과 같은 datamatrix_engine을 사용합니다.
+
+사용법:
+    python -m batch_validate 출하문서/ "보관함/**/*.pdf" --output results.jsonl --workers 4
+
+종료 코드: 0 모든 문서 통과(확인 필요 항목 포함), 1 검증 실패 문서 있음, 2 처리할 수 없는 문서 있음
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from datamatrix_engine import (DEFAULT_CONFIG, DECODE_CACHE_DB, CONVERSION_CACHE_DIR, PDF_RENDER_SCALE,
+                               SUPPORTED_EXTENSIONS, message_handler, configure_opencv_threads,
+                               run_page_detection, analyze_document, summarize_page_results, get_validation_config)
+
+try:
+    from decode_cache import DecodeCache
+    HAVE_DECODE_CACHE = True
+except ImportError:
+    HAVE_DECODE_CACHE = False
+
+try:
+    from office_converter import CommandConverterPool, ConversionCache
+    HAVE_OFFICE_CONVERTER = True
+except ImportError:
+    HAVE_OFFICE_CONVERTER = False
+
+# 설정 파일 기본 경로 (웹 앱과 같은 설정 파일 사용)
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datamatrix_config.json")
+
+# 종료 코드
+EXIT_PASS = 0
+EXIT_VALIDATION_FAILED = 1
+EXIT_PROCESSING_ERROR = 2
+
+# 작업자 프로세스별 공유 객체 (_init_worker에서 설정)
+_worker = {}
+
+def load_config(config_path):
+    """설정 파일 불러오기 (파일이 없거나 빠진 항목은 기본값 사용)"""
+    config = dict(DEFAULT_CONFIG)
+    if config_path and os.path.exists(config_path):
+        with open(config_path, 'r') as f:
+            config.update(json.load(f))
+    return config
+
+def collect_documents(targets):
+    """파일, 디렉토리(하위 디렉토리 포함), glob 패턴 목록에서 검증할 문서 경로 목록 생성 (중복 제거, 정렬)"""
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            matches = glob.glob(os.path.join(target, "**", "*"), recursive=True)
+        elif os.path.isfile(target):
+            matches = [target]
+        else:
+            matches = glob.glob(target, recursive=True)
+        # 같은 파일을 다르게 적은 경로(./a.pdf, a.pdf)도 한 번만 검증하도록 경로를 정규화
+        paths.extend(os.path.normpath(path) for path in matches
+                     if os.path.isfile(path) and path.rsplit('.', 1)[-1].lower() in SUPPORTED_EXTENSIONS)
+    return sorted(set(paths))
+
+def _init_worker(config, work_dir, page_workers, decode_threads):
+    """작업자 프로세스 초기화 - 디코딩 캐시, OpenCV 스레드 수와 Office 변환 설정 준비 (변환 슬롯은 처음 필요할 때 생성)"""
+    _worker.clear()
+    _worker["config"] = config
+    _worker["work_dir"] = work_dir
+    _worker["page_workers"] = page_workers
+    _worker["decode_threads"] = decode_threads
+    _worker["decode_cache"] = None
+    configure_opencv_threads(decode_threads)
+    if HAVE_DECODE_CACHE and int(config["decode_cache_mb"]) > 0:
+        _worker["decode_cache"] = DecodeCache(max_memory_bytes=int(config["decode_cache_mb"]) * 1024 * 1024,
+                                              db_path=DECODE_CACHE_DB if config["decode_cache_disk"] else None)
+
+def _office_services():
+    """작업자 프로세스의 Office 변환 공유 객체 (작업자마다 전용 프로필 슬롯 하나 사용)"""
+    if "office" not in _worker:
+        office = {}
+        if HAVE_OFFICE_CONVERTER:
+            command_pool = CommandConverterPool(size=1, base_dir=os.path.join(_worker["work_dir"],
+                                                                              f"worker_{os.getpid()}"))
+            if command_pool.available:
+                office["command_pool"] = command_pool
+            if int(_worker["config"]["conversion_cache_mb"]) > 0:
+                try:
+                    office["cache"] = ConversionCache(CONVERSION_CACHE_DIR,
+                                                      max_bytes=int(_worker["config"]["conversion_cache_mb"]) * 1024 * 1024)
+                except OSError:
+                    pass
+        _worker["office"] = office
+    return _worker["office"]
+
+def page_record(page_num, detection, page_result):
+    """페이지 하나의 검출/검증 결과를 JSON으로 저장할 딕셔너리로 변환"""
+    record = {"page": page_num, "barcodes": detection["barcodes"], "render_mode": detection.get("render_mode")}
+    record.update(page_result)
+    return record
+
+def validate_file(path, validation_mode):
+    """문서 하나를 검증하여 결과 딕셔너리 반환 (처리 중 오류는 status "error"로 기록)"""
+    config = _worker["config"]
+    messages = []
+    
+    def record_message(level, message):
+        # 디버그 메시지는 기록하지 않음
+        if level != "debug":
+            messages.append({"level": level, "message": message})
+    
+    start_time = time.time()
+    result = {"file": path, "status": "error", "issue_pages": [], "pages": []}
+    with message_handler(record_message):
+        try:
+            with open(path, 'rb') as f:
+                file_content = f.read()
+            file_extension = path.rsplit('.', 1)[-1].lower()
+
+            def detect_pages(pages, total=None, budgets=None):
+                return run_page_detection(
+                    pages,
+                    validation_mode,
+                    config["page_decode_budget_sec"],
+                    max_workers=_worker["page_workers"],
+                    decode_threads=_worker["decode_threads"],
+                    cache=_worker["decode_cache"],
+                    total=total,
+                    render_scale=PDF_RENDER_SCALE,
+                    page_budgets=budgets)
+            
+            office = _office_services() if file_extension != 'pdf' else None
+            page_detections, page_results = analyze_document(file_content, file_extension, validation_mode,
+                                                             detect_pages, config["page_decode_budget_sec"],
+                                                             get_validation_config(config),
+                                                             direct_first=config["office_direct_first"],
+                                                             office=office)
+            if not page_results:
+                result["error"] = "이미지를 추출할 수 없습니다. 파일이 올바른지 확인하세요."
+            else:
+                result.update(summarize_page_results(page_results, validation_mode))
+                result["pages"] = [page_record(page_num, page_detections[page_num], page_results[page_num])
+                                   for page_num in sorted(page_results)]
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {str(e)}"
+    result["elapsed"] = round(time.time() - start_time, 3)
+    result["messages"] = messages
+    return result
+
+def exit_code(results):
+    """문서별 결과로 종료 코드 결정 (처리 오류가 검증 실패보다 우선)"""
+    statuses = {result["status"] for result in results}
+    if "error" in statuses:
+        return EXIT_PROCESSING_ERROR
+    if "fail" in statuses:
+        return EXIT_VALIDATION_FAILED
+    return EXIT_PASS
+
+def parse_args(argv=None):
+    """명령행 인자 해석"""
+    parser = argparse.ArgumentParser(
+        prog="python -m batch_validate",
+        description="PDF/PowerPoint/Excel 문서의 DataMatrix 바코드를 일괄 검증하고 결과를 JSON Lines로 출력합니다.")
+    parser.add_argument("targets", nargs="+", help="검증할 파일, 디렉토리(하위 디렉토리 포함) 또는 glob 패턴")
+    parser.add_argument("-o", "--output", help="결과 JSON Lines 파일 (지정하지 않으면 표준 출력)")
+    parser.add_argument("-w", "--workers", type=int, default=0,
+                        help="동시에 처리할 문서 수 (0이면 CPU 코어 수, 1이면 페이지 단위 병렬 처리 설정 사용)")
+    parser.add_argument("-m", "--mode", choices=("both", "44x44", "18x18"), default="both", help="검증 모드")
+    parser.add_argument("-c", "--config", default=CONFIG_FILE, help="설정 파일 (기본값: 웹 앱 설정 파일)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """일괄 검증 실행 (종료 코드 반환)"""
+    args = parse_args(argv)
+    config = load_config(args.config)
+    paths = collect_documents(args.targets)
+    if not paths:
+        print("검증할 문서를 찾을 수 없습니다.", file=sys.stderr)
+        return EXIT_PROCESSING_ERROR
+
+    workers = min(args.workers if args.workers > 0 else (os.cpu_count() or 1), len(paths))
+    work_dir = tempfile.mkdtemp(prefix="dmtx-batch-")
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    results = []
+
+    def write(result):
+        results.append(result)
+        output.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+        output.flush()
+        print(f"[{len(results)}/{len(paths)}] {result['status']}: {result['file']}", file=sys.stderr)
+
+    try:
+        if workers <= 1:
+            # 문서를 하나씩 처리하며 페이지 단위 병렬 처리는 설정 파일 값 사용
+            _init_worker(config, work_dir, config["page_workers"], config["decode_threads"])
+            for path in paths:
+                write(validate_file(path, args.mode))
+        else:
+            # 문서 단위로 병렬 처리하므로 작업자 안에서는 페이지를 순차 검출 (코어 과점유 방지)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(config, work_dir, 1, 1)) as executor:
+                for result in executor.map(validate_file, paths, [args.mode] * len(paths)):
+                    write(result)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    counts = {status: sum(1 for result in results if result["status"] == status)
+              for status in ("pass", "warning", "fail", "error")}
+    print(f"통과 {counts['pass']}건, 확인 필요 {counts['warning']}건, 실패 {counts['fail']}건, "
+          f"오류 {counts['error']}건", file=sys.stderr)
+    return exit_code(results)
+
+if __name__ == "__main__":
+    sys.exit(main())
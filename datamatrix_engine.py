@@ -0,0 +1,3251 @@
+"""
+데이터매트릭스 검증기 검출/검증 엔진 모듈
+- 문서(PDF, PPTX, XLSX)에서 페이지별 이미지를 추출하고 DataMatrix 바코드를 검출하여 검증합니다.
+- Streamlit에 의존하지 않으므로 웹 앱(app.py)과 일괄 검증 CLI(batch_validate.py)가 함께 사용합니다.
+- 처리 중 메시지는 message_handler로 현재 스레드에 지정한 함수로 전달됩니다 (기본값은 표준 오류 출력).
+- OpenCV, pylibdmtx, PDF/Office 라이브러리는 처음 사용할 때 불러오므로 모듈을 가져오는 비용이 작습니다.
+"""
+
+import os
+import io
+import sys
+import re
+import time
+import shutil
+import tempfile
+import hashlib
+import ctypes
+import functools
+import importlib
+import threading
+import contextlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+import numpy as np
+from PIL import Image
+
+# 추가 검증 모듈 불러오기
+try:
+    from validator_addon import validate_cross_page
+    HAVE_VALIDATOR_ADDON = True
+except ImportError:
+    HAVE_VALIDATOR_ADDON = False
+
+    # 폴백 함수 정의
+    def validate_cross_page(page_results, validation_mode):
+        return page_results
+
+# 디코딩 결과 캐시 모듈 불러오기
+try:
+    from decode_cache import image_digest
+    HAVE_DECODE_CACHE = True
+except ImportError:
+    HAVE_DECODE_CACHE = False
+
+# Office 변환 서버 모듈 불러오기
+try:
+    from office_converter import (ConversionTimeout, ConversionCache, conversion_timeout, run_conversion_command,
+                                  find_soffice, soffice_version)
+    HAVE_OFFICE_CONVERTER = True
+except ImportError:
+    HAVE_OFFICE_CONVERTER = False
+
+    # 폴백 함수 정의 (제한 시간 없이 변환)
+    class ConversionTimeout(RuntimeError):
+        pass
+
+    def conversion_timeout(size_bytes):
+        return None
+
+    def run_conversion_command(cmd, timeout=None):
+        import subprocess
+        process = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return process.returncode, process.stderr
+
+# =========================================================
+# 선택 라이브러리 (처음 사용할 때 불러옴)
+# =========================================================
+
+# 이름 -> 모듈 경로. 모듈을 불러오는 데 시간이 걸리므로 엔진을 불러올 때가 아니라 처음 사용할 때
+# load_library로 불러오며, PDF만 처리하는 프로세스는 python-pptx 등을 불러오지 않습니다.
+OPTIONAL_LIBRARIES = {
+    "cv2": "cv2",
+    "pylibdmtx": "pylibdmtx.pylibdmtx",
+    "pdf2image": "pdf2image",
+    "pdfium": "pypdfium2",
+    "pptx": "pptx",
+    "openpyxl": "openpyxl",
+    "PyPDF2": "PyPDF2",
+}
+
+@functools.lru_cache(maxsize=None)
+def load_library(name):
+    """선택 라이브러리를 불러와 반환 (프로세스당 한 번만 시도하며, 불러올 수 없으면 None)"""
+    try:
+        return importlib.import_module(OPTIONAL_LIBRARIES[name])
+    except ImportError:
+        return None
+
+def have_library(name):
+    """선택 라이브러리를 사용할 수 있는지 확인 (처음 확인할 때 라이브러리를 불러옴)"""
+    return load_library(name) is not None
+
+class LazyLibrary:
+    """속성에 처음 접근할 때 load_library로 라이브러리를 불러오는 대리 객체 (사용 전에 have_library로 확인)"""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        module = load_library(self._name)
+        if module is None:
+            raise ImportError(f"{OPTIONAL_LIBRARIES[self._name]} 라이브러리를 불러올 수 없습니다.")
+        return getattr(module, attr)
+
+cv2 = LazyLibrary("cv2")
+pdf2image = LazyLibrary("pdf2image")
+pdfium = LazyLibrary("pdfium")
+
+def decode(image, **kwargs):
+    """pylibdmtx로 DataMatrix 디코딩 (라이브러리를 불러올 수 없으면 빈 목록)"""
+    pylibdmtx = load_library("pylibdmtx")
+    if pylibdmtx is None:
+        return []
+    return pylibdmtx.decode(image, **kwargs)
+
+@functools.lru_cache(maxsize=None)
+def probe_dependencies():
+    """선택 라이브러리와 시스템 프로그램 설치 여부 확인 (프로세스당 한 번, 라이브러리를 불러오지 않음)
+
+    파이썬 패키지는 설치 여부만 확인하므로, 설치되어 있어도 불러오다 실패할 수 있습니다
+    (실제 사용 가능 여부는 have_library). 시스템 패키지 설치는 배포 단계에서 미리 해야 합니다
+    (packages.txt, Dockerfile, init_script.sh).
+
+    Returns:
+    --------
+    dict : OPTIONAL_LIBRARIES의 이름 -> 설치 여부, "libdmtx"(libdmtx 공유 라이브러리),
+           "libreoffice"(LibreOffice 실행 파일) -> 설치 여부
+    """
+    import ctypes.util
+    import importlib.util
+    import platform
+
+    dependencies = {}
+    for name, module_path in OPTIONAL_LIBRARIES.items():
+        try:
+            dependencies[name] = importlib.util.find_spec(module_path.split(".")[0]) is not None
+        except (ImportError, ValueError):
+            dependencies[name] = False
+
+    # Windows용 pylibdmtx는 libdmtx DLL을 함께 설치하므로 패키지 설치 여부로 판단
+    if platform.system() == "Windows":
+        dependencies["libdmtx"] = dependencies["pylibdmtx"]
+    else:
+        dependencies["libdmtx"] = ctypes.util.find_library("dmtx") is not None
+
+    if HAVE_OFFICE_CONVERTER:
+        dependencies["libreoffice"] = find_soffice() is not None
+    else:
+        dependencies["libreoffice"] = any(shutil.which(name) for name in ("soffice", "libreoffice"))
+    return dependencies
+
+# =========================================================
+# 처리 메시지 전달
+# =========================================================
+
+def _print_message(level, message):
+    """기본 메시지 처리 함수 - 디버그 메시지를 제외하고 표준 오류로 출력"""
+    if level != "debug":
+        print(f"[{level}] {message}", file=sys.stderr)
+
+# 스레드별 메시지 처리 함수 (message_handler로 지정)
+_message_state = threading.local()
+
+@contextlib.contextmanager
+def message_handler(handler):
+    """with 문 안에서 현재 스레드의 처리 중 메시지를 받을 함수 지정
+
+    handler(level, message)의 level은 "debug", "info", "warning", "error" 중 하나입니다. 지정은 현재
+    스레드에만 적용되므로 여러 세션(스레드)이 동시에 처리해도 메시지가 섞이지 않으며, 함수를 지정하지
+    않은 스레드의 메시지는 표준 오류로 출력됩니다. 작업자 프로세스/디코딩 스레드에서 실행되는 페이지
+    검출의 메시지는 검출 결과에 담겨 돌아와 run_page_detection을 호출한 스레드에서 전달됩니다.
+    """
+    previous = getattr(_message_state, "handler", None)
+    _message_state.handler = handler
+    try:
+        yield
+    finally:
+        _message_state.handler = previous
+
+def report_message(level, message):
+    """현재 스레드에 지정된 메시지 처리 함수로 메시지 전달"""
+    (getattr(_message_state, "handler", None) or _print_message)(level, message)
+
+def debug_info(message):
+    """관리자용 디버그 메시지 전달"""
+    report_message("debug", message)
+
+# =========================================================
+# 기본 설정
+# =========================================================
+
+# 디코딩 결과 디스크 캐시 파일 경로
+DECODE_CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "decode_cache.sqlite")
+
+# 변환된 PDF 디스크 캐시 디렉토리
+CONVERSION_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conversion_cache")
+
+# 설정 파일(datamatrix_config.json)의 기본값 (이전 버전 설정 파일에 없는 항목도 이 값으로 채움)
+DEFAULT_CONFIG = {
+    "b_range_check": False,
+    "b_min_value": 80,
+    "b_max_value": 250,
+    "i_n_check": True,
+    "i_to_n_mapping": {str(i): 10 for i in range(10, 60)},
+    "page_decode_budget_sec": 30,
+    "page_workers": 0,
+    "decode_threads": 0,
+    "decode_cache_mb": 256,
+    "decode_cache_disk": False,
+    "office_pool_size": 2,
+    "office_direct_first": True,
+    "conversion_cache_mb": 512
+}
+
+# =========================================================
+# 유효성 검증 함수
+# =========================================================
+
+def validate_44x44_matrix(data, b_range_check=False, b_min_value=0, b_max_value=9999, i_n_check=False, i_to_n_mapping=None):
+    """44x44 매트릭스 데이터 검증 함수"""
+    result = {"valid": False, "errors": [], "warnings": [], "data": {}, "pattern_match": False}
+    
+    # 잘못된 구분자(,) 사용 확인
+    if re.search(r'C[A-Za-z0-9]{3},', data) or re.search(r'I\d{2},', data) or re.search(r'W(?:LO|SE),', data):
+        result["errors"].append("잘못된 구분자(,)를 사용했습니다. 구분자는 '.'(마침표)여야 합니다.")
+        # 어떤 식별자에서 잘못된 구분자를 사용했는지 확인
+        if re.search(r'C[A-Za-z0-9]{3},', data):
+            result["errors"].append("C 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'I\d{2},', data):
+            result["errors"].append("I 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'W(?:LO|SE),', data):
+            result["errors"].append("W 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'T\d{2},', data):
+            result["errors"].append("T 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'N\d{3},', data):
+            result["errors"].append("N 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'D\d{8},', data):
+            result["errors"].append("D 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'S\d{3},', data):
+            result["errors"].append("S 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'B[0-9]{120},', data):
+            result["errors"].append("B 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        return result
+
+    # 바코드 데이터에서 패턴 확인
+    pattern = r'^C([A-Za-z0-9]{3})\.I(\d{2})\.W(LO|SE)\.T(\d{2})\.N(\d{3})\.D(\d{8})\.S(\d{3})\.B([0-9]{120})\.$'
+    match = re.search(pattern, data)
+    
+    if not match:
+        result["errors"].append("44x44 매트릭스 형식이 맞지 않습니다.")
+        
+        # 개별 패턴 확인으로 어떤 부분이 문제인지 디버깅
+        C_match = re.search(r'C([A-Za-z0-9]{3})\.', data)
+        if not C_match:
+            result["errors"].append("C 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
+        
+        I_match = re.search(r'I(\d{2})\.', data)
+        if not I_match:
+            result["errors"].append("I 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
+        
+        W_match = re.search(r'W(LO|SE)\.', data)
+        if not W_match:
+            result["errors"].append("W 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (LO 또는 SE 값이어야 함)")
+        
+        T_match = re.search(r'T(\d{2})\.', data)
+        if not T_match:
+            result["errors"].append("T 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
+        
+        N_match = re.search(r'N(\d{3})\.', data)
+        if not N_match:
+            result["errors"].append("N 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
+        
+        D_match = re.search(r'D(\d{8})\.', data)
+        if not D_match:
+            result["errors"].append("D 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (YYYYMMDD 형식)")
+        
+        S_match = re.search(r'S(\d{3})\.', data)
+        if not S_match:
+            result["errors"].append("S 식별자를 찾을 수 없거나 형식이 올바르지 않습니다")
+        
+        B_match = re.search(r'B([0-9]{120})\.', data)
+        if not B_match:
+            result["errors"].append("B 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (120자리 숫자)")
+        
+        return result
+    
+    C_val, I_val, W_val, T_val, N_val, D_val, S_val, B_val = match.groups()
+    
+    # 데이터 저장
+    result["data"] = {
+        "C": C_val,
+        "I": I_val,
+        "W": W_val,
+        "T": T_val,
+        "N": N_val,
+        "D": D_val,
+        "S": S_val,
+        "B": B_val
+    }
+    
+    result["pattern_match"] = True
+    
+    # 추가 검증
+    # D: 날짜 형식 검증 (YYYYMMDD)
+    try:
+        year = int(D_val[:4])
+        month = int(D_val[4:6])
+        day = int(D_val[6:8])
+        
+        if not (1900 <= year <= 2100):
+            result["errors"].append(f"D 식별자: 연도 범위가 올바르지 않습니다 ({year})")
+        if not (1 <= month <= 12):
+            result["errors"].append(f"D 식별자: 월 범위가 올바르지 않습니다 ({month})")
+        if not (1 <= day <= 31):
+            result["errors"].append(f"D 식별자: 일 범위가 올바르지 않습니다 ({day})")
+    except ValueError:
+        result["errors"].append("D 식별자: 날짜 형식이 올바르지 않습니다")
+    
+    # B: 숫자 세트 검증
+    B_sets = []
+    non_zero_sets_count = 0
+    
+    for i in range(0, len(B_val), 4):
+        if i+4 <= len(B_val):
+            B_set = B_val[i:i+4]
+            B_sets.append(B_set)
+            if B_set != '0000':
+                non_zero_sets_count += 1
+    
+    # N: B의 세트 수와 일치하는지 확인
+    if int(N_val) != non_zero_sets_count:
+        result["errors"].append(f"N 식별자: 값 {N_val}이 B 식별자의 비어있지 않은 세트 수 {non_zero_sets_count}와 일치하지 않습니다")
+    
+    # I 값에 따른 N 최대값 검증
+    if i_n_check and i_to_n_mapping and I_val:
+        try:
+            i_val_int = int(I_val)
+            current_n_value = int(N_val)
+            
+            # I 값에 해당하는 최대 N 값 찾기
+            i_val_str = str(i_val_int)
+            if i_val_str in i_to_n_mapping:
+                max_n = i_to_n_mapping[i_val_str]
+                if current_n_value > max_n:
+                    result["errors"].append(f"N 식별자: I{I_val}에 대한 N 값이 최대 허용치({max_n})를 초과했습니다 (현재 값: {current_n_value})")
+        except (ValueError, TypeError):
+            # I 값이나 N 값이 정수로 변환할 수 없는 경우
+            pass
+    
+    # B 값 범위 검사 (활성화된 경우에만 수행 + W가 'LO'가 아닐 경우에만 수행)
+    if b_range_check and W_val != 'LO':
+        out_of_range_sets = []
+        for B_set in B_sets:
+            if B_set != '0000':
+                b_val = int(B_set)
+                if b_val < b_min_value or b_val > b_max_value:
+                    out_of_range_sets.append(f"{B_set} ({b_val})")
+        
+        if out_of_range_sets:
+            error_msg = f"B 식별자: 다음 값들이 지정된 범위({b_min_value}~{b_max_value})를 벗어납니다: {', '.join(out_of_range_sets)}"
+            result["errors"].append(error_msg)
+    elif b_range_check and W_val == 'LO':
+        # W가 'LO'인 경우 B 값 범위 검사 제외
+        result["warnings"].append(f"W 식별자가 'LO'이미로 B 값 범위 검사를 건너뜁니다.")
+    
+    # B: 숫자 세트가 오름차순인지 및 큰 점프가 있는지 확인
+    prev_set = None
+    for B_set in B_sets:
+        if B_set != '0000':
+            if prev_set:
+                # 오름차순 확인 - 여기를 경고로 변경
+                if int(B_set) <= int(prev_set):
+                    result["warnings"].append(f"B 식별자: 숫자 세트가 오름차순이 아닙니다 ({prev_set} -> {B_set})")
+                # 큰 점프 확인 (100 초과)
+                elif int(B_set) - int(prev_set) > 100:
+                    result["warnings"].append(f"B 식별자: 숫자 세트 간에 큰 점프가 있습니다 ({prev_set} -> {B_set}, 차이: {int(B_set) - int(prev_set)})")
+                # 숫자 하나를 건너뛬어도 경고 표시
+                elif int(B_set) - int(prev_set) > 1:
+                    result["warnings"].append(f"B 식별자: 숫자 세트 간에 순차가 건너뛰어졌습니다 ({prev_set} -> {B_set}, 누락 값: {int(B_set) - int(prev_set) - 1}개)")
+            prev_set = B_set
+    
+    result["valid"] = len(result["errors"]) == 0
+    result["has_warnings"] = len(result["warnings"]) > 0
+    
+    return result
+    
+def validate_18x18_matrix(data):
+    """18x18 매트릭스 데이터 검증 함수"""
+    result = {"valid": False, "errors": [], "data": {}, "pattern_match": False}
+    
+    # 잘못된 구분자(,) 사용 확인
+    if re.search(r'M[A-Za-z0-9]{4},', data) or re.search(r'I\d{2},', data) or re.search(r'C[A-Za-z0-9]{3},', data):
+        result["errors"].append("잘못된 구분자(,)를 사용했습니다. 구분자는 '.'(마침표)여야 합니다.")
+        # 어떤 식별자에서 잘못된 구분자를 사용했는지 확인
+        if re.search(r'M[A-Za-z0-9]{4},', data):
+            result["errors"].append("M 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'I\d{2},', data):
+            result["errors"].append("I 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'C[A-Za-z0-9]{3},', data):
+            result["errors"].append("C 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        if re.search(r'P\d{3},', data):
+            result["errors"].append("P 식별자 뒤에 잘못된 구분자(,)를 사용했습니다.")
+        return result
+
+    # 바코드 데이터에서 패턴 확인
+    pattern = r'^M([A-Za-z0-9]{4})\.I(\d{2})\.C([A-Za-z0-9]{3})\.P(\d{3})\.$'
+    match = re.search(pattern, data)
+    
+    if not match:
+        result["errors"].append("18x18 매트릭스 형식이 맞지 않습니다.")
+        
+        # 개별 패턴 확인으로 어떤 부분이 문제인지 디버깅
+        M_match = re.search(r'M([A-Za-z0-9]{4})\.', data)
+        if not M_match:
+            result["errors"].append("M 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (4자리 문자+숫자 조합)")
+        
+        I_match = re.search(r'I(\d{2})\.', data)
+        if not I_match:
+            result["errors"].append("I 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (2자리 숫자)")
+        
+        C_match = re.search(r'C([A-Za-z0-9]{3})\.', data)
+        if not C_match:
+            result["errors"].append("C 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (3자리 문자+숫자 조합)")
+        
+        P_match = re.search(r'P(\d{3})\.', data)
+        if not P_match:
+            result["errors"].append("P 식별자를 찾을 수 없거나 형식이 올바르지 않습니다 (3자리 숫자)")
+        
+        return result
+    
+    M_val, I_val, C_val, P_val = match.groups()
+    
+    # 데이터 저장
+    result["data"] = {
+        "M": M_val,
+        "I": I_val,
+        "C": C_val,
+        "P": P_val
+    }
+    
+    result["pattern_match"] = True
+    
+    # 여기에 필요한 추가 검증 로직 추가
+    
+    result["valid"] = len(result["errors"]) == 0
+    
+    return result
+
+def cross_validate_matrices(matrix_44x44, matrix_18x18):
+    """두 매트릭스 간의 교차 검증
+    
+    고정부(18x18 매트릭스)와 변동부(44x44 매트릭스) 간의 일관성을 확인하는 검증을 수행합니다.
+    다음 사항을 검증합니다:
+    1. 18x18의 I 값과 44x44의 I 값 일치 여부
+    2. 18x18의 C 값과 44x44의 C 값 일치 여부
+    """
+    errors = []
+    
+    # 둘 중 하나라도 패턴 매치가 실패한 경우
+    if not matrix_44x44["pattern_match"] or not matrix_18x18["pattern_match"]:
+        return ["교차 검증을 수행할 수 없습니다. 두 매트릭스의 기본 형식이 올바르지 않습니다."]
+    
+    # 1. [18x18]의 I 값과 [44x44]의 I 값이 동일한지 확인
+    if matrix_18x18["data"]["I"] != matrix_44x44["data"]["I"]:
+        errors.append(f"교차 검증 실패: [18x18]의 I({matrix_18x18['data']['I']})와 [44x44]의 I({matrix_44x44['data']['I']})가 일치하지 않습니다.")
+    
+    # 2. [18x18]의 C 값과 [44x44]의 C 값이 일치하는지 확인
+    if matrix_18x18["data"]["C"] != matrix_44x44["data"]["C"]:
+        errors.append(f"교차 검증 실패: [18x18]의 C({matrix_18x18['data']['C']})와 [44x44]의 C({matrix_44x44['data']['C']})가 일치하지 않습니다.")
+    
+    return errors if errors else ["교차 검증이 성공적으로 완료되었습니다."]
+
+# =========================================================
+# 이미지 처리 및 바코드 검출 함수
+# =========================================================
+
+def split_image_for_detection(image):
+    """이미지를 여러 영역으로 분할하여 바코드 인식률 향상"""
+    width, height = image.size
+    sections = []
+    
+    # 원본 이미지 추가
+    sections.append(image)
+    
+    # 이미지를 상하좌우로 분할 (4분할)
+    half_width = width // 2
+    half_height = height // 2
+    
+    # 좌상단
+    sections.append(image.crop((0, 0, half_width, half_height)))
+    # 우상단
+    sections.append(image.crop((half_width, 0, width, half_height)))
+    # 좌하단
+    sections.append(image.crop((0, half_height, half_width, height)))
+    # 우하단
+    sections.append(image.crop((half_width, half_height, width, height)))
+    
+    # 이미지를 가로로 3등분
+    third_height = height // 3
+    sections.append(image.crop((0, 0, width, third_height)))
+    sections.append(image.crop((0, third_height, width, 2*third_height)))
+    sections.append(image.crop((0, 2*third_height, width, height)))
+    
+    # 이미지를 세로로 3등분
+    third_width = width // 3
+    sections.append(image.crop((0, 0, third_width, height)))
+    sections.append(image.crop((third_width, 0, 2*third_width, height)))
+    sections.append(image.crop((2*third_width, 0, width, height)))
+    
+    return sections
+
+# 검증 모드별로 한 페이지에서 찾아야 하는 바코드 종류
+DETECTION_TARGETS = {
+    "both": ("44x44", "18x18"),
+    "44x44": ("44x44",),
+    "18x18": ("18x18",),
+}
+
+# 디코딩된 문자열의 매트릭스 종류를 판별하기 위한 패턴 (구분자 오류도 44x44로 인식)
+MATRIX_44X44_DETECT_PATTERN = r'C[A-Za-z0-9]{3}[.,]I\d{2}[.,]W(?:LO|SE)[.,]'
+MATRIX_18X18_DETECT_PATTERN = r'M[A-Za-z0-9]{4}\.I\d{2}\.C[A-Za-z0-9]{3}\.'
+
+# 검출 파이프라인 버전 (검출 로직이 바뀌면 올려서 이전 디코딩 캐시 결과를 무효화)
+DETECTION_PIPELINE_VERSION = "2025.04-1"
+
+# enhance_image_for_detection이 생성하는 변형 이미지 수 (진행률 계산용)
+ENHANCEMENT_VARIANT_COUNT = 14
+
+# 확대 변형 이미지의 배율 (디코딩 힌트 계산용, 나머지 변형은 1.0)
+ENHANCEMENT_VARIANT_SCALES = {"resize_1.5": 1.5, "resize_2.0": 2.0}
+
+# PDF 페이지 렌더링 배율 (iter_pdf_pages)
+PDF_RENDER_SCALE = 3.0
+
+# 바코드 검출용 pypdfium2 렌더링 옵션 - 8비트 그레이스케일, 양식/주석 제외, 안티앨리어싱 없음
+PDF_RENDER_OPTIONS = {
+    "grayscale": True,
+    "draw_annots": False,
+    "may_draw_forms": False,
+    "no_smoothtext": True,
+    "no_smoothimage": True,
+    "no_smoothpath": True,
+}
+
+# 적응형 렌더링 (iter_pdf_page_regions): 심볼 위치 탐색용 저해상도 배율과,
+# 후보 영역이 페이지에서 이 비율 이상을 차지하면 영역 대신 전체 페이지를 고해상도로 렌더링
+PDF_LOCATE_SCALE = 1.5
+PDF_REGION_MAX_AREA_RATIO = 0.5
+
+# 문서 포함 이미지 검출 (iter_pdf_embedded_images, PowerPoint 그림 개체): 이보다 작은 이미지는 건너뛰고,
+# 짧은 변이 EMBEDDED_IMAGE_MIN_SIDE보다 작으면 정수 배로 확대(최근접 보간)한 뒤 조용한 영역 여백 추가
+EMBEDDED_IMAGE_SKIP_SIDE = 10
+EMBEDDED_IMAGE_MIN_SIDE = 300
+EMBEDDED_IMAGE_QUIET_ZONE = 0.1
+
+# 벡터 경로 심볼 재구성 (iter_pdf_vector_symbols): 어두운 채움 색 판별 기준(RGB 평균 상한),
+# 모듈 격자 정렬 허용 오차(모듈 크기 대비 비율), 사각형을 한 심볼로 묶을 최대 간격(모듈 수),
+# 페이지당 읽을 경로 구간 수 상한(넘으면 렌더링 검출로 처리)
+VECTOR_DARK_FILL_MAX = 96
+VECTOR_GRID_TOLERANCE = 0.2
+VECTOR_CLUSTER_GAP_MODULES = 1.5
+VECTOR_MAX_SEGMENTS_PER_PAGE = 200000
+
+# 재구성한 심볼 비트맵의 모듈당 픽셀 수, 조용한 영역(모듈 수), 심볼 하나의 디코딩 제한 시간(밀리초)
+VECTOR_MODULE_PX = 6
+VECTOR_QUIET_ZONE_MODULES = 2
+VECTOR_DECODE_TIMEOUT_MS = 500
+
+# Office 문서 길이 단위 (EMU, 1pt = 12700 EMU)
+EMU_PER_PT = 12700.0
+
+# Excel 직접 추출 (extract_xlsx_sheet_images): 수동 페이지 나누기가 없는 시트에서 그림 사이가 이 행 수보다
+# 벌어지면 다른 페이지로 나누고, 시트의 도형이 이 개수 이상이면 벡터로 그린 심볼이 있을 수 있어 변환 사용
+XLSX_PAGE_ROW_GAP = 20
+XLSX_VECTOR_SHAPE_MIN = 20
+XLSX_VECTOR_MEDIA = (".emf", ".wmf", ".svg")
+
+# Excel 인쇄 범위 축소 (build_xlsx_print_subset): 그림/도형 영역 주변에 함께 인쇄할 셀 수,
+# 셀 크기를 알 수 없는 앵커(oneCellAnchor, absoluteAnchor)에 사용할 기본 열 폭/행 높이 (EMU)
+XLSX_PRINT_MARGIN_CELLS = 1
+XLSX_DEFAULT_COL_EMU = 64 * 9525
+XLSX_DEFAULT_ROW_EMU = 20 * 9525
+
+# 워크시트 XML에서 pageSetup 뒤에 와야 하는 요소 (pageSetup을 새로 추가할 때 위치 결정용)
+XLSX_AFTER_PAGE_SETUP = ("headerFooter", "rowBreaks", "colBreaks", "customProperties", "cellWatches",
+                         "ignoredErrors", "smartTags", "drawing", "legacyDrawing", "legacyDrawingHF",
+                         "drawingHF", "picture", "oleObjects", "controls", "webPublishItems", "tableParts",
+                         "extLst")
+
+# PowerPoint 슬라이드 사전 분류 (classify_pptx_slides): 그룹 안의 도형이 이 개수 이상이면 벡터로 그린
+# 심볼이 있을 수 있는 슬라이드로 판단 (그림, OLE 개체, 자유형 도형이 없으면 텍스트/차트/표 슬라이드)
+PPTX_VECTOR_SHAPE_MIN = 20
+
+# 미리보기 썸네일 렌더링 배율 (72 DPI 기준)
+PDF_THUMBNAIL_SCALE = 1.0
+
+# pdf2image 대체 경로에서 한 번에 변환할 페이지 수
+PDF2IMAGE_PAGE_WINDOW = 4
+
+# 매트릭스 종류별 모듈 수와 libdmtx 심볼 크기 값 (pylibdmtx DmtxSymbolSize 열거형)
+MATRIX_MODULE_COUNTS = {"44x44": 44, "18x18": 18}
+DMTX_SYMBOL_SIZES = {"44x44": 12, "18x18": 4}
+DMTX_SYMBOL_SQUARE_AUTO = -2
+
+# 문서에 인쇄되는 바코드 모듈 한 칸의 예상 크기 범위 (PDF 포인트 단위, 1pt = 1/72인치)
+EXPECTED_MODULE_SIZE_PT = (0.75, 12.0)
+
+# 기본 디코딩 제한 시간 (밀리초, decode 호출 1회 기준 상한)
+DEFAULT_DECODE_TIMEOUT_MS = 5000
+
+# 변형 이미지 전체의 디코딩 작업량 (변형별 면적 배율의 합, 시간 예산 배분용)
+ENHANCEMENT_VARIANT_WORK = (ENHANCEMENT_VARIANT_COUNT - len(ENHANCEMENT_VARIANT_SCALES)) + \
+    sum(scale * scale for scale in ENHANCEMENT_VARIANT_SCALES.values())
+
+# split_image_for_detection 영역 전체의 면적 합 (원본 + 4분할 + 가로 3분할 + 세로 3분할 = 원본의 4배)
+SECTION_AREA_FACTOR = 4
+
+def classify_matrix_data(data):
+    """디코딩된 바코드 데이터가 어떤 매트릭스 형식인지 판별 ("44x44", "18x18" 또는 None)"""
+    if re.search(MATRIX_44X44_DETECT_PATTERN, data):
+        return "44x44"
+    if re.search(MATRIX_18X18_DETECT_PATTERN, data):
+        return "18x18"
+    return None
+
+def missing_detection_targets(decoded_data, validation_mode):
+    """검증 모드 기준으로 아직 찾지 못한 매트릭스 종류 목록 반환"""
+    found = {classify_matrix_data(data) for data in decoded_data}
+    return [target for target in DETECTION_TARGETS.get(validation_mode, ()) if target not in found]
+
+def iter_enhanced_images(image):
+    """이미지 전처리 변형을 하나씩 생성 (사용하지 않는 변형은 계산하지 않음)
+
+    (변형 이름, 이미지) 튜플을 순서대로 반환합니다. 호출하는 쪽에서 반복을 중단하면
+    이후 단계의 전처리는 수행되지 않습니다.
+    """
+    yield "original", image  # 원본 이미지 포함
+    
+    # OpenCV로 이미지 처리
+    img_array = np.array(image)
+    
+    # 그레이스케일로 변환
+    if len(img_array.shape) == 3:  # 컬러 이미지인 경우
+        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+    else:  # 이미 그레이스케일인 경우
+        gray = img_array
+    
+    # 이미지 크기 조정 (확대)
+    height, width = gray.shape
+    scale_factors = [1.5, 2.0]
+    for scale in scale_factors:
+        resized = cv2.resize(gray, (int(width * scale), int(height * scale)),
+                            interpolation=cv2.INTER_CUBIC)
+        yield f"resize_{scale}", Image.fromarray(resized)
+    
+    # 기본 처리: 노이즈 제거
+    denoised = cv2.GaussianBlur(gray, (5, 5), 0)
+    
+    # 여러 이진화 방법 적용
+    # 1. 적응형 이진화 (Adaptive Thresholding)
+    binary_adaptive = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                           cv2.THRESH_BINARY, 11, 2)
+    yield "adaptive", Image.fromarray(binary_adaptive)
+    
+    # 2. Otsu 이진화
+    _, binary_otsu = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    yield "otsu", Image.fromarray(binary_otsu)
+    
+    # 3. 반전된 이진화 (바코드가 역상인 경우)
+    _, binary_inv = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    yield "otsu_inv", Image.fromarray(binary_inv)
+    
+    # 대비 향상 (CLAHE)
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    enhanced = clahe.apply(gray)
+    yield "clahe", Image.fromarray(enhanced)
+    
+    # CLAHE 적용 후 이진화
+    _, clahe_binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    yield "clahe_otsu", Image.fromarray(clahe_binary)
+    
+    # 모폴로지 연산
+    kernels = [(3, 3), (5, 5)]
+    for k_size in kernels:
+        kernel = np.ones(k_size, np.uint8)
+        
+        # 열림 연산 (침식 후 팽창) - 작은 노이즈 제거
+        morph_open = cv2.morphologyEx(binary_adaptive, cv2.MORPH_OPEN, kernel)
+        yield f"open_{k_size[0]}", Image.fromarray(morph_open)
+        
+        # 닫힘 연산 (팽창 후 침식) - 작은 구멍 채우기
+        morph_close = cv2.morphologyEx(binary_adaptive, cv2.MORPH_CLOSE, kernel)
+        yield f"close_{k_size[0]}", Image.fromarray(morph_close)
+    
+    # 엣지 검출
+    edges = cv2.Canny(denoised, 50, 150)
+    yield "canny", Image.fromarray(edges)
+    
+    # 선명화 필터
+    sharpen_kernel = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
+    sharpened = cv2.filter2D(gray, -1, sharpen_kernel)
+    yield "sharpen", Image.fromarray(sharpened)
+
+# @st.cache_data 데코레이터 제거 (UnhashableParamError 오류 방지)
+# 검출 결과 캐시는 이미지 비트맵 해시 기반의 decode_cache 모듈에서 처리 (get_decode_cache 참고)
+def enhance_image_for_detection(image):
+    """이미지 전처리를 통해 DataMatrix 인식률 향상 (개선 버전)"""
+    return [img for _, img in iter_enhanced_images(image)]
+
+def locate_datamatrix_candidates(image, max_candidates=8, padding_ratio=0.25):
+    """OpenCV로 DataMatrix 후보 영역 검출 (libdmtx 디코딩 전 위치 탐색 단계)
+
+    정사각형에 가깝고 대비가 높으며, 두 인접 변이 실선(L자 파인더 패턴)인 덩어리를 찾습니다.
+    조용한 영역(quiet zone)을 포함하도록 여백을 더한 (left, top, right, bottom) 좌표 목록을
+    점수가 높은 순서로 반환합니다.
+    """
+    img_array = np.array(image)
+    if len(img_array.shape) == 3:
+        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+    else:
+        gray = img_array
+    height, width = gray.shape
+    
+    # 어두운 모듈이 255가 되도록 반전 이진화
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    
+    min_side = 20  # 이보다 작은 덩어리는 모듈 수를 고려할 때 디코딩 불가
+    max_side = int(min(height, width) * 0.9)
+    
+    candidates = []
+    # 모듈 크기를 모르므로 여러 크기의 닫힘 연산으로 모듈 사이 간격을 메워 심볼을 한 덩어리로 만듦
+    for k_size in (5, 11, 21):
+        closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, np.ones((k_size, k_size), np.uint8))
+        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            side = max(w, h)
+            if side < min_side or side > max_side:
+                continue
+            # 정사각형 여부
+            if not (0.8 <= w / float(h) <= 1.25):
+                continue
+            # 덩어리가 경계 사각형을 거의 채우는지 (텍스트 줄 등 제외)
+            if cv2.contourArea(contour) < 0.85 * w * h:
+                continue
+            
+            roi = binary[y:y + h, x:x + w]
+            # 모듈 패턴은 어두운 영역과 밝은 영역이 섞여 있어야 함
+            dark_ratio = cv2.countNonZero(roi) / float(w * h)
+            if not (0.3 <= dark_ratio <= 0.8):
+                continue
+            
+            # L자 파인더 패턴: 가장 작은 모듈(44x44 기준)보다 얇은 테두리 띠가 실선인지 확인
+            strip = max(1, side // 60)
+            edges = [
+                cv2.countNonZero(roi[:, :strip]) / float(roi[:, :strip].size),    # 왼쪽
+                cv2.countNonZero(roi[-strip:, :]) / float(roi[-strip:, :].size),  # 아래쪽
+                cv2.countNonZero(roi[:, -strip:]) / float(roi[:, -strip:].size),  # 오른쪽
+                cv2.countNonZero(roi[:strip, :]) / float(roi[:strip, :].size),    # 위쪽
+            ]
+            finder_score = max(min(edges[i], edges[(i + 1) % 4]) for i in range(4))
+            if finder_score < 0.85:
+                continue
+            
+            # 대비: 후보 영역 내 어두운 픽셀과 밝은 픽셀의 평균 밝기 차
+            roi_gray = gray[y:y + h, x:x + w]
+            dark_pixels = roi_gray[roi > 0]
+            light_pixels = roi_gray[roi == 0]
+            if dark_pixels.size == 0 or light_pixels.size == 0:
+                continue
+            contrast = (float(light_pixels.mean()) - float(dark_pixels.mean())) / 255.0
+            if contrast < 0.3:
+                continue
+            
+            pad = int(side * padding_ratio)
+            box = (max(0, x - pad), max(0, y - pad), min(width, x + w + pad), min(height, y + h + pad))
+            candidates.append((finder_score * contrast, box))
+    
+    # 여러 커널에서 중복 검출된 영역 제거 (겹치는 영역은 점수가 높은 것만 유지)
+    candidates.sort(key=lambda item: item[0], reverse=True)
+    selected = []
+    for _, box in candidates:
+        duplicate = False
+        for other in selected:
+            ix = max(0, min(box[2], other[2]) - max(box[0], other[0]))
+            iy = max(0, min(box[3], other[3]) - max(box[1], other[1]))
+            smaller = min((box[2] - box[0]) * (box[3] - box[1]), (other[2] - other[0]) * (other[3] - other[1]))
+            if smaller and ix * iy > 0.5 * smaller:
+                duplicate = True
+                break
+        if not duplicate:
+            selected.append(box)
+        if len(selected) >= max_candidates:
+            break
+    
+    return selected
+
+def build_decode_hints(image_size, targets, render_scale=None, variant_scale=1.0, timeout=DEFAULT_DECODE_TIMEOUT_MS):
+    """찾아야 할 매트릭스 종류와 렌더링 배율로부터 pylibdmtx decode 매개변수 계산
+
+    - shape: 남은 매트릭스가 한 종류면 해당 심볼 크기로 고정, 아니면 정사각형 심볼만 탐색
+    - min_edge/max_edge: 예상 모듈 크기 x 모듈 수 x 배율로 심볼 한 변의 픽셀 범위 제한
+    - shrink: 모듈이 충분히 크면 축소해서 탐색
+    - max_count: 남은 매트릭스 수만큼만 읽음
+    렌더링 배율을 모르는 이미지(Office 파일 내장 이미지 등)는 shape와 max_count만 지정합니다.
+    """
+    targets = [t for t in targets if t in MATRIX_MODULE_COUNTS] or list(MATRIX_MODULE_COUNTS)
+    
+    hints = {"timeout": timeout, "max_count": len(targets)}
+    
+    if len(targets) == 1:
+        hints["shape"] = DMTX_SYMBOL_SIZES[targets[0]]
+    else:
+        hints["shape"] = DMTX_SYMBOL_SQUARE_AUTO
+    
+    if render_scale:
+        px_per_pt = render_scale * variant_scale
+        min_module_px = EXPECTED_MODULE_SIZE_PT[0] * px_per_pt
+        max_module_px = EXPECTED_MODULE_SIZE_PT[1] * px_per_pt
+        
+        # 모듈 한 칸이 3픽셀 이상 확보되는 범위에서만 축소 (최대 3배)
+        shrink = max(1, min(3, int(min_module_px // 3)))
+        
+        # libdmtx의 변 길이 제한은 축소된 이미지 기준
+        min_edge = int(min(MATRIX_MODULE_COUNTS[t] for t in targets) * min_module_px) // shrink
+        max_edge = int(max(MATRIX_MODULE_COUNTS[t] for t in targets) * max_module_px) // shrink
+        max_edge = min(max_edge, min(image_size) // shrink)
+        
+        hints["shrink"] = shrink
+        hints["min_edge"] = max(10, min_edge)
+        hints["max_edge"] = max(hints["min_edge"], max_edge)
+    
+    return hints
+
+@functools.lru_cache(maxsize=None)
+def get_decode_thread_pool(workers):
+    """페이지 내부 변형 이미지 병렬 디코딩용 공유 스레드 풀 (세션 간 공유, 작업자 수별로 하나씩 생성)
+
+    pylibdmtx는 ctypes로 libdmtx를 호출하므로 디코딩 중에는 GIL이 해제되어 스레드만으로 병렬
+    처리가 가능합니다. OpenCV 스레드 수는 여기서 바꾸지 않습니다 (configure_opencv_threads).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dmtx-decode")
+
+def configure_opencv_threads(decode_threads=0):
+    """디코딩 스레드와 OpenCV 전처리 스레드가 코어를 과점유하지 않도록 OpenCV 스레드 수를 남는 코어 수로 제한
+
+    cv2.setNumThreads는 프로세스 전역 설정이므로 프로세스를 시작할 때 설정 파일의 decode_threads로
+    한 번만 호출합니다. 병렬 디코딩을 사용하지 않으면(1) OpenCV 기본값을 그대로 둡니다.
+    """
+    threads = get_decode_thread_count(decode_threads)
+    if threads > 1 and have_library("cv2"):
+        cv2.setNumThreads(max(1, (os.cpu_count() or 1) - threads))
+
+def get_decode_thread_count(configured_threads=0):
+    """페이지 내부 병렬 디코딩 스레드 수 (0이면 CPU 코어 수, 1이면 순차 디코딩)"""
+    if configured_threads and configured_threads > 0:
+        return int(configured_threads)
+    return max(1, os.cpu_count() or 1)
+
+def detect_datamatrix(image, progress_callback=None, validation_mode=None, render_scale=None,
+                      time_budget_ms=None, detection_report=None, decode_threads=1):
+    """이미지에서 DataMatrix 바코드 검출 (개선 버전)
+
+    validation_mode("both", "44x44", "18x18")를 지정하면 해당 모드에서 필요한 바코드를
+    모두 찾는 즉시 검출을 종료합니다 (둘 다 검증: 44x44와 18x18 각 1개, 단일 모드: 1개).
+    지정하지 않으면 기존과 같이 모든 변형 이미지에서 검출을 시도합니다.
+    
+    전체 페이지를 스캔하기 전에 locate_datamatrix_candidates로 찾은 후보 영역만 먼저
+    디코딩하며, 후보 영역에서 필요한 바코드를 찾지 못한 경우에만 전체 페이지 검출로 넘어갑니다.
+    
+    모든 decode 호출에는 build_decode_hints로 계산한 심볼 크기/변 길이 힌트를 전달합니다.
+    렌더링 배율은 이미지 정보(image.info["render_scale"])를 우선 사용하고, 배율 정보가 없는
+    이미지(iter_pdf_pages가 반환하는 numpy 배열 등)에는 render_scale을 사용합니다.
+    
+    image는 PIL 이미지 또는 2차원(그레이스케일) numpy 배열입니다.
+    
+    time_budget_ms를 지정하면 이미지 전체 검출에 쓸 시간 예산 안에서, 남은 예산을 앞으로
+    시도할 변형 이미지들의 면적 비율로 나누어 decode 호출별 제한 시간을 정합니다.
+    예산이 소진되면 검출을 중단합니다. detection_report(dict)를 넘기면 검출 상태
+    ("complete" 또는 "deadline"), 소요 시간(초), decode 호출 수와 검출 중 메시지({"level", "message"}
+    목록)를 기록합니다. 작업자 프로세스에서도 실행되므로 메시지는 detection_report가 없을 때만 바로
+    전달합니다.
+    
+    decode_threads가 2 이상이면 변형 이미지들을 공유 스레드 풀에서 동시에 디코딩합니다.
+    변형 이미지는 동시에 실행 중인 디코딩 수만큼만 미리 생성하며, 필요한 바코드를 모두 찾으면
+    아직 시작하지 않은 디코딩 작업은 취소합니다.
+    """
+    if isinstance(image, np.ndarray):
+        # 연속 메모리 배열은 복사 없이 PIL 이미지로 감쌈 (그레이스케일이면 색 변환도 생략됨)
+        image = Image.fromarray(image)
+    render_scale = image.info.get("render_scale", render_scale)
+    
+    start_time = time.monotonic()
+    deadline = start_time + time_budget_ms / 1000.0 if time_budget_ms else None
+    
+    # 시간 예산 배분 상태: 앞으로 남은 디코딩 작업량(픽셀 수 기준)과 decode 호출 수
+    budget_state = {"remaining_work": 0.0, "attempts": 0, "deadline_hit": False}
+    page_work = float(image.size[0] * image.size[1]) * ENHANCEMENT_VARIANT_WORK
+    
+    def next_timeout(img):
+        """남은 시간 예산 중 이번 decode 호출에 배정할 제한 시간(ms) 계산, 예산 소진 시 None"""
+        work = float(img.size[0] * img.size[1])
+        remaining_work = max(work, budget_state["remaining_work"])
+        budget_state["remaining_work"] = remaining_work - work
+        if deadline is None:
+            return DEFAULT_DECODE_TIMEOUT_MS
+        remaining_ms = (deadline - time.monotonic()) * 1000.0
+        if remaining_ms <= 0:
+            budget_state["deadline_hit"] = True
+            return None
+        # 동시에 실행되는 디코딩 수만큼 배정 시간을 늘림 (남은 예산은 넘지 않음)
+        share = min(remaining_ms, remaining_ms * work / remaining_work * max(1, decode_threads))
+        # pylibdmtx는 timeout=0을 무제한으로 처리하므로 최소 1ms 보장
+        return int(max(1, min(DEFAULT_DECODE_TIMEOUT_MS, share)))
+    
+    all_results = []
+    messages = []
+    
+    def note(level, message):
+        messages.append({"level": level, "message": message})
+    
+    # 중복 제거 (바코드 값 기준)
+    unique_data = set()
+    decoded_data = []
+    
+    def collect(results):
+        """디코딩 결과를 누적하고 필요한 바코드를 모두 찾았는지 반환"""
+        all_results.extend(results)
+        for result in results:
+            try:
+                data = result.data.decode('utf-8', errors='replace')
+                if data not in unique_data:
+                    unique_data.add(data)
+                    decoded_data.append(data)
+            except Exception as e:
+                note("warning", f"결과 디코딩 중 오류 발생: {str(e)}")
+        return validation_mode is not None and not missing_detection_targets(decoded_data, validation_mode)
+    
+    def decode_hints_for(img, variant_name="original"):
+        """아직 찾지 못한 매트릭스 기준으로 decode 힌트 계산 (시간 예산 소진 시 None)"""
+        timeout = next_timeout(img)
+        if timeout is None:
+            return None
+        if validation_mode is None:
+            targets = list(MATRIX_MODULE_COUNTS)
+        else:
+            targets = missing_detection_targets(decoded_data, validation_mode)
+        budget_state["attempts"] += 1
+        return build_decode_hints(img.size, targets, render_scale,
+                                  ENHANCEMENT_VARIANT_SCALES.get(variant_name, 1.0), timeout=timeout)
+    
+    def finish():
+        """검출 상태를 기록하고 결과 반환"""
+        if progress_callback:
+            progress_callback(100)
+        if detection_report is not None:
+            detection_report["status"] = "deadline" if budget_state["deadline_hit"] else "complete"
+            detection_report["elapsed"] = time.monotonic() - start_time
+            detection_report["attempts"] = budget_state["attempts"]
+            detection_report["messages"] = messages
+        else:
+            for message in messages:
+                report_message(message["level"], message["message"])
+        return decoded_data
+    
+    def satisfied():
+        """후보 영역 단계만으로 충분한지 확인"""
+        if validation_mode is None:
+            return len(decoded_data) >= 2
+        return not missing_detection_targets(decoded_data, validation_mode)
+    
+    # 디코딩에 성공한 후보 영역 번호 (같은 후보 영역의 나머지 변형은 건너뜀)
+    decoded_groups = set()
+    
+    def run_attempts(attempts, stop_condition, warn_errors=False):
+        """(그룹, 변형 이름, 이미지) 디코딩 시도를 순차 또는 스레드 풀로 실행
+
+        stop_condition()이 참이 되면 즉시 중단하고 True를 반환합니다.
+        """
+        def handle(group, results):
+            if results:
+                if group is not None:
+                    decoded_groups.add(group)
+                collect(results)
+            return bool(results) and stop_condition()
+        
+        if decode_threads <= 1:
+            for group, name, img in attempts:
+                if budget_state["deadline_hit"]:
+                    break
+                hints = decode_hints_for(img, name)
+                if hints is None:
+                    break
+                try:
+                    results = decode(img, **hints)
+                except Exception as e:
+                    if warn_errors:
+                        note("warning", f"디코딩 중 오류 발생: {str(e)}")
+                    continue
+                if handle(group, results):
+                    return True
+            return False
+        
+        from concurrent.futures import FIRST_COMPLETED, wait
+        
+        pool = get_decode_thread_pool(decode_threads)
+        in_flight = {}
+        attempts = iter(attempts)
+        exhausted = False
+        
+        try:
+            while True:
+                # 동시에 실행할 수 있는 만큼만 변형 이미지를 생성하여 제출
+                while not exhausted and len(in_flight) < decode_threads and not budget_state["deadline_hit"]:
+                    try:
+                        group, name, img = next(attempts)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    hints = decode_hints_for(img, name)
+                    if hints is None:
+                        break
+                    in_flight[pool.submit(decode, img, **hints)] = group
+                
+                if not in_flight:
+                    return False
+                
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    group = in_flight.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        if warn_errors:
+                            note("warning", f"디코딩 중 오류 발생: {str(e)}")
+                        continue
+                    if handle(group, results):
+                        return True
+        finally:
+            # 첫 성공 또는 예산 소진 시 아직 시작하지 않은 작업 취소 (실행 중인 작업은 제한 시간 내 종료)
+            for future in in_flight:
+                future.cancel()
+    
+    # 1단계: 후보 영역을 먼저 찾고, 해당 영역만 원본 해상도로 잘라 디코딩
+    if have_library("cv2"):
+        try:
+            candidates = locate_datamatrix_candidates(image)
+        except Exception as e:
+            candidates = []
+            note("debug", f"후보 영역 탐색 중 오류 발생: {str(e)}")
+        
+        candidate_work = sum((box[2] - box[0]) * (box[3] - box[1]) for box in candidates) * ENHANCEMENT_VARIANT_WORK
+        budget_state["remaining_work"] = candidate_work + page_work * (1 + SECTION_AREA_FACTOR)
+        
+        def candidate_attempts():
+            for i, box in enumerate(candidates):
+                if progress_callback:
+                    progress_callback((i * 10) // len(candidates))
+                crop = image.crop(box)
+                for name, img in iter_enhanced_images(crop):
+                    if i in decoded_groups:
+                        break  # 이 후보 영역은 디코딩 완료
+                    yield i, name, img
+        
+        # 후보 영역에서 필요한 바코드를 모두 찾았으면 전체 페이지 검출 생략
+        if candidates and run_attempts(candidate_attempts(), satisfied):
+            return finish()
+    
+    # 2단계 (폴백): 원본 이미지의 다양한 처리 버전에서 바코드 검출 시도 (변형은 필요할 때만 생성)
+    budget_state["remaining_work"] = page_work * (1 + SECTION_AREA_FACTOR)
+    
+    def page_attempts():
+        for i, (name, img) in enumerate(iter_enhanced_images(image)):
+            if progress_callback:
+                progress_callback(10 + (i * 30) // ENHANCEMENT_VARIANT_COUNT)
+            yield None, name, img
+    
+    mode_satisfied = lambda: validation_mode is not None and satisfied()
+    done = run_attempts(page_attempts(), mode_satisfied, warn_errors=True)
+    
+    # 이미지가 복잡하거나 바코드가 작을 경우를 위해 이미지 분할 접근
+    if validation_mode is None:
+        need_sections = len(all_results) < 2  # 아직 두 개의 바코드를 찾지 못했다면
+    else:
+        need_sections = not done
+    
+    if need_sections and not budget_state["deadline_hit"]:
+        budget_state["remaining_work"] = page_work * SECTION_AREA_FACTOR
+        # 이미지 분할
+        sections = split_image_for_detection(image)
+        
+        # 각 섹션에 전처리 적용 및 바코드 검출 (섹션 전처리도 필요할 때만 생성)
+        def section_attempts():
+            for i, section in enumerate(sections):
+                if progress_callback:
+                    progress_callback(50 + (i * 40) // len(sections))
+                for name, img in iter_enhanced_images(section):
+                    yield None, name, img
+        
+        run_attempts(section_attempts(), mode_satisfied)
+    
+    return finish()
+
+def page_cache_key(images, validation_mode, render_scale=None):
+    """페이지 이미지와 검출 조건으로 디코딩 캐시 키 생성"""
+    return image_digest(images, namespace=f"{DETECTION_PIPELINE_VERSION}|{validation_mode}|{render_scale}")
+
+def detect_page_barcodes(images, validation_mode, page_budget_sec, render_scale=None, progress_callback=None,
+                         decode_threads=1):
+    """한 페이지(슬라이드)의 모든 이미지에서 바코드 검출
+
+    페이지 전체에 하나의 시간 예산을 적용하며, 이미지가 여러 개인 슬라이드는 남은 예산을
+    이어서 사용합니다. 필요한 바코드를 모두 찾으면 나머지 이미지는 검색하지 않습니다.
+    decode_threads는 detect_datamatrix의 페이지 내부 병렬 디코딩 스레드 수입니다.
+    
+    Returns:
+    --------
+    dict : {"barcodes": 중복 제거된 바코드 문자열 목록,
+            "detection_status": "complete", "deadline" 또는 "not_expected"(검색할 이미지가 없는 페이지),
+            "detection_time": 검출 소요 시간(초),
+            "image_reports": 이미지별 {"count", "elapsed", "status"} 목록,
+            "messages": 검출 중 메시지 {"level", "message"} 목록 (run_page_detection이 꺼내 전달)}
+    """
+    page_start = time.time()
+    page_deadline = page_start + page_budget_sec
+    
+    detection = {"barcodes": [], "detection_status": "complete" if images else "not_expected",
+                 "detection_time": 0.0, "image_reports": [], "messages": []}
+    all_barcodes = []
+    
+    for image in images:
+        remaining_ms = (page_deadline - time.time()) * 1000
+        if remaining_ms <= 0:
+            detection["detection_status"] = "deadline"
+            break
+        
+        detection_report = {}
+        decoded_data = detect_datamatrix(image, progress_callback,
+                                         validation_mode=validation_mode,
+                                         render_scale=render_scale,
+                                         time_budget_ms=remaining_ms,
+                                         detection_report=detection_report,
+                                         decode_threads=decode_threads)
+        all_barcodes.extend(decoded_data)
+        detection["messages"].extend(detection_report.get("messages", []))
+        detection["image_reports"].append({
+            "count": len(decoded_data),
+            "elapsed": detection_report.get("elapsed", 0.0),
+            "status": detection_report.get("status", "complete")
+        })
+        
+        if detection_report.get("status") == "deadline":
+            detection["detection_status"] = "deadline"
+        
+        # 필요한 바코드를 모두 찾았으면 나머지 이미지는 검색하지 않음
+        if not missing_detection_targets(all_barcodes, validation_mode):
+            break
+    
+    # 중복 제거 (발견 순서 유지)
+    detection["barcodes"] = list(dict.fromkeys(all_barcodes))
+    detection["detection_time"] = time.time() - page_start
+    return detection
+
+def merge_page_detections(first_detection, retry_detection):
+    """먼저 수행한 검출 결과(포함 이미지, 후보 영역)와 전체 페이지 재검출 결과를 한 페이지 결과로 합침"""
+    return {
+        "barcodes": list(dict.fromkeys(first_detection["barcodes"] + retry_detection["barcodes"])),
+        "detection_status": retry_detection["detection_status"],
+        "detection_time": first_detection["detection_time"] + retry_detection["detection_time"],
+        "image_reports": retry_detection["image_reports"],
+        "render_mode": "escalated"
+    }
+
+# 프로세스 풀 작업자당 동시에 올려 둘 페이지 수 (렌더링된 페이지 메모리 상한)
+PAGE_DETECTION_WINDOW_PER_WORKER = 2
+
+def _init_detection_worker():
+    """페이지 검출 작업자 프로세스 초기화 - 프로세스 간 코어 과점유 방지를 위해 OpenCV는 단일 스레드 사용"""
+    if have_library("cv2"):
+        cv2.setNumThreads(1)
+
+def _detect_page_job(job):
+    """프로세스 풀 작업자 함수 (페이지 번호와 검출 결과 반환)"""
+    slide_num, images, options = job
+    return slide_num, detect_page_barcodes(images, **options)
+
+def get_page_worker_count(configured_workers=0):
+    """페이지 병렬 처리 프로세스 수 (0이면 CPU 코어 수에 맞춤)"""
+    if configured_workers and configured_workers > 0:
+        return int(configured_workers)
+    return max(1, os.cpu_count() or 1)
+
+def run_page_detection(pages, validation_mode, page_budget_sec, max_workers=0, progress_callback=None,
+                       decode_threads=0, cache=None, total=None, render_scale=None, page_budgets=None):
+    """여러 페이지의 바코드 검출을 프로세스 풀에서 병렬로 수행
+
+    pages는 (페이지 번호, 이미지 목록) 쌍의 목록 또는 페이지를 하나씩 렌더링하는 제너레이터
+    (iter_pdf_pages 등)입니다. 페이지는 필요할 때만 꺼내며, 프로세스 풀에는 작업자당
+    PAGE_DETECTION_WINDOW_PER_WORKER개까지만 올려 두므로 메모리에는 검출 중인 페이지만 남고,
+    작업자가 디코딩하는 동안 다음 페이지를 렌더링합니다.
+    
+    결과는 완료 순서와 관계없이 페이지 순서대로 (페이지 번호, detect_page_barcodes 결과) 형태로
+    반환(yield)되므로, 호출하는 쪽의 페이지간 중복 검사 로직은 항상 앞 페이지부터 처리됩니다.
+    progress_callback(완료 페이지 수, 전체 페이지 수)은 페이지 검출이 끝날 때마다 호출됩니다.
+    전체 페이지 수는 total 또는 pages의 길이이며, 알 수 없으면 None입니다.
+    
+    fork 방식 프로세스 생성이 불가능한 환경(Windows 등)이거나 검출할 페이지가 하나뿐이면 현재
+    프로세스에서 순서대로 처리하며, 이때는 페이지 내부 변형 이미지를 decode_threads개(0이면 CPU
+    코어 수)의 스레드로 병렬 디코딩합니다. 프로세스 풀 사용 시에는 코어 과점유를 막기 위해
+    작업자마다 순차 디코딩합니다.
+    
+    cache(DecodeCache)를 지정하면 이미지 해시로 이전 검출 결과를 찾아 재사용하고(결과에
+    "cached": True 표시), 새로 검출한 결과 중 시간 예산 안에 끝난 것만 저장합니다.
+    
+    render_scale은 배율 정보가 없는 이미지(numpy 배열)의 렌더링 배율입니다.
+    
+    작업자 프로세스에서 검출한 페이지의 메시지(검출 결과의 "messages")는 결과를 받을 때 이 함수를
+    호출한 스레드에서 report_message로 전달하며, 반환하는 검출 결과에서는 제거됩니다.
+    
+    page_budgets(페이지 번호 -> 초)에 있는 페이지는 page_budget_sec 대신 그 시간 예산을 사용합니다
+    (여러 단계에 걸쳐 검출하는 페이지의 남은 예산). 페이지를 꺼낼 때 조회하므로 pages 제너레이터가
+    페이지를 반환하기 전에 채워도 됩니다.
+    """
+    import multiprocessing
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    
+    if total is None and hasattr(pages, "__len__"):
+        total = len(pages)
+    pages = iter(pages)
+    options = {"validation_mode": validation_mode, "page_budget_sec": page_budget_sec,
+               "render_scale": render_scale}
+    
+    def page_options(slide_num):
+        """페이지별 검출 옵션 (page_budgets에 남은 예산이 있으면 그 값을 사용)"""
+        if page_budgets is not None and slide_num in page_budgets:
+            return dict(options, page_budget_sec=page_budgets[slide_num])
+        return options
+    
+    completed = {}
+    cache_keys = {}
+    order = []
+    next_index = 0
+    done_count = 0
+    
+    def record(slide_num, detection, cached=False):
+        """검출 결과 기록 (시간 예산 초과로 중단된 결과는 캐시하지 않음)"""
+        nonlocal done_count
+        for message in detection.pop("messages", []):
+            report_message(message["level"], message["message"])
+        completed[slide_num] = detection
+        done_count += 1
+        if not cached and cache is not None and detection["detection_status"] == "complete":
+            cache.put(cache_keys[slide_num], detection)
+        if progress_callback:
+            progress_callback(done_count, total)
+    
+    def next_uncached():
+        """다음 페이지를 꺼냄 - 캐시에 있는 페이지는 바로 완료 처리하고 검출이 필요한 페이지만 반환"""
+        for slide_num, images in pages:
+            order.append(slide_num)
+            if cache is not None:
+                cache_keys[slide_num] = page_cache_key(images, validation_mode, render_scale)
+                cached = cache.get(cache_keys[slide_num])
+                if cached is not None:
+                    cached["cached"] = True
+                    record(slide_num, cached, cached=True)
+                    continue
+            return slide_num, images
+        return None
+    
+    def ready_results():
+        """앞 페이지부터 완료된 결과만 순서대로 꺼냄"""
+        nonlocal next_index
+        while next_index < len(order) and order[next_index] in completed:
+            slide_num = order[next_index]
+            next_index += 1
+            yield slide_num, completed.pop(slide_num)
+    
+    # 검출할 페이지가 둘 이상인지 확인하기 위해 앞의 두 페이지를 미리 꺼냄
+    queued = deque()
+    for _ in range(2):
+        page = next_uncached()
+        if page is None:
+            break
+        queued.append(page)
+    
+    workers = get_page_worker_count(max_workers)
+    
+    if len(queued) <= 1 or workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        threads = get_decode_thread_count(decode_threads)
+        yield from ready_results()
+        while True:
+            page = queued.popleft() if queued else next_uncached()
+            yield from ready_results()
+            if page is None:
+                break
+            slide_num, images = page
+            page = None
+            record(slide_num, detect_page_barcodes(images, decode_threads=threads, **page_options(slide_num)))
+            images = None
+            yield from ready_results()
+        return
+    
+    # 실행 중인 프로세스의 모듈 상태를 그대로 상속하도록 fork 방식 사용
+    context = multiprocessing.get_context("fork")
+    window = workers * PAGE_DETECTION_WINDOW_PER_WORKER
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_detection_worker) as executor:
+        pending = set()
+        exhausted = False
+        
+        while True:
+            # 작업 창이 빌 때마다 다음 페이지를 렌더링해 제출 (작업자 디코딩과 렌더링이 겹침)
+            while len(pending) < window and not exhausted:
+                page = queued.popleft() if queued else next_uncached()
+                if page is None:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(_detect_page_job, (page[0], page[1], page_options(page[0]))))
+                page = None
+                
+                # 캐시된 앞 페이지 결과는 검출을 기다리지 않고 바로 반환
+                yield from ready_results()
+            
+            if not pending:
+                break
+            
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                slide_num, detection = future.result()
+                record(slide_num, detection)
+            
+            # 앞 페이지부터 완료된 결과만 순서대로 반환
+            yield from ready_results()
+        
+        yield from ready_results()
+
+# =========================================================
+# 파일 처리 함수
+# =========================================================
+
+# 수정된 PDF 처리 함수
+def render_pdf_page(page, scale, crop=(0, 0, 0, 0)):
+    """검출용 렌더링 옵션(PDF_RENDER_OPTIONS)으로 pypdfium2 페이지를 2차원 uint8 numpy 배열로 렌더링
+
+    crop은 페이지 각 변(왼쪽, 아래쪽, 오른쪽, 위쪽)에서 잘라낼 길이(pt)입니다.
+    """
+    bitmap = page.render(
+        scale=scale,
+        rotation=0,
+        crop=crop,
+        **PDF_RENDER_OPTIONS
+    )
+    # 비트맵 버퍼를 그대로 numpy 배열로 사용 (단일 채널)
+    return bitmap.to_numpy()[:, :, 0]
+
+def iter_pdf_pages(file_content, progress_callback=None, page_numbers=None):
+    """PDF 파일의 페이지를 한 장씩 렌더링하여 (페이지 번호, 이미지) 형태로 반환(yield)하는 제너레이터
+
+    모든 페이지를 한꺼번에 메모리에 올리지 않으므로, 소비하는 쪽에서 이미지를 놓으면 페이지 수와
+    관계없이 메모리 사용량이 일정합니다. progress_callback(렌더링한 페이지 수, 전체 페이지 수)은
+    페이지마다 호출됩니다. page_numbers(1부터 시작)를 지정하면 해당 페이지만 렌더링합니다.
+    
+    file_content는 PDF 바이트(또는 bytearray 등 버퍼)이며, pypdfium2 경로는 임시 파일 없이
+    메모리에서 바로 문서를 엽니다.
+    
+    pypdfium2 경로는 PDF_RENDER_OPTIONS(그레이스케일, 양식/주석 제외)로 PDF_RENDER_SCALE 배율로
+    렌더링한 2차원 uint8 numpy 배열을 반환하며, 배율 정보는 담기지 않습니다. pdf2image 대체
+    경로는 PDF2IMAGE_PAGE_WINDOW 페이지씩 나누어 변환한 PIL 이미지(info["render_scale"] 포함)를
+    반환합니다.
+    """
+    # 오류 발생 시 표시할 메시지
+    error_messages = []
+    
+    # PDFIUM으로 시도
+    if have_library("pdfium"):
+        rendered = 0
+        try:
+            # pypdfium2로 PDF 이미지 추출 (임시 파일 없이 메모리의 바이트 버퍼를 그대로 사용)
+            pdf = pdfium.PdfDocument(file_content)
+            
+            page_indices = [n - 1 for n in page_numbers] if page_numbers else range(len(pdf))
+            total_pages = len(page_indices)
+            for page_index in page_indices:
+                # 페이지 렌더링 (고해상도 그레이스케일로 렌더링하여 바코드 인식률 향상)
+                page_array = render_pdf_page(pdf[page_index], PDF_RENDER_SCALE)
+                
+                rendered += 1
+                if progress_callback:
+                    progress_callback(rendered, total_pages)
+                yield page_index + 1, page_array
+                page_array = None
+            
+            if rendered:
+                return
+            error_messages.append("pypdfium2로 이미지 추출 실패")
+        except Exception as e:
+            error_messages.append(f"pypdfium2로 PDF 처리 실패: {str(e)}")
+            # 이미 반환한 페이지가 있으면 다른 방법으로 다시 렌더링하지 않음
+            if rendered:
+                for msg in error_messages:
+                    report_message("error", msg)
+                return
+    else:
+        error_messages.append("pypdfium2 라이브러리가 설치되지 않음")
+    
+    # pdf2image로 시도
+    if have_library("pdf2image"):
+        rendered = 0
+        temp_dir = None
+        try:
+            report_message("info", "pdf2image로 이미지 추출 시도 중...")
+            
+            # poppler는 파일 경로만 받으므로 임시 파일에 한 번만 저장하고 모든 구간 변환에 재사용
+            temp_dir = tempfile.mkdtemp()
+            temp_pdf_path = os.path.join(temp_dir, 'temp.pdf')
+            
+            # 파일 저장
+            with open(temp_pdf_path, 'wb') as f:
+                f.write(file_content)
+            
+            # pdf2image로 PDF에서 이미지 추출 (몇 페이지씩 나누어 변환)
+            if page_numbers:
+                total_pages = len(page_numbers)
+                page_windows = [(n, n) for n in page_numbers]
+            else:
+                total_pages = pdf2image.pdfinfo_from_path(temp_pdf_path)["Pages"]
+                page_windows = [(first_page, min(first_page + PDF2IMAGE_PAGE_WINDOW - 1, total_pages))
+                                for first_page in range(1, total_pages + 1, PDF2IMAGE_PAGE_WINDOW)]
+            for first_page, last_page in page_windows:
+                pdf_images = pdf2image.convert_from_path(temp_pdf_path, dpi=300,
+                                                         first_page=first_page, last_page=last_page)
+                for offset, pdf_image in enumerate(pdf_images):
+                    pdf_image.info["render_scale"] = 300 / 72.0  # 300 DPI = 72pt 기준 배율
+                    rendered += 1
+                    if progress_callback:
+                        progress_callback(rendered, total_pages)
+                    yield first_page + offset, pdf_image
+                pdf_images = pdf_image = None
+            
+            if rendered:
+                return
+            error_messages.append("pdf2image로 이미지 추출 실패")
+        except Exception as e:
+            error_messages.append(f"PDF 파일 처리 실패: {str(e)}")
+            if rendered:
+                for msg in error_messages:
+                    report_message("error", msg)
+                return
+        finally:
+            # 임시 디렉토리 삭제
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+    else:
+        error_messages.append("pdf2image 라이브러리가 설치되지 않음")
+    
+    # 모든 방법 실패 시
+    for msg in error_messages:
+        report_message("error", msg)
+    
+    report_message("error", "PDF에서 이미지를 추출할 수 없습니다. 필요한 라이브러리가 설치되어 있는지 확인하세요.")
+    report_message("info", "PDF 처리를 위해 다음 패키지가 필요합니다: pypdfium2, pdf2image, poppler-utils")
+
+def iter_pdf_page_regions(file_content, progress_callback=None, page_numbers=None):
+    """적응형 해상도로 PDF 페이지를 렌더링하여 (페이지 번호, 이미지 목록, 전체 페이지 여부)를 반환하는 제너레이터
+
+    먼저 PDF_LOCATE_SCALE 저해상도로 렌더링하여 locate_datamatrix_candidates로 심볼 위치를 찾고,
+    찾은 후보 영역만 PDF_RENDER_SCALE 고해상도로 다시 렌더링(crop)합니다. 후보가 없거나 후보 영역이
+    페이지의 PDF_REGION_MAX_AREA_RATIO 이상이면 전체 페이지를 고해상도로 렌더링합니다.
+    후보 영역만으로 바코드를 찾지 못한 페이지는 호출하는 쪽에서 iter_pdf_pages(page_numbers=...)로
+    전체 페이지를 다시 렌더링해 검출합니다.
+    
+    page_numbers(1부터 시작)를 지정하면 해당 페이지만 렌더링합니다. pypdfium2 또는 OpenCV를 사용할
+    수 없거나 문서를 열 수 없으면 iter_pdf_pages의 전체 페이지를 그대로 반환합니다.
+    """
+    pdf = None
+    if have_library("pdfium") and have_library("cv2"):
+        try:
+            pdf = pdfium.PdfDocument(file_content)
+        except Exception as e:
+            debug_info(f"적응형 렌더링을 사용할 수 없습니다: {str(e)}")
+    
+    if pdf is None:
+        for page_num, image in iter_pdf_pages(file_content, progress_callback, page_numbers):
+            yield page_num, [image], True
+        return
+    
+    page_indices = [n - 1 for n in page_numbers] if page_numbers else range(len(pdf))
+    total_pages = len(page_indices)
+    for rendered, page_index in enumerate(page_indices, 1):
+        page = pdf[page_index]
+        
+        try:
+            # 저해상도 렌더링으로 심볼 위치 탐색
+            overview = render_pdf_page(page, PDF_LOCATE_SCALE)
+            height, width = overview.shape
+            boxes = locate_datamatrix_candidates(overview)
+            overview = None
+            
+            region_area = sum((right - left) * (bottom - top) for left, top, right, bottom in boxes)
+            if boxes and region_area < PDF_REGION_MAX_AREA_RATIO * width * height:
+                # 후보 영역만 고해상도로 렌더링 (저해상도 픽셀 좌표 -> 페이지 각 변에서 잘라낼 pt)
+                images = []
+                for left, top, right, bottom in boxes:
+                    crop = (left / PDF_LOCATE_SCALE, (height - bottom) / PDF_LOCATE_SCALE,
+                            (width - right) / PDF_LOCATE_SCALE, top / PDF_LOCATE_SCALE)
+                    images.append(render_pdf_page(page, PDF_RENDER_SCALE, crop=crop))
+                full_page = False
+            else:
+                images = [render_pdf_page(page, PDF_RENDER_SCALE)]
+                full_page = True
+        except Exception as e:
+            report_message("error", f"pypdfium2로 PDF 처리 실패: {str(e)}")
+            return
+        page = None
+        
+        if progress_callback:
+            progress_callback(rendered, total_pages)
+        yield page_index + 1, images, full_page
+        images = None
+
+def load_embedded_image(image_obj):
+    """pypdfium2 이미지 객체를 원본 해상도의 그레이스케일 PIL 이미지로 변환 (디코딩에 부적합하면 None)
+
+    페이지에 배치된 크기(pt) 대비 픽셀 수를 info["render_scale"]에 기록하여 디코딩 힌트에 사용합니다.
+    """
+    bitmap = image_obj.get_bitmap(render=False)
+    array = bitmap.to_numpy()
+    if array.shape[2] == 1:
+        gray = np.ascontiguousarray(array[:, :, 0])
+    elif array.shape[2] == 3:
+        gray = cv2.cvtColor(array, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = cv2.cvtColor(array, cv2.COLOR_BGRA2GRAY)
+    bitmap = array = None
+    
+    left, _, right, _ = image_obj.get_pos()
+    render_scale = gray.shape[1] / (right - left) if right > left else None
+    return prepare_embedded_image(gray, render_scale)
+
+def prepare_embedded_image(gray, render_scale=None):
+    """문서에 포함된 원본 해상도 그레이스케일 이미지(2차원 uint8 배열)를 디코딩용 PIL 이미지로 변환
+
+    모듈당 픽셀 수가 적은 작은 이미지는 정수 배로 확대(최근접 보간)하고 심볼 주변에 흰색 여백을
+    추가합니다. 디코딩에 부적합할 만큼 작으면 None을 반환합니다. render_scale(배치 크기 pt 대비
+    픽셀 수)은 확대 배율을 반영하여 info["render_scale"]에 기록합니다.
+    """
+    height, width = gray.shape
+    if min(height, width) < EMBEDDED_IMAGE_SKIP_SIDE:
+        return None
+    
+    if min(height, width) < EMBEDDED_IMAGE_MIN_SIDE:
+        factor = int(np.ceil(EMBEDDED_IMAGE_MIN_SIDE / float(min(height, width))))
+        gray = np.repeat(np.repeat(gray, factor, axis=0), factor, axis=1)
+        if render_scale:
+            render_scale *= factor
+    pad = int(max(gray.shape) * EMBEDDED_IMAGE_QUIET_ZONE)
+    gray = np.pad(gray, pad, mode="constant", constant_values=255)
+    
+    image = Image.fromarray(gray)
+    if render_scale:
+        image.info["render_scale"] = render_scale
+    return image
+
+def iter_pdf_embedded_images(file_content, page_images, skip_pages=(), page_budget=None, image_budgets=None):
+    """PDF 페이지에 포함된 래스터 이미지 객체(XObject)를 원본 해상도로 꺼내 (이미지 키, [이미지])를 반환하는 제너레이터
+
+    이미지 키는 압축된 원본 데이터의 해시로, 여러 페이지에서 재사용된 같은 이미지는 한 번만 반환합니다.
+    page_images(dict)에는 페이지 번호 -> 해당 페이지의 이미지 키 목록을 기록합니다 (이미지가 없는
+    페이지와 skip_pages의 페이지는 빈 목록). pypdfium2를 사용할 수 없거나 문서를 열 수 없으면 아무것도
+    반환하지 않습니다.
+    
+    page_budget(페이지 번호 -> 남은 시간 예산(초))과 image_budgets(dict)를 지정하면, 페이지에서 처음
+    나온 이미지들이 그 페이지의 남은 예산을 똑같이 나누어 쓰도록 image_budgets에 이미지 키 -> 시간
+    예산(초)을 기록합니다 (run_page_detection의 page_budgets). 이를 위해 한 페이지의 새 이미지를 모두
+    꺼낸 뒤 차례로 반환합니다.
+    """
+    if not (have_library("pdfium") and have_library("cv2")):
+        return
+    try:
+        pdf = pdfium.PdfDocument(file_content)
+    except Exception as e:
+        debug_info(f"PDF 포함 이미지를 읽을 수 없습니다: {str(e)}")
+        return
+    
+    seen_keys = set()
+    for page_index in range(len(pdf)):
+        keys = []
+        if page_index + 1 in skip_pages:
+            page_images[page_index + 1] = keys
+            continue
+        page = pdf[page_index]
+        new_images = []
+        try:
+            for image_obj in page.get_objects(filter=(pdfium.raw.FPDF_PAGEOBJ_IMAGE,), max_depth=2):
+                raw_data = bytes(image_obj.get_data(decode_simple=False))
+                key = hashlib.blake2b(raw_data, digest_size=20).hexdigest()
+                raw_data = None
+                if key not in seen_keys:
+                    image = load_embedded_image(image_obj)
+                    if image is None:
+                        continue
+                    seen_keys.add(key)
+                    new_images.append((key, image))
+                    image = None
+                keys.append(key)
+        except Exception as e:
+            debug_info(f"페이지 {page_index + 1}의 포함 이미지를 읽을 수 없습니다: {str(e)}")
+        page_images[page_index + 1] = keys
+        
+        if new_images and image_budgets is not None:
+            share = page_budget(page_index + 1) / len(new_images)
+            image_budgets.update((key, share) for key, _ in new_images)
+        while new_images:
+            key, image = new_images.pop(0)
+            yield key, [image]
+            image = None
+
+def extract_vector_rects(page):
+    """PDF 페이지의 경로 객체 중 어두운 색으로 채워진 축 정렬 사각형을 페이지 좌표(pt)로 반환
+
+    Form XObject 안의 경로에는 Form의 변환 행렬을 차례로 적용합니다. 곡선이 포함되거나 사각형이
+    아닌 하위 경로는 건너뜁니다. 경로 구간 수가 VECTOR_MAX_SEGMENTS_PER_PAGE를 넘으면 None을
+    반환합니다 (도면 등 벡터 그래픽이 많은 페이지는 렌더링 검출로 처리).
+    
+    Returns:
+    --------
+    list : (left, bottom, right, top) 튜플 목록
+    """
+    raw = pdfium.raw
+    rects = []
+    state = {"segments": 0}
+    fill_mode, stroke = ctypes.c_int(), ctypes.c_int()
+    red, green, blue, alpha = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+    x, y = ctypes.c_float(), ctypes.c_float()
+    
+    def add_rect(points, matrix):
+        """하위 경로의 꼭짓점이 축 정렬 사각형이면 페이지 좌표로 변환하여 추가"""
+        if points and len(points) == 5 and points[0] == points[-1]:
+            points = points[:-1]
+        if not points or len(points) != 4:
+            return
+        corners = {tuple(round(v, 3) for v in matrix.on_point(px, py)) for px, py in points}
+        xs = sorted({cx for cx, _ in corners})
+        ys = sorted({cy for _, cy in corners})
+        if len(xs) == 2 and len(ys) == 2 and len(corners) == 4:
+            rects.append((xs[0], ys[0], xs[1], ys[1]))
+    
+    def walk(form, matrix, level):
+        for obj in page.get_objects(max_depth=1, form=form, level=level):
+            obj_matrix = obj.get_matrix()
+            if matrix is not None:
+                obj_matrix = obj_matrix.multiply(matrix)
+            
+            if obj.type == raw.FPDF_PAGEOBJ_FORM:
+                if level < 3 and not walk(obj.raw, obj_matrix, level + 1):
+                    return False
+                continue
+            if obj.type != raw.FPDF_PAGEOBJ_PATH:
+                continue
+            
+            # 채우기가 있고 채움 색이 어두운 경로만 사용
+            if not raw.FPDFPath_GetDrawMode(obj.raw, ctypes.byref(fill_mode), ctypes.byref(stroke)):
+                continue
+            if fill_mode.value == raw.FPDF_FILLMODE_NONE:
+                continue
+            if not raw.FPDFPageObj_GetFillColor(obj.raw, ctypes.byref(red), ctypes.byref(green),
+                                                ctypes.byref(blue), ctypes.byref(alpha)):
+                continue
+            if alpha.value < 128 or (red.value + green.value + blue.value) / 3 > VECTOR_DARK_FILL_MAX:
+                continue
+            
+            segment_count = raw.FPDFPath_CountSegments(obj.raw)
+            state["segments"] += max(0, segment_count)
+            if state["segments"] > VECTOR_MAX_SEGMENTS_PER_PAGE:
+                return False
+            
+            points = None
+            for index in range(segment_count):
+                segment = raw.FPDFPath_GetPathSegment(obj.raw, index)
+                segment_type = raw.FPDFPathSegment_GetType(segment)
+                if segment_type == raw.FPDF_SEGMENT_MOVETO:
+                    add_rect(points, obj_matrix)
+                    points = []
+                elif segment_type != raw.FPDF_SEGMENT_LINETO or points is None:
+                    # 곡선이 포함된 하위 경로는 사각형이 아님
+                    points = None
+                    continue
+                raw.FPDFPathSegment_GetPoint(segment, ctypes.byref(x), ctypes.byref(y))
+                points.append((x.value, y.value))
+            add_rect(points, obj_matrix)
+        return True
+    
+    if not walk(None, None, 0):
+        return None
+    return rects
+
+def match_vector_grid(rects, bounds, module_count):
+    """사각형들을 bounds 영역의 module_count x module_count 모듈 격자에 맞춰 모듈 배열 생성
+
+    모든 사각형의 변이 격자선에 정렬되어야 하며, 맞지 않으면 None을 반환합니다. 모듈 배열은
+    위쪽 행부터의 bool 배열(True=어두운 모듈)입니다 (PDF 좌표는 y축이 위쪽).
+    """
+    left, bottom, right, top = bounds
+    module = (right - left) / module_count
+    if abs((top - bottom) - (right - left)) > VECTOR_GRID_TOLERANCE * module:
+        return None
+    if not EXPECTED_MODULE_SIZE_PT[0] * (1 - VECTOR_GRID_TOLERANCE) <= module <= EXPECTED_MODULE_SIZE_PT[1]:
+        return None
+    
+    def grid_index(value):
+        position = value / module
+        index = int(round(position))
+        if abs(position - index) > VECTOR_GRID_TOLERANCE or not 0 <= index <= module_count:
+            return None
+        return index
+    
+    grid = np.zeros((module_count, module_count), dtype=bool)
+    for rect_left, rect_bottom, rect_right, rect_top in rects:
+        indices = (grid_index(rect_left - left), grid_index(right - rect_right),
+                   grid_index(top - rect_top), grid_index(rect_bottom - bottom))
+        if None in indices:
+            return None
+        col_start, col_end = indices[0], module_count - indices[1]
+        row_start, row_end = indices[2], module_count - indices[3]
+        if col_start >= col_end or row_start >= row_end:
+            return None
+        grid[row_start:row_end, col_start:col_end] = True
+    return grid
+
+def has_datamatrix_finder(grid):
+    """모듈 배열에 DataMatrix L자 파인더(왼쪽 열, 아래 행)와 타이밍 패턴(위쪽 행, 오른쪽 열)이 있는지 확인"""
+    return (grid[:, 0].all() and grid[-1, :].all() and
+            grid[0, ::2].all() and not grid[0, 1::2].any() and
+            grid[1::2, -1].all() and not grid[::2, -1].any())
+
+def find_vector_symbols(rects):
+    """채워진 사각형 목록에서 벡터로 그려진 DataMatrix 심볼을 찾아 (매트릭스 종류, 모듈 배열) 목록 반환
+
+    서로 가까운 사각형(간격이 짧은 변의 VECTOR_CLUSTER_GAP_MODULES배 이하)을 하나로 묶은 뒤,
+    묶음 외곽이 44x44 또는 18x18 격자에 맞고 파인더 패턴이 확인되는 경우만 심볼로 인정합니다.
+    회전된 심볼은 파인더가 왼쪽/아래에 오도록 모듈 배열을 돌려서 반환합니다.
+    """
+    min_side = EXPECTED_MODULE_SIZE_PT[0] * (1 - VECTOR_GRID_TOLERANCE)
+    max_side = EXPECTED_MODULE_SIZE_PT[1] * max(MATRIX_MODULE_COUNTS.values())
+    rects = [rect for rect in rects
+             if min(rect[2] - rect[0], rect[3] - rect[1]) >= min_side
+             and max(rect[2] - rect[0], rect[3] - rect[1]) <= max_side]
+    if not rects:
+        return []
+    
+    # 공간 버킷으로 가까운 사각형 쌍만 비교하여 묶음(union-find) 생성
+    gaps = [VECTOR_CLUSTER_GAP_MODULES * min(r[2] - r[0], r[3] - r[1]) for r in rects]
+    bucket_size = 4 * float(np.median(gaps))
+    buckets = {}
+    for index, (rect, gap) in enumerate(zip(rects, gaps)):
+        for bx in range(int((rect[0] - gap) // bucket_size), int((rect[2] + gap) // bucket_size) + 1):
+            for by in range(int((rect[1] - gap) // bucket_size), int((rect[3] + gap) // bucket_size) + 1):
+                buckets.setdefault((bx, by), []).append(index)
+    
+    parent = list(range(len(rects)))
+    
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+    
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            a = rects[first]
+            for second in members[i + 1:]:
+                b = rects[second]
+                gap = min(gaps[first], gaps[second])
+                if (b[0] - a[2] <= gap and a[0] - b[2] <= gap and
+                        b[1] - a[3] <= gap and a[1] - b[3] <= gap):
+                    root_a, root_b = find(first), find(second)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+    buckets = None
+    
+    clusters = {}
+    for index in range(len(rects)):
+        clusters.setdefault(find(index), []).append(rects[index])
+    
+    symbols = []
+    for members in clusters.values():
+        if len(members) < 4:
+            continue
+        bounds = (min(r[0] for r in members), min(r[1] for r in members),
+                  max(r[2] for r in members), max(r[3] for r in members))
+        for matrix_type, module_count in MATRIX_MODULE_COUNTS.items():
+            grid = match_vector_grid(members, bounds, module_count)
+            if grid is None:
+                continue
+            for quarter_turns in range(4):
+                rotated = np.rot90(grid, quarter_turns)
+                if has_datamatrix_finder(rotated):
+                    symbols.append((matrix_type, np.ascontiguousarray(rotated)))
+                    break
+            break
+    return symbols
+
+def render_vector_symbol(grid):
+    """모듈 배열을 디코딩용 그레이스케일 PIL 이미지로 변환 (모듈당 VECTOR_MODULE_PX 픽셀, 조용한 영역 포함)"""
+    symbol = np.where(grid, 0, 255).astype(np.uint8)
+    symbol = np.repeat(np.repeat(symbol, VECTOR_MODULE_PX, axis=0), VECTOR_MODULE_PX, axis=1)
+    pad = VECTOR_QUIET_ZONE_MODULES * VECTOR_MODULE_PX
+    return Image.fromarray(np.pad(symbol, pad, mode="constant", constant_values=255))
+
+def detect_pdf_vector_symbols(file_content):
+    """벡터 경로(채워진 사각형)로 그려진 DataMatrix 심볼을 페이지 렌더링 없이 검출
+
+    심볼마다 모듈 격자를 그대로 비트맵으로 재구성하여 심볼 크기를 지정해 한 번만 디코딩합니다.
+    pypdfium2나 pylibdmtx를 사용할 수 없으면 빈 결과를 반환합니다.
+    
+    Returns:
+    --------
+    dict : 페이지 번호 -> 검출 결과 (바코드를 하나 이상 읽은 페이지만, render_mode "vector")
+    """
+    if not (have_library("pdfium") and have_library("pylibdmtx")):
+        return {}
+    try:
+        pdf = pdfium.PdfDocument(file_content)
+    except Exception as e:
+        debug_info(f"PDF 벡터 그래픽을 읽을 수 없습니다: {str(e)}")
+        return {}
+    
+    page_detections = {}
+    for page_index in range(len(pdf)):
+        page_start = time.time()
+        try:
+            rects = extract_vector_rects(pdf[page_index])
+        except Exception as e:
+            debug_info(f"페이지 {page_index + 1}의 벡터 그래픽을 읽을 수 없습니다: {str(e)}")
+            continue
+        if not rects:
+            continue
+        
+        barcodes = []
+        image_reports = []
+        for matrix_type, grid in find_vector_symbols(rects):
+            decode_start = time.time()
+            results = decode(render_vector_symbol(grid), timeout=VECTOR_DECODE_TIMEOUT_MS,
+                             shape=DMTX_SYMBOL_SIZES[matrix_type], max_count=1)
+            decoded = [result.data.decode('utf-8', errors='replace') for result in results]
+            barcodes.extend(decoded)
+            image_reports.append({"count": len(decoded), "elapsed": time.time() - decode_start,
+                                  "status": "complete"})
+        rects = None
+        
+        if barcodes:
+            page_detections[page_index + 1] = {
+                "barcodes": list(dict.fromkeys(barcodes)),
+                "detection_status": "complete",
+                "detection_time": time.time() - page_start,
+                "image_reports": image_reports,
+                "render_mode": "vector"
+            }
+    return page_detections
+
+def run_pdf_detection(file_content, validation_mode, detect_pages, page_budget_sec, render_progress=None,
+                      status_callback=None):
+    """PDF 문서의 바코드 검출 - 렌더링 비용이 적은 방법부터 단계적으로 수행
+
+    0. 벡터 경로(채워진 사각형)로 그려진 심볼은 모듈 격자를 재구성하여 디코딩
+    1. 페이지에 포함된 래스터 이미지 객체를 원본 해상도로 디코딩 (같은 이미지는 문서 전체에서 한 번만)
+    2. 0~1단계에서 필요한 바코드를 모두 찾지 못한 페이지는 iter_pdf_page_regions로 후보 영역만
+       고해상도로 렌더링하여 검출
+    3. 후보 영역에서도 찾지 못한 페이지는 전체 페이지를 고해상도로 렌더링하여 검출
+    
+    detect_pages(pages, total=None, budgets=None)는 (키, 이미지 목록) 목록을 받아 run_page_detection
+    결과를 반환하는 함수입니다 (budgets는 run_page_detection의 page_budgets). render_progress(렌더링한
+    페이지 수, 전체 페이지 수)와 status_callback(메시지)은 진행 상황 표시용입니다.
+    
+    page_budget_sec는 모든 단계를 합친 페이지당 시간 예산입니다. 각 단계는 앞 단계에서 쓰고 남은
+    예산만 사용하며, 한 페이지의 포함 이미지들은 남은 예산을 나누어 씁니다. 예산을 모두 쓴 페이지는
+    다음 단계로 넘기지 않고 "deadline" 상태로 남깁니다.
+    
+    Returns:
+    --------
+    dict : 페이지 번호 -> 검출 결과. render_mode는 "vector"(벡터 심볼), "embedded"(포함 이미지),
+           "regions"(후보 영역), "escalated"(전체 페이지 재검출), None(처음부터 전체 페이지)
+    """
+    page_detections = {}
+    partial = {}
+    spent = {}  # 페이지 번호 -> 앞 단계까지 사용한 검출 시간(초)
+    
+    def remaining_budget(page_num):
+        return max(0.0, page_budget_sec - spent.get(page_num, 0.0))
+    
+    # 0단계: 벡터로 그려진 심볼 (페이지 렌더링 없음)
+    if status_callback:
+        status_callback("PDF 벡터 그래픽에서 바코드 검색 중...")
+    for page_num, detection in detect_pdf_vector_symbols(file_content).items():
+        spent[page_num] = detection["detection_time"]
+        if missing_detection_targets(detection["barcodes"], validation_mode):
+            partial[page_num] = detection
+        else:
+            page_detections[page_num] = detection
+    
+    # 1단계: 포함 이미지 (페이지 렌더링 없음)
+    if status_callback:
+        status_callback("PDF에 포함된 이미지에서 바코드 검색 중...")
+    page_images = {}
+    image_budgets = {}
+    image_detections = dict(detect_pages(iter_pdf_embedded_images(file_content, page_images,
+                                                                  skip_pages=set(page_detections),
+                                                                  page_budget=remaining_budget,
+                                                                  image_budgets=image_budgets),
+                                         budgets=image_budgets))
+    
+    for page_num, keys in page_images.items():
+        if not keys:
+            continue
+        detections = [image_detections[key] for key in keys if key in image_detections]
+        if page_num in partial:
+            detections.insert(0, partial.pop(page_num))
+        detection = {
+            "barcodes": list(dict.fromkeys(data for d in detections for data in d["barcodes"])),
+            "detection_status": "deadline" if any(d["detection_status"] == "deadline" for d in detections) else "complete",
+            "detection_time": sum(d["detection_time"] for d in detections),
+            "image_reports": [report for d in detections for report in d["image_reports"]],
+            "render_mode": "embedded"
+        }
+        spent[page_num] = detection["detection_time"]
+        if missing_detection_targets(detection["barcodes"], validation_mode):
+            partial[page_num] = detection
+        else:
+            page_detections[page_num] = detection
+    image_detections = None
+    
+    # 예산을 모두 쓴 페이지는 렌더링 검출로 넘기지 않음
+    for page_num, detection in partial.items():
+        if remaining_budget(page_num) <= 0:
+            detection["detection_status"] = "deadline"
+    
+    # 2단계: 포함 이미지로 끝나지 않은 페이지는 후보 영역 렌더링 (포함 이미지를 읽지 못했으면 모든 페이지)
+    if page_images:
+        remaining = [page_num for page_num in sorted(page_images)
+                     if page_num not in page_detections and remaining_budget(page_num) > 0]
+    else:
+        remaining = None
+    
+    if remaining is None or remaining:
+        if status_callback:
+            status_callback("바코드 검색 중...")
+        region_pages = set()
+        
+        def iter_region_pages():
+            for page_num, images, full_page in iter_pdf_page_regions(file_content, render_progress, remaining):
+                if not full_page:
+                    region_pages.add(page_num)
+                yield page_num, images
+        
+        region_budgets = {page_num: remaining_budget(page_num) for page_num in spent}
+        for page_num, detection in detect_pages(iter_region_pages(), None if remaining is None else len(remaining),
+                                                budgets=region_budgets):
+            if page_num in region_pages:
+                detection["render_mode"] = "regions"
+            page_detections[page_num] = detection
+            spent[page_num] = spent.get(page_num, 0.0) + detection["detection_time"]
+        
+        # 3단계: 후보 영역만으로 필요한 바코드를 찾지 못한 페이지는 전체 페이지를 고해상도로 다시 검출
+        escalate_pages = []
+        for page_num in sorted(region_pages):
+            if not missing_detection_targets(page_detections[page_num]["barcodes"], validation_mode):
+                continue
+            if remaining_budget(page_num) > 0:
+                escalate_pages.append(page_num)
+            else:
+                page_detections[page_num]["detection_status"] = "deadline"
+        if escalate_pages:
+            if status_callback:
+                status_callback("후보 영역에서 바코드를 찾지 못한 페이지를 전체 페이지로 다시 검색 중...")
+            full_pages = ((page_num, [image]) for page_num, image
+                          in iter_pdf_pages(file_content, page_numbers=escalate_pages))
+            escalate_budgets = {page_num: remaining_budget(page_num) for page_num in escalate_pages}
+            for page_num, detection in detect_pages(full_pages, len(escalate_pages), budgets=escalate_budgets):
+                page_detections[page_num] = merge_page_detections(page_detections[page_num], detection)
+        
+        # 벡터 심볼/포함 이미지에서 일부만 찾은 페이지는 렌더링 검출 결과와 합침
+        for page_num, detection in partial.items():
+            if page_num in page_detections:
+                merged = merge_page_detections(detection, page_detections[page_num])
+                merged["render_mode"] = page_detections[page_num].get("render_mode")
+                page_detections[page_num] = merged
+            else:
+                page_detections[page_num] = detection
+    
+    return dict(sorted(page_detections.items()))
+
+def extract_images_from_pdf(file_content, progress_callback=None):
+    """PDF 파일에서 페이지별 이미지 추출 (모든 페이지를 목록으로 반환)"""
+    if progress_callback:
+        progress_callback(20)
+    
+    def update_progress(rendered, total_pages):
+        if progress_callback:
+            progress_callback(20 + (rendered * 80) // total_pages)
+    
+    images = []
+    for _, image in iter_pdf_pages(file_content, update_progress):
+        if isinstance(image, np.ndarray):
+            # 슬라이드 이미지는 미리보기에도 사용하므로 PIL 이미지로 보관 (디코딩 힌트용 렌더링 배율 기록)
+            image = Image.fromarray(image)
+            image.info["render_scale"] = PDF_RENDER_SCALE
+        images.append(image)
+    return images
+
+def render_pdf_page_thumbnail(file_content, page_num):
+    """미리보기용 PDF 페이지 썸네일(PDF_THUMBNAIL_SCALE 배율 PIL 이미지) 렌더링 (실패하면 None)"""
+    if have_library("pdfium"):
+        try:
+            pdf = pdfium.PdfDocument(file_content)
+            return pdf[page_num - 1].render(scale=PDF_THUMBNAIL_SCALE).to_pil()
+        except Exception as e:
+            debug_info(f"썸네일 렌더링 실패: {str(e)}")
+    if have_library("pdf2image"):
+        try:
+            images = pdf2image.convert_from_bytes(file_content, dpi=int(72 * PDF_THUMBNAIL_SCALE),
+                                                  first_page=page_num, last_page=page_num)
+            return images[0] if images else None
+        except Exception as e:
+            debug_info(f"썸네일 렌더링 실패: {str(e)}")
+    return None
+
+# =========================================================
+# Office 파일 처리 함수
+# =========================================================
+
+def iter_pptx_pictures(shapes, top_level=True):
+    """슬라이드 도형 목록에서 그림을 찾아 (도형, 그림, 최상위 도형 여부)를 반환하는 제너레이터
+
+    그룹 도형 안의 그림과 그림 개체 틀(placeholder)에 삽입된 그림도 포함합니다. 연결만 되어 있고
+    파일에 포함되지 않은 그림은 건너뜁니다.
+    """
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from iter_pptx_pictures(shape.shapes, top_level=False)
+            continue
+        try:
+            picture = shape.image
+        except (AttributeError, ValueError, KeyError):
+            continue
+        yield shape, picture, top_level
+
+def load_picture_blob(blob, width_pt=None):
+    """Office 문서에 포함된 그림 파일을 디코딩용 그레이스케일 PIL 이미지로 변환
+
+    열 수 없는 형식(EMF/WMF 등)이거나 너무 작으면 None을 반환합니다. width_pt(문서에 배치된 폭)를
+    알면 pt 대비 픽셀 수를 디코딩 힌트로 기록합니다.
+    """
+    try:
+        image = Image.open(io.BytesIO(blob))
+        image.load()
+    except Exception:
+        return None
+    
+    # 투명 배경은 흰색으로 채움 (그대로 회색조 변환하면 검은색이 되어 조용한 영역이 사라짐)
+    if image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image)
+    gray = np.asarray(image.convert("L"))
+    
+    render_scale = gray.shape[1] / width_pt if width_pt else None
+    return prepare_embedded_image(gray, render_scale)
+
+def load_pptx_picture(shape, picture, top_level=True):
+    """PowerPoint 그림을 디코딩용 이미지로 변환 (load_picture_blob)
+
+    최상위 도형은 슬라이드에 배치된 크기를 디코딩 힌트로 사용합니다 (그룹 안의 도형은 그룹
+    좌표계 크기라 사용하지 않음).
+    """
+    width_pt = shape.width / EMU_PER_PT if top_level and shape.width else None
+    return load_picture_blob(picture.blob, width_pt)
+
+def extract_pptx_slide_pictures(file_content):
+    """PowerPoint 파일의 슬라이드별 그림을 원본 해상도로 추출 (LibreOffice 변환 없음)
+
+    Returns:
+    --------
+    dict : 슬라이드 번호 -> 이미지 목록 (그림이 없는 슬라이드는 빈 목록). 파일을 열 수 없으면 None
+    """
+    if not have_library("pptx"):
+        return None
+    from pptx import Presentation
+    try:
+        presentation = Presentation(io.BytesIO(file_content))
+    except Exception as e:
+        debug_info(f"PowerPoint 파일을 직접 열 수 없습니다: {str(e)}")
+        return None
+    
+    slide_images = {}
+    for slide_idx, slide in enumerate(presentation.slides):
+        images = []
+        for shape, picture, top_level in iter_pptx_pictures(slide.shapes):
+            image = load_pptx_picture(shape, picture, top_level)
+            if image is not None:
+                images.append(image)
+        slide_images[slide_idx + 1] = images
+    return slide_images
+
+def pptx_slide_hidden(slide):
+    """숨긴 슬라이드 여부 (LibreOffice는 숨긴 슬라이드를 PDF로 변환하지 않음)"""
+    return slide._element.get("show") in ("0", "false")
+
+def pptx_shapes_may_contain_barcode(shapes):
+    """도형 목록에 바코드가 있을 수 있는지 판별
+
+    그림(그림 채우기 포함), OLE 개체, 자유형 도형이 있거나 그룹 안의 도형이 PPTX_VECTOR_SHAPE_MIN개
+    이상이면 True. 텍스트 상자, 개체 틀, 차트, 표만 있으면 False입니다.
+    """
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+    from pptx.enum.dml import MSO_FILL
+    for shape in shapes:
+        shape_type = shape.shape_type
+        if shape_type == MSO_SHAPE_TYPE.GROUP:
+            if pptx_shapes_may_contain_barcode(shape.shapes):
+                return True
+            vector_shapes = sum(1 for child in shape.shapes
+                                if child.shape_type in (MSO_SHAPE_TYPE.AUTO_SHAPE, MSO_SHAPE_TYPE.FREEFORM,
+                                                        MSO_SHAPE_TYPE.GROUP))
+            if vector_shapes >= PPTX_VECTOR_SHAPE_MIN:
+                return True
+            continue
+        if shape_type in (MSO_SHAPE_TYPE.PICTURE, MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT,
+                          MSO_SHAPE_TYPE.LINKED_OLE_OBJECT, MSO_SHAPE_TYPE.FREEFORM):
+            return True
+        try:
+            # 그림 개체 틀에 삽입된 그림
+            shape.image
+            return True
+        except (AttributeError, ValueError, KeyError):
+            pass
+        try:
+            # 그림으로 채운 도형
+            if shape.fill.type == MSO_FILL.PICTURE:
+                return True
+        except (AttributeError, TypeError, NotImplementedError):
+            pass
+    return False
+
+def classify_pptx_slides(presentation):
+    """바코드가 있을 수 있는 슬라이드 번호 집합 반환 (pptx_shapes_may_contain_barcode)
+
+    나머지 슬라이드(제목, 목차, 차트 등)는 변환과 바코드 검출을 하지 않고 "바코드 없는 슬라이드"로 표시합니다.
+    """
+    return {slide_idx + 1 for slide_idx, slide in enumerate(presentation.slides)
+            if pptx_shapes_may_contain_barcode(slide.shapes)}
+
+def build_pptx_subset(file_content, slide_numbers):
+    """지정한 슬라이드만 남긴 PowerPoint 파일 생성 (LibreOffice가 나머지 슬라이드를 렌더링하지 않도록)
+
+    숨긴 슬라이드는 PDF로 변환되지 않으므로 함께 제외합니다.
+    
+    Returns:
+    --------
+    tuple : (PowerPoint 파일 바이트, PDF 페이지 번호 -> 원래 슬라이드 번호)
+    """
+    from pptx import Presentation
+    presentation = Presentation(io.BytesIO(file_content))
+    slide_id_list = presentation.slides._sldIdLst
+    page_numbers = {}
+    for slide_idx, (slide_id, slide) in enumerate(zip(list(slide_id_list), list(presentation.slides))):
+        slide_num = slide_idx + 1
+        if slide_num in slide_numbers and not pptx_slide_hidden(slide):
+            page_numbers[len(page_numbers) + 1] = slide_num
+            continue
+        # 슬라이드 목록과 관계를 모두 지우면 저장할 때 슬라이드 파트도 빠짐
+        rel_id = slide_id.rId
+        slide_id_list.remove(slide_id)
+        presentation.part.drop_rel(rel_id)
+    
+    output = io.BytesIO()
+    presentation.save(output)
+    return output.getvalue(), page_numbers
+
+def convert_pptx_slides(file_content, slide_numbers, progress_callback=None, office=None):
+    """지정한 슬라이드만 LibreOffice로 변환하여 렌더링 (build_pptx_subset)
+
+    Returns:
+    --------
+    dict : 원래 슬라이드 번호 -> [렌더링한 슬라이드 PIL 이미지]. 변환에 실패하면 None
+    """
+    try:
+        subset_content, page_numbers = build_pptx_subset(file_content, set(slide_numbers))
+    except Exception as e:
+        debug_info(f"변환할 슬라이드만 남긴 파일을 만들 수 없습니다: {str(e)}")
+        return None
+    if not page_numbers:
+        return {}
+    
+    # 일부 슬라이드만 남긴 파일은 저장할 때마다 바이트가 달라지므로 원본과 슬라이드 목록으로 캐시
+    pdf_content = convert_office_to_pdf(subset_content, "pptx", progress_callback, cache_source=file_content,
+                                        cache_variant="slides:" + ",".join(map(str, page_numbers.values())),
+                                        office=office)
+    if not pdf_content:
+        return None
+    
+    rendered = {}
+    for page_num, image in iter_pdf_pages(pdf_content, page_numbers=sorted(page_numbers)):
+        if isinstance(image, np.ndarray):
+            # 슬라이드 이미지는 미리보기에도 사용하므로 PIL 이미지로 보관
+            image = Image.fromarray(image)
+            image.info["render_scale"] = PDF_RENDER_SCALE
+        rendered[page_numbers[page_num]] = [image]
+    return rendered
+
+def run_pptx_detection(file_content, slide_images, validation_mode, detect_pages, page_budget_sec,
+                       convert_progress=None, status_callback=None, office=None):
+    """PowerPoint 슬라이드 바코드 검출 - 그림 우선, 필요한 슬라이드만 LibreOffice 변환 이미지로 재검출
+
+    1. extract_pptx_slide_pictures로 추출한 슬라이드별 그림을 원본 해상도로 디코딩
+    2. 필요한 바코드를 모두 찾지 못한 슬라이드 중 바코드가 있을 수 있는 슬라이드(classify_pptx_slides)만
+       남긴 파일을 PDF로 변환하여 다시 검출하고, slide_images의 해당 슬라이드 이미지를 렌더링한 슬라이드
+       이미지로 바꿈 (그림이 없는 텍스트/차트 슬라이드는 "not_expected" 상태로 남음)
+    
+    detect_pages, page_budget_sec, status_callback은 run_pdf_detection과 같고(변환 이미지 검출은 그림
+    검출에 쓰고 남은 예산만 사용), office는 convert_office_to_pdf와 같습니다.
+    
+    Returns:
+    --------
+    dict : 슬라이드 번호 -> 검출 결과. render_mode는 "pictures"(그림만), "converted"(변환 이미지로 재검출)
+    """
+    from pptx import Presentation
+    if status_callback:
+        status_callback("슬라이드의 그림에서 바코드 검색 중...")
+    page_detections = dict(detect_pages([(slide_num, slide_images[slide_num]) for slide_num in sorted(slide_images)]))
+    for detection in page_detections.values():
+        detection["render_mode"] = "pictures"
+    
+    def remaining_budget(slide_num):
+        return max(0.0, page_budget_sec - page_detections[slide_num]["detection_time"])
+    
+    missing = []
+    for slide_num in sorted(page_detections):
+        if not missing_detection_targets(page_detections[slide_num]["barcodes"], validation_mode):
+            continue
+        if remaining_budget(slide_num) > 0:
+            missing.append(slide_num)
+        else:
+            # 그림 검출에 예산을 모두 쓴 슬라이드는 변환하지 않음
+            page_detections[slide_num]["detection_status"] = "deadline"
+    if not missing:
+        return page_detections
+    
+    # 텍스트/차트만 있는 슬라이드는 변환하지 않음 (그림이 없으므로 "not_expected"로 검출됨)
+    candidates = classify_pptx_slides(Presentation(io.BytesIO(file_content)))
+    missing = [slide_num for slide_num in missing if slide_num in candidates]
+    if not missing:
+        return page_detections
+    
+    if status_callback:
+        status_callback(f"그림에서 바코드를 찾지 못한 슬라이드 {len(missing)}개를 변환하여 다시 검색 중...")
+    rendered = convert_pptx_slides(file_content, missing, convert_progress, office) or {}
+    for slide_num in missing:
+        if slide_num not in rendered and page_detections[slide_num]["detection_status"] == "not_expected":
+            # 그림을 읽을 수 없고 변환도 하지 못한 슬라이드는 바코드가 없다고 볼 수 없음
+            page_detections[slide_num]["detection_status"] = "complete"
+    if not rendered:
+        return page_detections
+    
+    converted_budgets = {slide_num: remaining_budget(slide_num) for slide_num in rendered}
+    for slide_num, detection in detect_pages(sorted(rendered.items()), len(rendered), budgets=converted_budgets):
+        merged = merge_page_detections(page_detections[slide_num], detection)
+        merged["render_mode"] = "converted"
+        page_detections[slide_num] = merged
+        slide_images[slide_num] = rendered[slide_num]
+    return page_detections
+
+# Excel 파일(OOXML) 파트의 XML 네임스페이스
+XLSX_NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "xdr": "http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+}
+
+def read_xlsx_relationships(archive, part_name):
+    """OOXML 파트의 관계 파일(_rels/*.rels)을 읽어 관계 ID -> 대상 파트 경로 반환 (없으면 빈 dict)"""
+    directory, name = posixpath.split(part_name)
+    rels_name = posixpath.join(directory, "_rels", name + ".rels")
+    if rels_name not in archive.namelist():
+        return {}
+    relationships = {}
+    for rel in ET.fromstring(archive.read(rels_name)).findall("rel:Relationship", XLSX_NS):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        relationships[rel.get("Id")] = target
+    return relationships
+
+def read_xlsx_drawing(archive, drawing_part):
+    """드로잉 파트에서 그림 목록과 도형 수 반환
+
+    Returns:
+    --------
+    tuple : ([(미디어 파트 경로, 시작 행, 끝 행, 배치 폭 pt 또는 None), ...], 그림이 아닌 도형 수)
+            행 번호는 0부터 시작하며, 셀에 고정되지 않은 그림(absoluteAnchor)은 0행으로 처리
+    """
+    media = read_xlsx_relationships(archive, drawing_part)
+    root = ET.fromstring(archive.read(drawing_part))
+    pictures = []
+    shape_count = 0
+    for anchor in root:
+        start_row = anchor.find("xdr:from/xdr:row", XLSX_NS)
+        end_row = anchor.find("xdr:to/xdr:row", XLSX_NS)
+        start_row = int(start_row.text) if start_row is not None else 0
+        end_row = int(end_row.text) if end_row is not None else start_row
+        
+        shape_count += len(anchor.findall(".//xdr:sp", XLSX_NS)) + len(anchor.findall(".//xdr:cxnSp", XLSX_NS))
+        for pic in anchor.iter(f"{{{XLSX_NS['xdr']}}}pic"):
+            blip = pic.find("xdr:blipFill/a:blip", XLSX_NS)
+            target = media.get(blip.get(f"{{{XLSX_NS['r']}}}embed")) if blip is not None else None
+            if target is None:
+                continue
+            extent = pic.find("xdr:spPr/a:xfrm/a:ext", XLSX_NS)
+            if extent is None:
+                extent = anchor.find("xdr:ext", XLSX_NS)
+            width_pt = int(extent.get("cx", 0)) / EMU_PER_PT if extent is not None else None
+            pictures.append((target, start_row, end_row, width_pt or None))
+    return pictures, shape_count
+
+def group_xlsx_pictures(pictures, row_breaks):
+    """한 시트의 그림을 행 범위 기준 논리 페이지로 묶음
+
+    수동 페이지 나누기(row_breaks, 1부터 시작하는 행 번호 - 해당 행 다음에서 나뉨)가 있으면 인쇄
+    페이지 기준으로, 없으면 그림 사이가 XLSX_PAGE_ROW_GAP행보다 벌어질 때 나눕니다.
+    
+    Returns:
+    --------
+    list : [(시작 행, 끝 행, [그림 정보, ...]), ...] 행 순서
+    """
+    pages = []
+    if row_breaks:
+        bands = {}
+        for picture in pictures:
+            band = sum(1 for row_break in row_breaks if row_break <= picture[1])
+            bands.setdefault(band, []).append(picture)
+        for band in sorted(bands):
+            members = bands[band]
+            pages.append((min(p[1] for p in members), max(p[2] for p in members), members))
+        return pages
+    
+    for picture in sorted(pictures, key=lambda p: p[1]):
+        if pages and picture[1] <= pages[-1][1] + XLSX_PAGE_ROW_GAP:
+            start_row, end_row, members = pages[-1]
+            members.append(picture)
+            pages[-1] = (start_row, max(end_row, picture[2]), members)
+        else:
+            pages.append((picture[1], picture[2], [picture]))
+    return pages
+
+def extract_xlsx_sheet_images(file_content):
+    """Excel 파일(XLSX)의 그림(xl/media)을 시트/행 범위별 논리 페이지로 추출 (LibreOffice 변환 없음)
+
+    시트 순서대로 각 시트의 그림을 group_xlsx_pictures로 묶어 1페이지부터 번호를 매깁니다.
+    그림이 하나도 없거나, 벡터 형식 그림(XLSX_VECTOR_MEDIA)이나 읽을 수 없는 그림이 있거나, 도형이
+    XLSX_VECTOR_SHAPE_MIN개 이상인 시트(벡터로 그린 심볼일 수 있음)가 있으면 None을 반환하며,
+    이때는 문서 전체를 변환하여 검출합니다.
+    
+    Returns:
+    --------
+    tuple : (dict 페이지 번호 -> 이미지 목록, dict 페이지 번호 -> (시트 이름, 시작 행, 끝 행)) 또는 None
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(file_content))
+        workbook_part = "xl/workbook.xml"
+        sheet_parts = read_xlsx_relationships(archive, workbook_part)
+        sheets = ET.fromstring(archive.read(workbook_part)).findall("main:sheets/main:sheet", XLSX_NS)
+    except Exception as e:
+        debug_info(f"Excel 파일을 직접 열 수 없습니다: {str(e)}")
+        return None
+    
+    slide_images = {}
+    page_sources = {}
+    media_cache = {}
+    for sheet in sheets:
+        sheet_part = sheet_parts.get(sheet.get(f"{{{XLSX_NS['r']}}}id"))
+        if sheet_part is None or sheet_part not in archive.namelist():
+            continue
+        sheet_root = ET.fromstring(archive.read(sheet_part))
+        drawing = sheet_root.find("main:drawing", XLSX_NS)
+        if drawing is None:
+            continue
+        drawing_part = read_xlsx_relationships(archive, sheet_part).get(drawing.get(f"{{{XLSX_NS['r']}}}id"))
+        if drawing_part is None or drawing_part not in archive.namelist():
+            continue
+        
+        pictures, shape_count = read_xlsx_drawing(archive, drawing_part)
+        if shape_count >= XLSX_VECTOR_SHAPE_MIN:
+            debug_info(f"시트 '{sheet.get('name')}'에 도형이 {shape_count}개 있어 문서를 변환하여 검출합니다.")
+            return None
+        
+        row_breaks = [int(brk.get("id", 0)) for brk in sheet_root.findall("main:rowBreaks/main:brk", XLSX_NS)]
+        for start_row, end_row, members in group_xlsx_pictures(pictures, row_breaks):
+            images = []
+            for target, _, _, width_pt in members:
+                if posixpath.splitext(target)[1].lower() in XLSX_VECTOR_MEDIA:
+                    debug_info(f"시트 '{sheet.get('name')}'에 벡터 그림({posixpath.basename(target)})이 있어 문서를 변환하여 검출합니다.")
+                    return None
+                if target not in media_cache:
+                    media_cache[target] = archive.read(target) if target in archive.namelist() else None
+                image = load_picture_blob(media_cache[target], width_pt) if media_cache[target] else None
+                if image is None:
+                    # 읽을 수 없는 그림이 바코드일 수 있으므로 빈 페이지로 넘기지 않고 변환 이미지로 검출
+                    debug_info(f"시트 '{sheet.get('name')}'의 그림({posixpath.basename(target)})을 읽을 수 없어 문서를 변환하여 검출합니다.")
+                    return None
+                images.append(image)
+            page_num = len(slide_images) + 1
+            slide_images[page_num] = images
+            page_sources[page_num] = (sheet.get("name"), start_row + 1, end_row + 1)
+    
+    if not slide_images:
+        return None
+    return slide_images, page_sources
+
+def xlsx_anchor_box(anchor):
+    """드로잉 앵커가 차지하는 셀 범위 (시작 열, 시작 행, 끝 열, 끝 행), 0부터 시작
+
+    끝 셀이 없는 앵커는 크기(ext)를 기본 열 폭/행 높이로 나누어 어림합니다.
+    """
+    def marker_cell(tag):
+        marker = anchor.find(f"xdr:{tag}", XLSX_NS)
+        if marker is None:
+            return None
+        return int(marker.findtext("xdr:col", "0", XLSX_NS)), int(marker.findtext("xdr:row", "0", XLSX_NS))
+    
+    start = marker_cell("from")
+    if start is None:
+        position = anchor.find("xdr:pos", XLSX_NS)
+        x = int(position.get("x", 0)) if position is not None else 0
+        y = int(position.get("y", 0)) if position is not None else 0
+        start = (x // XLSX_DEFAULT_COL_EMU, y // XLSX_DEFAULT_ROW_EMU)
+    end = marker_cell("to")
+    if end is None:
+        extent = anchor.find("xdr:ext", XLSX_NS)
+        cx = int(extent.get("cx", 0)) if extent is not None else 0
+        cy = int(extent.get("cy", 0)) if extent is not None else 0
+        end = (start[0] + -(-cx // XLSX_DEFAULT_COL_EMU), start[1] + -(-cy // XLSX_DEFAULT_ROW_EMU))
+    return start[0], start[1], end[0], end[1]
+
+def read_xlsx_print_blocks(archive, drawing_part):
+    """드로잉의 그림/도형 앵커를 행 간격(XLSX_PAGE_ROW_GAP) 기준으로 묶은 인쇄 영역 목록
+
+    차트 등 그림/도형이 없는 앵커는 제외합니다.
+    
+    Returns:
+    --------
+    list : [(시작 열, 시작 행, 끝 열, 끝 행), ...] 행 순서, 0부터 시작
+    """
+    root = ET.fromstring(archive.read(drawing_part))
+    boxes = []
+    for anchor in root:
+        if not any(next(anchor.iter(f"{{{XLSX_NS['xdr']}}}{tag}"), None) is not None
+                   for tag in ("pic", "sp", "cxnSp")):
+            continue
+        boxes.append(xlsx_anchor_box(anchor))
+    
+    blocks = []
+    for box in sorted(boxes, key=lambda b: b[1]):
+        if blocks and box[1] <= blocks[-1][3] + XLSX_PAGE_ROW_GAP:
+            c0, r0, c1, r1 = blocks[-1]
+            blocks[-1] = (min(c0, box[0]), r0, max(c1, box[2]), max(r1, box[3]))
+        else:
+            blocks.append(box)
+    return blocks
+
+def xlsx_column_letter(index):
+    """0부터 시작하는 열 번호를 Excel 열 이름(A, B, ..., AA)으로 변환"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+def xlsx_print_area(sheet_name, blocks):
+    """인쇄 영역 목록을 _xlnm.Print_Area 정의 이름 값으로 변환 (여백 XLSX_PRINT_MARGIN_CELLS 포함)"""
+    quoted_name = "'" + sheet_name.replace("'", "''") + "'"
+    ranges = []
+    for c0, r0, c1, r1 in blocks:
+        c0, r0 = max(0, c0 - XLSX_PRINT_MARGIN_CELLS), max(0, r0 - XLSX_PRINT_MARGIN_CELLS)
+        c1, r1 = c1 + XLSX_PRINT_MARGIN_CELLS, r1 + XLSX_PRINT_MARGIN_CELLS
+        ranges.append(f"{quoted_name}!${xlsx_column_letter(c0)}${r0 + 1}:${xlsx_column_letter(c1)}${r1 + 1}")
+    return ",".join(ranges)
+
+def parse_xlsx_xml(blob):
+    """OOXML 파트를 파싱하고 문서에 선언된 네임스페이스 접두사를 함께 반환 (다시 저장할 때 접두사 유지)
+
+    Returns:
+    --------
+    tuple : (루트 요소, dict 접두사 -> 네임스페이스 URI)
+    """
+    namespaces = {}
+    for _, (prefix, uri) in ET.iterparse(io.BytesIO(blob), events=("start-ns",)):
+        namespaces.setdefault(prefix, uri)
+    return ET.fromstring(blob), namespaces
+
+def write_xlsx_xml(root, namespaces):
+    """파싱한 OOXML 파트를 원래 접두사와 네임스페이스 선언을 유지하여 바이트로 저장
+
+    ET.register_namespace는 프로세스 전역 설정이라 다른 세션/스레드의 저장에도 영향을 주므로 사용하지
+    않고, 요소/속성 이름을 원래 접두사를 붙인 이름으로 바꾼 뒤 선언을 루트에 다시 씁니다. 파싱할 때 읽은
+    선언을 모두 남기므로 mc:Ignorable이 참조하는 접두사도 그대로 유지됩니다 (root의 이름이 바뀌므로
+    저장한 뒤에는 root를 다시 사용하지 않아야 합니다).
+    """
+    declarations = dict(namespaces)
+    prefixes = {}
+    for prefix, uri in declarations.items():
+        # 속성에는 기본 네임스페이스를 쓸 수 없으므로 같은 URI면 접두사가 있는 쪽을 우선
+        if uri not in prefixes or not prefixes[uri]:
+            prefixes[uri] = prefix
+    prefixes["http://www.w3.org/XML/1998/namespace"] = "xml"
+    
+    def qualified(name, attribute=False):
+        if not name.startswith("{"):
+            return name
+        uri, local = name[1:].split("}", 1)
+        prefix = prefixes.get(uri)
+        if prefix is None or (attribute and not prefix):
+            # 문서에 선언되지 않은 네임스페이스는 새 접두사로 선언
+            prefix = f"ns{len(declarations)}"
+            while prefix in declarations:
+                prefix += "_"
+            declarations[prefix] = uri
+            prefixes[uri] = prefix
+        return f"{prefix}:{local}" if prefix else local
+    
+    for element in root.iter():
+        element.tag = qualified(element.tag)
+        if any(name.startswith("{") for name in element.attrib):
+            attributes = {qualified(name, attribute=True): value for name, value in element.attrib.items()}
+            element.attrib.clear()
+            element.attrib.update(attributes)
+    
+    attributes = {("xmlns:" + prefix if prefix else "xmlns"): uri for prefix, uri in declarations.items()}
+    attributes.update(root.attrib)
+    root.attrib.clear()
+    root.attrib.update(attributes)
+    return ET.tostring(root, xml_declaration=True, encoding="UTF-8")
+
+def fit_xlsx_sheet_to_width(sheet_root):
+    """워크시트를 인쇄할 때 폭을 한 페이지에 맞추도록 설정 (넓은 영역이 여러 페이지로 나뉘지 않도록)"""
+    main = XLSX_NS["main"]
+    sheet_pr = sheet_root.find("main:sheetPr", XLSX_NS)
+    if sheet_pr is None:
+        sheet_pr = ET.Element(f"{{{main}}}sheetPr")
+        sheet_root.insert(0, sheet_pr)
+    page_setup_pr = sheet_pr.find("main:pageSetUpPr", XLSX_NS)
+    if page_setup_pr is None:
+        page_setup_pr = ET.SubElement(sheet_pr, f"{{{main}}}pageSetUpPr")
+    page_setup_pr.set("fitToPage", "1")
+    
+    page_setup = sheet_root.find("main:pageSetup", XLSX_NS)
+    if page_setup is None:
+        page_setup = ET.Element(f"{{{main}}}pageSetup")
+        position = len(sheet_root)
+        for index, child in enumerate(sheet_root):
+            if child.tag == f"{{{main}}}pageMargins":
+                position = index + 1
+                break
+            if child.tag in {f"{{{main}}}{tag}" for tag in XLSX_AFTER_PAGE_SETUP}:
+                position = index
+                break
+        sheet_root.insert(position, page_setup)
+    page_setup.set("fitToWidth", "1")
+    page_setup.set("fitToHeight", "0")
+
+def build_xlsx_print_subset(file_content):
+    """그림/도형이 있는 영역만 인쇄하도록 바꾼 Excel 파일 생성 (변환 페이지 수를 바코드 영역 수에 맞춤)
+
+    시트마다 그림/도형 앵커를 묶은 영역(read_xlsx_print_blocks)을 인쇄 영역으로 지정하고 폭을 한
+    페이지에 맞추며, 그림/도형이 없는 시트는 숨겨 PDF로 내보내지 않습니다. openpyxl로 다시 저장하면
+    도형과 일부 그림이 사라지므로 통합 문서/시트 XML만 직접 수정합니다.
+    
+    Returns:
+    --------
+    tuple : (Excel 파일 바이트, dict 시트 이름 -> 인쇄 영역 목록) 또는 None (줄일 수 없거나 읽을 수 없는 파일)
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(file_content))
+        workbook_part = "xl/workbook.xml"
+        sheet_parts = read_xlsx_relationships(archive, workbook_part)
+        workbook_root, workbook_namespaces = parse_xlsx_xml(archive.read(workbook_part))
+        sheets = workbook_root.findall("main:sheets/main:sheet", XLSX_NS)
+        
+        sheet_blocks = {}
+        modified_parts = {}
+        for sheet_index, sheet in enumerate(sheets):
+            sheet_part = sheet_parts.get(sheet.get(f"{{{XLSX_NS['r']}}}id"))
+            if sheet_part is None or sheet_part not in archive.namelist():
+                continue
+            sheet_root, sheet_namespaces = parse_xlsx_xml(archive.read(sheet_part))
+            drawing = sheet_root.find("main:drawing", XLSX_NS)
+            if drawing is None:
+                continue
+            drawing_part = read_xlsx_relationships(archive, sheet_part).get(drawing.get(f"{{{XLSX_NS['r']}}}id"))
+            if drawing_part is None or drawing_part not in archive.namelist():
+                continue
+            blocks = read_xlsx_print_blocks(archive, drawing_part)
+            if blocks:
+                sheet_blocks[sheet_index] = blocks
+                fit_xlsx_sheet_to_width(sheet_root)
+                modified_parts[sheet_part] = write_xlsx_xml(sheet_root, sheet_namespaces)
+    except Exception as e:
+        debug_info(f"Excel 인쇄 범위를 줄일 수 없어 문서 전체를 변환합니다: {str(e)}")
+        return None
+    
+    # 원래 숨긴 시트는 변환되지 않으므로 제외
+    visible_blocks = [sheet_index for sheet_index in sheet_blocks
+                      if sheets[sheet_index].get("state") not in ("hidden", "veryHidden")]
+    if not visible_blocks:
+        return None
+    
+    # 그림/도형이 없는 시트는 숨기고, 활성 시트를 처음 남은 시트로 지정
+    main = XLSX_NS["main"]
+    for sheet_index, sheet in enumerate(sheets):
+        if sheet_index not in sheet_blocks and sheet.get("state") != "veryHidden":
+            sheet.set("state", "hidden")
+    first_visible = min(visible_blocks)
+    for workbook_view in workbook_root.findall("main:bookViews/main:workbookView", XLSX_NS):
+        workbook_view.set("activeTab", str(first_visible))
+        workbook_view.set("firstSheet", str(first_visible))
+    
+    # 기존 인쇄 영역을 그림/도형 영역으로 교체
+    defined_names = workbook_root.find("main:definedNames", XLSX_NS)
+    if defined_names is None:
+        defined_names = ET.Element(f"{{{main}}}definedNames")
+        position = list(workbook_root).index(workbook_root.find("main:sheets", XLSX_NS)) + 1
+        for index, child in enumerate(workbook_root):
+            if child.tag in (f"{{{main}}}functionGroups", f"{{{main}}}externalReferences"):
+                position = index + 1
+        workbook_root.insert(position, defined_names)
+    for defined_name in defined_names.findall("main:definedName", XLSX_NS):
+        if defined_name.get("name") == "_xlnm.Print_Area":
+            defined_names.remove(defined_name)
+    for sheet_index, blocks in sorted(sheet_blocks.items()):
+        defined_name = ET.SubElement(defined_names, f"{{{main}}}definedName",
+                                     {"name": "_xlnm.Print_Area", "localSheetId": str(sheet_index)})
+        defined_name.text = xlsx_print_area(sheets[sheet_index].get("name"), blocks)
+    modified_parts[workbook_part] = write_xlsx_xml(workbook_root, workbook_namespaces)
+    
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as subset:
+        for item in archive.infolist():
+            subset.writestr(item, modified_parts.get(item.filename, archive.read(item.filename)))
+    return output.getvalue(), {sheets[sheet_index].get("name"): blocks for sheet_index, blocks in sheet_blocks.items()}
+
+def convert_office_to_pdf(file_content, file_extension, progress_callback=None, cache_source=None, cache_variant="",
+                          office=None):
+    """Office 파일(PPTX, XLSX)을 PDF로 변환 - 같은 파일을 이전에 변환했으면 캐시된 PDF 사용
+
+    캐시 키는 파일 내용의 SHA-256과 LibreOffice 버전이므로, LibreOffice를 업데이트하면 다시 변환합니다.
+    file_content가 원본 파일에서 만든 파일이면(저장할 때마다 바이트가 달라짐) 원본 내용(cache_source)과
+    만든 방식(cache_variant)으로 키를 만듭니다.
+    
+    office는 변환에 사용할 공유 객체 딕셔너리입니다 (모두 선택, 없으면 캐시 없이 LibreOffice를 직접 실행):
+    "pool"(OfficeConverterPool), "command_pool"(CommandConverterPool), "cache"(ConversionCache),
+    "metrics"(ConversionMetrics), "client_id"(변환 대기열에서 번갈아 처리할 세션 식별자)
+    """
+    office = office or {}
+    conversion_cache = office.get("cache")
+    cache_key = None
+    if conversion_cache is not None:
+        cache_key = ConversionCache.make_key(cache_source if cache_source is not None else file_content,
+                                             file_extension, soffice_version(), cache_variant)
+        pdf_content = conversion_cache.get(cache_key)
+        if pdf_content is not None:
+            debug_info("이전에 변환한 PDF를 재사용했습니다 (LibreOffice 변환 생략).")
+            if progress_callback:
+                progress_callback(100)
+            return pdf_content
+    
+    pdf_content = run_office_conversion(file_content, file_extension, progress_callback, office)
+    if pdf_content and cache_key is not None:
+        conversion_cache.put(cache_key, pdf_content)
+    return pdf_content
+
+def run_office_conversion(file_content, file_extension, progress_callback=None, office=None):
+    """Office 파일(PPTX, XLSX)을 PDF로 변환 (LibreOffice 사용)
+
+    변환 서버 풀(office["pool"])을 사용할 수 있으면 미리 실행해 둔 인스턴스로 변환하고,
+    실패하거나 사용할 수 없으면 전용 프로필 슬롯(office["command_pool"])에서 LibreOffice를 새로
+    실행합니다. 두 풀 모두 세션별로 번갈아 변환하므로 동시에 올린 파일이 프로필 잠금에 걸리지 않습니다. LibreOffice는 파일 경로만 받으므로
+    입력 파일만 임시 디렉토리에 저장하며, 변환된 PDF는 바이트로 반환되어 이후 렌더링까지 디스크를
+    거치지 않습니다.
+    
+    변환에는 파일 크기에 비례한 제한 시간(conversion_timeout)이 적용되며, 초과하면 LibreOffice
+    프로세스 그룹을 강제 종료하고 None을 반환합니다 (호출 측에서 직접 이미지 추출로 대체).
+    """
+    temp_dir = None
+    timeout = conversion_timeout(len(file_content))
+    office = office or {}
+    metrics = office.get("metrics")
+    start_time = time.time()
+    
+    def record(outcome):
+        if metrics is not None:
+            metrics.record(time.time() - start_time, outcome)
+    
+    try:
+        if progress_callback:
+            progress_callback(10)
+        
+        client_id = office.get("client_id")
+        converter = office.get("pool")
+        if converter is not None:
+            try:
+                pdf_content = converter.convert(file_content, file_extension, timeout=timeout, client_id=client_id)
+                record("ok")
+                if progress_callback:
+                    progress_callback(100)
+                return pdf_content
+            except ConversionTimeout as e:
+                record("timeout")
+                report_message("warning", f"{str(e)}. 변환을 중단했습니다.")
+                return None
+            except Exception as e:
+                debug_info(f"Office 변환 서버 사용 실패, LibreOffice를 직접 실행합니다: {str(e)}")
+        
+        command_converter = office.get("command_pool")
+        if command_converter is not None:
+            if progress_callback:
+                progress_callback(30)
+            try:
+                pdf_content = command_converter.convert(file_content, file_extension, timeout=timeout,
+                                                        client_id=client_id)
+            except ConversionTimeout as e:
+                record("timeout")
+                report_message("warning", f"{str(e)}. 변환을 중단했습니다.")
+                return None
+            except RuntimeError as e:
+                record("error")
+                report_message("warning", str(e))
+                return None
+            record("ok")
+            if progress_callback:
+                progress_callback(100)
+            return pdf_content
+        
+        # 변환 모듈을 불러올 수 없거나 LibreOffice를 찾지 못한 경우 기본 명령으로 실행
+        # 임시 디렉토리 생성
+        temp_dir = tempfile.mkdtemp()
+        input_path = os.path.join(temp_dir, f'input.{file_extension}')
+        # --convert-to는 입력 파일 이름에 확장자만 바꾼 파일을 만듦
+        output_path = os.path.join(temp_dir, 'input.pdf')
+        
+        # 입력 파일 저장
+        with open(input_path, 'wb') as f:
+            f.write(file_content)
+            
+        if progress_callback:
+            progress_callback(30)
+            
+        # 운영체제 확인
+        import platform
+        
+        # LibreOffice로 PDF 변환 (OS별 명령어 분기)
+        if platform.system() == "Windows":
+            # Windows용 명령어
+            libreoffice_paths = [
+                "C:\\Program Files\\LibreOffice\\program\\soffice.exe",
+                "C:\\Program Files (x86)\\LibreOffice\\program\\soffice.exe"
+            ]
+            
+            libreoffice_path = None
+            for path in libreoffice_paths:
+                if os.path.exists(path):
+                    libreoffice_path = path
+                    break
+                    
+            if not libreoffice_path:
+                report_message("warning", "LibreOffice를 찾을 수 없습니다.")
+                return None
+                
+            cmd = [libreoffice_path, '--headless', '--convert-to', 'pdf', '--outdir', temp_dir, input_path]
+        else:
+            # Linux/macOS용 명령어
+            cmd = ['libreoffice', '--headless', '--convert-to', 'pdf', '--outdir', temp_dir, input_path]
+        
+        # 제한 시간을 넘기면 LibreOffice 프로세스 그룹 전체를 강제 종료 (남은 soffice 프로세스 방지)
+        try:
+            returncode, stderr = run_conversion_command(cmd, timeout=timeout)
+        except ConversionTimeout as e:
+            record("timeout")
+            report_message("warning", f"{str(e)}. 변환을 중단했습니다.")
+            return None
+                
+        if returncode != 0:
+            record("error")
+            report_message("warning", f"LibreOffice 변환 실패: {stderr.decode('utf-8', errors='ignore')}")
+            return None
+            
+        if progress_callback:
+            progress_callback(70)
+            
+        # 생성된 PDF 파일 읽기
+        try:
+            with open(output_path, 'rb') as f:
+                pdf_content = f.read()
+        except FileNotFoundError:
+            record("error")
+            report_message("warning", f"변환된 PDF 파일을 찾을 수 없습니다. LibreOffice가 제대로 설치되어 있는지 확인하세요.")
+            return None
+        
+        record("ok")
+        if progress_callback:
+            progress_callback(100)
+            
+        return pdf_content
+    except Exception as e:
+        record("error")
+        report_message("error", f"파일 변환 중 오류 발생: {str(e)}")
+        return None
+    finally:
+        # 임시 디렉토리 삭제 (변환 실패 시 포함)
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+def extract_images_from_office_file(file_content, file_extension, progress_callback=None, office=None):
+    """Office 파일에서 이미지 추출 (PDF 변환 후 처리) - 슬라이드 정보 유지
+
+    PowerPoint 파일은 바코드가 있을 수 있는 슬라이드만 변환하고, 나머지 슬라이드는 빈 이미지 목록으로
+    원래 슬라이드 번호를 유지합니다.
+    """
+    slide_images = {}  # 슬라이드별 이미지 그룹화
+    candidates = None
+    
+    def stage_progress(offset, scale, status):
+        """하위 단계의 진행률(0~100)을 전체 진행률로 바꾸는 함수 (progress_callback이 없으면 None)"""
+        if not progress_callback:
+            return None
+        return lambda p: progress_callback(offset + p * scale, status)
+    
+    if file_extension.lower() == 'pptx' and have_library("pptx"):
+        from pptx import Presentation
+        try:
+            presentation = Presentation(io.BytesIO(file_content))
+            candidates = classify_pptx_slides(presentation)
+            slide_count = len(presentation.slides)
+            presentation = None
+        except Exception as e:
+            debug_info(f"슬라이드를 분류할 수 없어 전체 문서를 변환합니다: {str(e)}")
+        
+        if candidates is not None:
+            if progress_callback:
+                progress_callback(10, f"바코드가 있을 수 있는 슬라이드 {len(candidates)}/{slide_count}개를 PDF로 변환 중...")
+            rendered = convert_pptx_slides(file_content, candidates,
+                                           stage_progress(10, 0.8, "Office 파일을 PDF로 변환 중..."),
+                                           office=office)
+            if rendered is not None:
+                slide_images = {slide_num: rendered.get(slide_num, []) for slide_num in range(1, slide_count + 1)}
+                if progress_callback:
+                    progress_callback(100, "이미지 추출 완료")
+                return slide_images
+    
+    # PDF로 변환 (슬라이드만 골라 변환하다 실패했으면 전체 변환도 다시 시도하지 않음)
+    pdf_content = None
+    if candidates is None:
+        if progress_callback:
+            progress_callback(10, "Office 파일을 PDF로 변환 중...")
+        
+        # Excel 파일은 그림/도형이 있는 영역만 인쇄하도록 바꿔 변환 (빈 페이지가 많이 생기지 않도록)
+        convert_content, cache_variant = file_content, ""
+        if file_extension.lower() == 'xlsx':
+            print_subset = build_xlsx_print_subset(file_content)
+            if print_subset is not None:
+                convert_content, print_blocks = print_subset
+                cache_variant = "print-areas"
+                debug_info("Excel 인쇄 범위를 그림/도형 영역으로 줄여 변환합니다: " +
+                           ", ".join(f"'{sheet_name}' {len(blocks)}곳" for sheet_name, blocks in print_blocks.items()))
+            
+        pdf_content = convert_office_to_pdf(convert_content, file_extension,
+                                           stage_progress(0, 0.4, "Office 파일을 PDF로 변환 중..."),
+                                           cache_source=file_content, cache_variant=cache_variant, office=office)
+    
+    if pdf_content:
+        # PDF에서 이미지 추출
+        if progress_callback:
+            progress_callback(50, "PDF에서 이미지 추출 중...")
+            
+        images = extract_images_from_pdf(pdf_content,
+                                       stage_progress(50, 0.5, "PDF에서 이미지 추출 중..."))
+        
+        # 각 이미지를 슬라이드 번호별로 저장
+        for i, image in enumerate(images):
+            slide_num = i + 1
+            if slide_num not in slide_images:
+                slide_images[slide_num] = []
+            slide_images[slide_num].append(image)
+    else:
+        report_message("warning", f"{file_extension.upper()} 파일을 PDF로 변환하지 못했습니다.")
+        
+        # 직접 이미지 추출 시도 (PPTX만 가능)
+        if file_extension.lower() == 'pptx':
+            if progress_callback:
+                progress_callback(60, "PowerPoint에서 직접 이미지 추출 시도 중...")
+                
+            try:
+                from pptx import Presentation
+                
+                # 프레젠테이션 열기 (메모리에서 바로 읽음)
+                presentation = Presentation(io.BytesIO(file_content))
+                
+                # 슬라이드별로 이미지 추출
+                total_slides = len(presentation.slides)
+                for slide_idx, slide in enumerate(presentation.slides):
+                    if progress_callback:
+                        progress_callback(60 + (slide_idx * 40) // total_slides, "슬라이드에서 이미지 추출 중...")
+                        
+                    slide_num = slide_idx + 1
+                    slide_images[slide_num] = []
+                    
+                    for shape, picture, _ in iter_pptx_pictures(slide.shapes):
+                        try:
+                            image_bytes = picture.blob
+                            image = Image.open(io.BytesIO(image_bytes))
+                            slide_images[slide_num].append(image)
+                        except Exception as e:
+                            report_message("warning", f"이미지 추출 중 오류: {str(e)}")
+            except Exception as e:
+                report_message("error", f"PPTX 직접 처리 중 오류 발생: {str(e)}")
+    
+    if progress_callback:
+        progress_callback(100, "이미지 추출 완료")
+        
+    return slide_images
+
+# =========================================================
+# 문서 검증 함수 (디코딩된 바코드 문자열만 사용, UI 출력 없음)
+# =========================================================
+
+# 44x44 검증에만 영향을 주는 관리자 설정 (바뀌어도 재검출 없이 재검증만 수행)
+VALIDATION_CONFIG_KEYS = ("b_range_check", "b_min_value", "b_max_value", "i_n_check", "i_to_n_mapping")
+
+def get_validation_config(session_state):
+    """세션 상태(또는 설정 딕셔너리)에서 검증 설정만 추출"""
+    return {key: session_state[key] for key in VALIDATION_CONFIG_KEYS}
+
+def new_page_result(validation_mode):
+    """검증 모드에 맞게 초기화된 페이지 결과 딕셔너리 생성"""
+    page_result = {
+        "44x44_found": False,
+        "18x18_found": False,
+        "44x44_valid": False,
+        "18x18_valid": False,
+        "cross_valid": False,
+        "has_duplicate_44x44": False,  # 44x44 중복 감지 필드
+        "duplicate_page": None,  # 중복이 처음 발견된 페이지 번호
+        "has_warnings": False,  # 경고 상태 표시
+        "warning_messages": []  # 경고 메시지 저장
+    }
+    if validation_mode == "44x44":
+        page_result["skip_18x18"] = True  # 18x18 검증 생략 여부
+    elif validation_mode == "18x18":
+        page_result["skip_44x44"] = True  # 44x44 검증 생략 여부
+    return page_result
+
+def validate_page_barcodes(barcodes, validation_mode, validation_config):
+    """한 페이지에서 디코딩된 바코드 문자열 검증
+
+    각 종류별로 처음 발견된 매트릭스를 검증하고, 유효하지 않으면 같은 종류의 다음 매트릭스로
+    대체합니다. 화면 표시에 필요한 검증 상세 내용은 "44x44_check", "18x18_check"에 담깁니다.
+
+    Returns:
+    --------
+    dict : 페이지 결과 딕셔너리
+    """
+    page_result = new_page_result(validation_mode)
+    result_44x44 = {"valid": False, "pattern_match": False}
+    result_18x18 = {"valid": False, "pattern_match": False}
+    
+    for idx, data in enumerate(barcodes):
+        # 44x44 매트릭스 패턴 검사
+        if re.search(MATRIX_44X44_DETECT_PATTERN, data) and validation_mode in ["both", "44x44"]:
+            # 이미 44x44 데이터가 있는 경우 기존 것이 유효한지 확인하고 결정
+            if "44x44_check" not in page_result or not result_44x44["valid"]:
+                result_44x44 = validate_44x44_matrix(data, **validation_config)
+                page_result["44x44_check"] = {"index": idx, "data": data, "result": result_44x44}
+                page_result["44x44_found"] = True
+                page_result["44x44_valid"] = result_44x44["valid"]
+                page_result["44x44_data"] = result_44x44["data"]
+                
+                # 경고 상태 업데이트
+                if result_44x44.get("has_warnings"):
+                    page_result["has_warnings"] = True
+                    page_result["warning_messages"].extend(result_44x44["warnings"])
+        
+        # 18x18 매트릭스 패턴 검사
+        if re.search(MATRIX_18X18_DETECT_PATTERN, data) and validation_mode in ["both", "18x18"]:
+            # 이미 18x18 데이터가 있는 경우 기존 것이 유효한지 확인하고 결정
+            if "18x18_check" not in page_result or not result_18x18["valid"]:
+                result_18x18 = validate_18x18_matrix(data)
+                page_result["18x18_check"] = {"index": idx, "data": data, "result": result_18x18}
+                page_result["18x18_found"] = True
+                page_result["18x18_valid"] = result_18x18["valid"]
+                page_result["18x18_data"] = result_18x18["data"]
+    
+    # 교차 검증 (둘 다 검증 모드이고 두 매트릭스 모두 기본 형식이 일치할 때만)
+    if validation_mode == "both" and result_44x44["pattern_match"] and result_18x18["pattern_match"]:
+        cross_results = cross_validate_matrices(result_44x44, result_18x18)
+        page_result["cross_results"] = cross_results
+        page_result["cross_valid"] = "교차 검증이 성공적으로 완료되었습니다." in cross_results
+    
+    return page_result
+
+def validate_document(page_barcodes, validation_mode, validation_config):
+    """문서 전체 검증 (페이지별 검증, 44x44 중복 검사, 페이지간 검증)
+
+    Parameters:
+    -----------
+    page_barcodes : dict
+        페이지 번호 -> 디코딩된 바코드 문자열 목록
+    validation_mode : str
+        검증 모드 ("both", "44x44", "18x18")
+    validation_config : dict
+        validate_44x44_matrix에 전달할 검증 설정 (get_validation_config 참고)
+
+    Returns:
+    --------
+    dict : 페이지 번호 -> 페이지 결과 딕셔너리
+    """
+    page_results = {}
+    matrices_44x44_track = {}  # key: 데이터 내용, value: 페이지 번호
+    
+    for slide_num in sorted(page_barcodes.keys()):
+        page_result = validate_page_barcodes(page_barcodes[slide_num], validation_mode, validation_config)
+        page_results[slide_num] = page_result
+        
+        # 44x44 매트릭스 중복 검사 (페이지 순서대로 처음 발견된 페이지 기준)
+        if page_result["44x44_valid"]:
+            data_44x44 = page_result["44x44_check"]["data"]
+            if data_44x44 in matrices_44x44_track:
+                page_result["has_duplicate_44x44"] = True
+                page_result["duplicate_page"] = matrices_44x44_track[data_44x44]
+            else:
+                matrices_44x44_track[data_44x44] = slide_num
+    
+    return validate_cross_page(page_results, validation_mode)
+
+# =========================================================
+# 문서 처리 함수 (추출 -> 검출 -> 검증)
+# =========================================================
+
+OFFICE_FILETYPE_NAMES = {'xlsx': 'Excel', 'xls': 'Excel', 'pptx': 'PowerPoint', 'ppt': 'PowerPoint'}
+
+# 검증할 수 있는 파일 확장자
+SUPPORTED_EXTENSIONS = ('pdf',) + tuple(OFFICE_FILETYPE_NAMES)
+
+def extract_document_pages(file_content, file_extension, direct_first=True, office=None, progress_callback=None,
+                           status_callback=None):
+    """파일 형식에 맞게 페이지/슬라이드별 검출 이미지 준비
+
+    PDF는 검출하면서 페이지를 하나씩 렌더링하므로 여기서는 이미지를 만들지 않습니다. direct_first가
+    True이면 PowerPoint는 슬라이드의 그림을, Excel은 시트의 그림을 변환 없이 먼저 꺼내고, 그렇지
+    않거나 직접 꺼낼 수 없으면 LibreOffice로 변환한 이미지를 사용합니다.
+
+    progress_callback(백분율)과 status_callback(메시지)로 진행 상황을 전달합니다.
+
+    Returns:
+    --------
+    tuple : (슬라이드 번호 -> 이미지 목록 딕셔너리(PDF는 None, 추출 실패 시 빈 딕셔너리),
+             슬라이드 그림을 직접 추출했는지 여부(run_pptx_detection 사용 여부))
+    """
+    def update_status(message):
+        if status_callback:
+            status_callback(message)
+
+    def update_progress(p):
+        if progress_callback:
+            progress_callback(int(p))
+
+    if file_extension == 'pdf':
+        update_status("PDF 파일에서 이미지 추출 중...")
+        return None, False
+
+    if file_extension not in OFFICE_FILETYPE_NAMES:
+        report_message("error", f"지원되지 않는 파일 형식: {file_extension}")
+        return {}, False
+
+    if file_extension == 'pptx' and direct_first:
+        # PowerPoint는 슬라이드의 그림을 먼저 검사하고 필요한 슬라이드만 변환 (run_pptx_detection)
+        update_status("PowerPoint 슬라이드에서 그림 추출 중...")
+        slide_images = extract_pptx_slide_pictures(file_content)
+        update_progress(100)
+        if slide_images is not None:
+            total_pictures = sum(len(images) for images in slide_images.values())
+            update_status(f"PowerPoint에서 {len(slide_images)}개 슬라이드, {total_pictures}개 그림 추출 완료")
+            return slide_images, True
+    elif file_extension == 'xlsx' and direct_first:
+        # Excel은 시트의 그림을 시트/행 범위별 논리 페이지로 나누어 바로 검출 (전체 시트 변환 없음)
+        update_status("Excel 파일에서 그림 추출 중...")
+        extracted = extract_xlsx_sheet_images(file_content)
+        if extracted is not None:
+            slide_images, page_sources = extracted
+            update_progress(100)
+            total_pictures = sum(len(images) for images in slide_images.values())
+            sheet_count = len({sheet_name for sheet_name, _, _ in page_sources.values()})
+            update_status(f"Excel에서 {sheet_count}개 시트, {total_pictures}개 그림을 {len(slide_images)}개 페이지로 추출 완료")
+            for page_num, (sheet_name, start_row, end_row) in page_sources.items():
+                debug_info(f"페이지 {page_num}: 시트 '{sheet_name}' {start_row}~{end_row}행")
+            return slide_images, False
+
+    # Office 파일에서 슬라이드별 이미지 추출 (PDF 변환)
+    filetype_name = OFFICE_FILETYPE_NAMES[file_extension]
+    update_status(f"{filetype_name} 파일 처리 중...")
+
+    def update_conversion_progress(p, status="파일 처리 중..."):
+        # 변환 단계 진행률은 실수(p * 0.4 등)로 전달되므로 백분율 정수로 변환
+        update_progress(p)
+        update_status(status)
+
+    slide_images = extract_images_from_office_file(file_content, file_extension, update_conversion_progress,
+                                                   office=office)
+    total_images = sum(len(images) for images in slide_images.values())
+    if total_images > 0:
+        update_status(f"{filetype_name}에서 {len(slide_images)}개 슬라이드, {total_images}개 이미지 추출 완료")
+    return slide_images, False
+
+def detect_document_pages(file_content, slide_images, validation_mode, detect_pages, page_budget_sec,
+                          pptx_direct=False, office=None, render_progress=None, convert_progress=None,
+                          stage_callback=None):
+    """extract_document_pages로 준비한 문서의 모든 페이지에서 바코드 검출
+
+    detect_pages(pages, total=None, budgets=None)는 (페이지 번호, 이미지 목록) 쌍을 받아 (페이지 번호,
+    검출 결과)를 페이지 순서대로 반환하는 함수입니다 (run_page_detection에 검출 설정을 묶은 함수,
+    budgets는 run_page_detection의 page_budgets). page_budget_sec는 detect_pages의 페이지당 시간
+    예산으로, 여러 단계에 걸쳐 검출하는 페이지도 모든 단계를 합쳐 이 예산 안에서 검출합니다.
+
+    - PDF(slide_images가 None): 포함 이미지 -> 후보 영역 -> 전체 페이지 순서로 단계적 검출 (run_pdf_detection)
+    - 슬라이드 그림을 직접 추출한 PowerPoint: 그림 -> 필요한 슬라이드만 변환 이미지 (run_pptx_detection)
+    - 그 밖의 문서: 추출한 이미지로 바로 검출
+
+    render_progress(렌더링한 페이지 수, 전체 페이지 수)는 PDF 렌더링, convert_progress(백분율)는
+    PowerPoint 슬라이드 변환, stage_callback(메시지)은 검출 단계가 바뀔 때 호출됩니다.
+
+    Returns:
+    --------
+    dict : 페이지 번호 -> detect_page_barcodes 결과 (render_mode 포함)
+    """
+    if slide_images is None:
+        return run_pdf_detection(file_content, validation_mode, detect_pages, page_budget_sec,
+                                 render_progress=render_progress, status_callback=stage_callback)
+    if pptx_direct:
+        return run_pptx_detection(file_content, slide_images, validation_mode, detect_pages, page_budget_sec,
+                                  convert_progress=convert_progress, status_callback=stage_callback, office=office)
+    return dict(detect_pages([(slide_num, slide_images[slide_num]) for slide_num in sorted(slide_images)]))
+
+def validate_detections(page_detections, validation_mode, validation_config):
+    """페이지별 검출 결과의 바코드 문자열로 문서 전체를 검증하고 검출 상태/시간을 페이지 결과에 기록"""
+    page_results = validate_document(
+        {slide_num: detection["barcodes"] for slide_num, detection in page_detections.items()},
+        validation_mode,
+        validation_config
+    )
+    for slide_num, detection in page_detections.items():
+        page_results[slide_num]["detection_status"] = detection["detection_status"]
+        page_results[slide_num]["detection_time"] = detection["detection_time"]
+    return page_results
+
+def summarize_page_results(page_results, validation_mode):
+    """문서 전체 검증 판정 (바코드가 없는 슬라이드는 판단에서 제외)
+
+    Returns:
+    --------
+    dict : {"status": "pass", "warning"(통과했지만 확인 필요 항목 있음) 또는 "fail",
+            "issue_pages": 문제가 발견된 페이지 번호 목록(오름차순)}
+            판단할 페이지가 하나도 없으면(모든 슬라이드에 바코드 이미지가 없는 경우 포함)
+            검증한 바코드가 없으므로 "fail"이며 issue_pages는 비어 있습니다.
+    """
+    page_results = {page_num: result for page_num, result in page_results.items()
+                    if result.get("detection_status") != "not_expected"}
+    if not page_results:
+        return {"status": "fail", "issue_pages": []}
+
+    def s_duplicate(result):
+        return result.get("s_value_invalid", False) and result.get("s_duplicate_with", None)
+
+    def needs_review(result):
+        return (result.get("s_value_warning", False) or
+                (result.get("s_value_invalid", False) and not result.get("s_duplicate_with", None)) or
+                result["has_warnings"])
+
+    # 검증 모드에 따라 결과 판단 기준 적용
+    if validation_mode == "44x44":  # 44x44만 검증 모드
+        issue_pages = [
+            page_num for page_num, result in page_results.items()
+            if not (result["44x44_found"] and result["44x44_valid"]) or
+            result["has_duplicate_44x44"] or s_duplicate(result)
+        ]
+        warnings_exist = any(needs_review(result) for result in page_results.values())
+    elif validation_mode == "18x18":  # 18x18만 검증 모드 (확인 필요 항목 없음)
+        issue_pages = [
+            page_num for page_num, result in page_results.items()
+            if not (result["18x18_found"] and result["18x18_valid"]) or result.get("p_value_duplicate", False)
+        ]
+        warnings_exist = False
+    else:  # 둘 다 검증 모드
+        issue_pages = [
+            page_num for page_num, result in page_results.items()
+            if not (result["44x44_found"] and result["44x44_valid"] and
+                    result["18x18_found"] and result["18x18_valid"] and
+                    result["cross_valid"]) or
+            result["has_duplicate_44x44"] or
+            result.get("p_value_duplicate", False) or
+            s_duplicate(result)
+        ]
+        warnings_exist = any(needs_review(result) for result in page_results.values())
+
+    if issue_pages:
+        status = "fail"
+    elif warnings_exist:
+        status = "warning"
+    else:
+        status = "pass"
+    return {"status": status, "issue_pages": sorted(issue_pages)}
+
+def analyze_document(file_content, file_extension, validation_mode, detect_pages, page_budget_sec,
+                     validation_config, direct_first=True, office=None):
+    """문서 하나를 추출 -> 검출 -> 검증까지 처리 (UI 없이 사용하는 경우)
+
+    detect_pages와 page_budget_sec는 detect_document_pages와 같고, validation_config는 get_validation_config 결과
+    (또는 같은 키를 가진 설정 딕셔너리)입니다. 이미지를 추출할 수 없으면 두 딕셔너리 모두 비어 있습니다.
+
+    Returns:
+    --------
+    tuple : (페이지 번호 -> 검출 결과, 페이지 번호 -> 페이지 결과)
+    """
+    file_extension = file_extension.lower()
+    slide_images, pptx_direct = extract_document_pages(file_content, file_extension, direct_first, office)
+    if slide_images is not None and not slide_images:
+        return {}, {}
+
+    page_detections = detect_document_pages(file_content, slide_images, validation_mode, detect_pages,
+                                            page_budget_sec, pptx_direct=pptx_direct, office=office)
+    return page_detections, validate_detections(page_detections, validation_mode, validation_config)
@@ -0,0 +1,170 @@
+"""
+데이터매트릭스 검증기 디코딩 결과 캐시 모듈
+- 페이지 이미지의 비트맵 내용을 해시하여 바코드 검출 결과를 저장합니다.
+- 메모리 LRU 캐시(크기 기반 제거)와 재시작 후에도 유지되는 SQLite 디스크 캐시(선택)를 제공합니다.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+def image_digest(images, namespace=""):
+    """이미지 목록의 비트맵 내용으로 캐시 키 생성
+
+    Parameters:
+    -----------
+    images : list
+        PIL 이미지 또는 numpy 배열 목록
+    namespace : str
+        검출 파이프라인 버전, 검증 모드 등 결과에 영향을 주는 값
+
+    Returns:
+    --------
+    str : 16진수 해시 문자열
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(namespace.encode("utf-8"))
+    for image in images:
+        if hasattr(image, "mode") and hasattr(image, "tobytes"):
+            # PIL 이미지
+            digest.update(f"|{image.mode}|{image.size}|".encode("utf-8"))
+            digest.update(image.tobytes())
+        else:
+            # numpy 배열 (연속 메모리가 아니면 복사)
+            digest.update(f"|{image.dtype}|{image.shape}|".encode("utf-8"))
+            if not image.flags["C_CONTIGUOUS"]:
+                image = image.copy()
+            digest.update(memoryview(image).cast("B"))
+    return digest.hexdigest()
+
+class DecodeCache:
+    """바코드 검출 결과 캐시 (메모리 LRU + 선택적 SQLite)
+
+    값은 JSON으로 직렬화 가능한 객체여야 합니다. 여러 스레드(Streamlit 세션)에서 동시에
+    사용할 수 있습니다.
+    """
+
+    def __init__(self, max_memory_bytes=256 * 1024 * 1024, db_path=None, max_disk_entries=100000):
+        self.max_memory_bytes = max_memory_bytes
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (직렬화된 값, 크기)
+        self._memory_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+
+        if self.db_path:
+            directory = os.path.dirname(os.path.abspath(self.db_path))
+            os.makedirs(directory, exist_ok=True)
+            with contextlib.closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS decode_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS decode_cache_last_used ON decode_cache(last_used)")
+
+    def _connect(self):
+        """SQLite 연결 생성 (스레드별로 새 연결 사용, 호출하는 쪽에서 contextlib.closing으로 닫음)"""
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _remember(self, key, payload):
+        """메모리 캐시에 저장하고 크기 한도를 넘으면 오래된 항목부터 제거 (잠금 상태에서 호출)"""
+        size = len(payload)
+        if size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        self._memory[key] = (payload, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def get(self, key):
+        """캐시된 값 반환 (없으면 None)"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return json.loads(self._memory[key][0])
+
+        if self.db_path:
+            try:
+                with contextlib.closing(self._connect()) as conn, conn:
+                    row = conn.execute("SELECT value FROM decode_cache WHERE key = ?", (key,)).fetchone()
+                    if row:
+                        conn.execute("UPDATE decode_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            except sqlite3.Error:
+                row = None
+
+            if row:
+                with self._lock:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                return json.loads(row[0])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """값 저장 (메모리 및 디스크)"""
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, payload)
+
+        if self.db_path:
+            try:
+                with contextlib.closing(self._connect()) as conn, conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO decode_cache (key, value, last_used) VALUES (?, ?, ?)",
+                        (key, payload, time.time())
+                    )
+                    # 디스크 항목 수 한도 초과 시 가장 오래 사용하지 않은 항목 제거
+                    count = conn.execute("SELECT COUNT(*) FROM decode_cache").fetchone()[0]
+                    if count > self.max_disk_entries:
+                        conn.execute(
+                            "DELETE FROM decode_cache WHERE key IN "
+                            "(SELECT key FROM decode_cache ORDER BY last_used ASC LIMIT ?)",
+                            (count - self.max_disk_entries,)
+                        )
+            except sqlite3.Error:
+                pass
+
+    def clear(self):
+        """메모리 및 디스크 캐시 비우기"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self.hits = self.misses = self.memory_hits = self.disk_hits = 0
+        if self.db_path:
+            try:
+                with contextlib.closing(self._connect()) as conn, conn:
+                    conn.execute("DELETE FROM decode_cache")
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        """캐시 적중/미적중 통계 반환"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_enabled": bool(self.db_path),
+            }
@@ -0,0 +1,762 @@
+"""
+데이터매트릭스 검증기 Office 변환 서버 모듈
+- LibreOffice(soffice)를 헤드리스 모드로 미리 띄워 두고 UNO 소켓 연결로 PPTX/XLSX 파일을 PDF로 변환합니다.
+- 인스턴스마다 별도 사용자 프로필(-env:UserInstallation)을 사용하므로 동시에 여러 파일을 변환해도
+  프로필 잠금에 걸리지 않으며, 상태 확인에 실패한 인스턴스는 자동으로 다시 시작합니다.
+- UNO 파이썬 모듈(python3-uno)이 필요하며, 없으면 have_uno()가 False입니다 (처음 확인할 때 불러옴).
+- 변환마다 파일 크기에 비례한 제한 시간을 두고, 초과하면 LibreOffice 프로세스 그룹을 강제 종료합니다.
+- UNO 모듈이 없으면 CommandConverterPool이 슬롯별 전용 프로필로 soffice --convert-to를 실행합니다.
+- 두 풀 모두 세션(client_id)별로 번갈아 변환 슬롯을 배정하여(FairSlotQueue) 한 세션의 대량 업로드가
+  다른 세션의 변환을 막지 않도록 합니다.
+- 변환된 PDF는 Office 파일 SHA-256과 LibreOffice 버전을 키로 디스크에 보관하여(ConversionCache)
+  같은 파일을 다시 올리면 LibreOffice를 실행하지 않습니다.
+"""
+
+import functools
+import hashlib
+import os
+import pathlib
+import platform
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+
+@functools.lru_cache(maxsize=None)
+def load_uno():
+    """UNO 모듈을 처음 사용할 때 불러와 (uno 모듈, PropertyValue 클래스)로 반환 (프로세스당 한 번, 실패하면 None)
+
+    UNO 모듈은 LibreOffice 라이브러리를 함께 불러오므로 변환 서버 풀을 쓰지 않는 프로세스는 불러오지 않습니다.
+    """
+    try:
+        import uno
+        from com.sun.star.beans import PropertyValue
+    except ImportError:
+        return None
+    return uno, PropertyValue
+
+def have_uno():
+    """UNO 모듈을 사용할 수 있는지 확인"""
+    return load_uno() is not None
+
+# 파일 확장자별 LibreOffice PDF 내보내기 필터
+PDF_EXPORT_FILTERS = {
+    "pptx": "impress_pdf_Export",
+    "ppt": "impress_pdf_Export",
+    "xlsx": "calc_pdf_Export",
+    "xls": "calc_pdf_Export",
+    "docx": "writer_pdf_Export",
+    "doc": "writer_pdf_Export",
+}
+
+# Windows/macOS 기본 설치 경로 (Linux는 PATH에서 검색)
+SOFFICE_PATHS = [
+    "C:\\Program Files\\LibreOffice\\program\\soffice.exe",
+    "C:\\Program Files (x86)\\LibreOffice\\program\\soffice.exe",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+]
+
+# 변환 제한 시간 (초) - 기본 시간 + MB당 추가 시간, 상한
+CONVERT_TIMEOUT_BASE_SEC = 60
+CONVERT_TIMEOUT_PER_MB_SEC = 15
+CONVERT_TIMEOUT_MAX_SEC = 600
+
+class ConversionTimeout(RuntimeError):
+    """변환 제한 시간 초과 (LibreOffice 프로세스는 이미 종료된 상태)"""
+
+def conversion_timeout(size_bytes):
+    """파일 크기에 비례한 변환 제한 시간 (초)"""
+    timeout = CONVERT_TIMEOUT_BASE_SEC + CONVERT_TIMEOUT_PER_MB_SEC * size_bytes / (1024 * 1024)
+    return min(CONVERT_TIMEOUT_MAX_SEC, timeout)
+
+def kill_process_tree(process):
+    """프로세스와 그 자식 프로세스(soffice.bin 등)를 모두 강제 종료
+
+    POSIX에서는 start_new_session=True로 실행된 프로세스의 프로세스 그룹 전체를 종료합니다.
+    """
+    if process is None or process.poll() is not None:
+        return
+    try:
+        if platform.system() == "Windows":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        process.kill()
+    process.wait()
+
+def _new_session_kwargs():
+    """자식 프로세스를 별도 프로세스 그룹으로 실행하기 위한 Popen 인자"""
+    if platform.system() == "Windows":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+def run_conversion_command(cmd, timeout=None):
+    """LibreOffice 변환 명령 실행 후 (종료 코드, stderr 바이트) 반환
+
+    timeout초 안에 끝나지 않으면 프로세스 그룹을 강제 종료하고 ConversionTimeout을 발생시킵니다.
+    """
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **_new_session_kwargs())
+    try:
+        _, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        kill_process_tree(process)
+        process.communicate()
+        raise ConversionTimeout(f"LibreOffice 변환이 제한 시간({timeout:.0f}초)을 초과했습니다")
+    return process.returncode, stderr
+
+def _latency_stats(values):
+    """지연 시간 목록의 p50/p95/최대값 (목록이 비어 있으면 None)"""
+    values = sorted(values)
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    return {
+        "p50": values[len(values) // 2],
+        "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+        "max": values[-1],
+    }
+
+class ConversionMetrics:
+    """Office 변환 소요 시간과 결과 통계 (최근 window개 기준 지연 시간 분위수)"""
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.conversions = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def record(self, elapsed, outcome="ok"):
+        """변환 한 건 기록 (outcome: "ok", "timeout", "error")"""
+        with self._lock:
+            self._latencies.append(elapsed)
+            if outcome == "timeout":
+                self.timeouts += 1
+            elif outcome == "error":
+                self.failures += 1
+            else:
+                self.conversions += 1
+
+    def stats(self):
+        """변환 건수와 지연 시간(초) 통계 반환"""
+        with self._lock:
+            latencies = list(self._latencies)
+            stats = {
+                "conversions": self.conversions,
+                "timeouts": self.timeouts,
+                "failures": self.failures,
+            }
+        stats.update(_latency_stats(latencies))
+        return stats
+
+class FairSlotQueue:
+    """변환 슬롯 대기열 - 대기 중인 세션(client_id)에 번갈아 슬롯을 배정
+
+    같은 세션의 요청은 도착 순서대로 처리하지만, 여러 세션이 기다리면 세션마다 한 건씩 돌아가며
+    슬롯을 받습니다. 대기열 길이와 슬롯을 얻기까지 기다린 시간(최근 window건)을 기록합니다.
+    """
+
+    def __init__(self, window=500):
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._waiting = OrderedDict()  # client_id -> 대기 요청 목록 (맨 앞 세션이 다음 차례)
+        self._waits = deque(maxlen=window)
+        self.max_depth = 0
+
+    def _dispatch(self):
+        """유휴 슬롯을 다음 차례 세션의 가장 오래된 요청에 배정 (잠금 상태에서 호출)"""
+        assigned = False
+        while self._idle and self._waiting:
+            client_id, tickets = next(iter(self._waiting.items()))
+            tickets.popleft()["slot"] = self._idle.popleft()
+            # 배정받은 세션은 차례를 맨 뒤로 넘김
+            del self._waiting[client_id]
+            if tickets:
+                self._waiting[client_id] = tickets
+            assigned = True
+        if assigned:
+            self._cond.notify_all()
+
+    def put(self, slot):
+        """슬롯 반환 (또는 새 슬롯 추가)"""
+        with self._cond:
+            self._idle.append(slot)
+            self._dispatch()
+
+    def get(self, client_id=None, timeout=None):
+        """슬롯을 배정받을 때까지 대기 (timeout초 안에 받지 못하면 queue.Empty)"""
+        ticket = {"slot": None}
+        start_time = time.time()
+        with self._cond:
+            self._waiting.setdefault(client_id, deque()).append(ticket)
+            self.max_depth = max(self.max_depth, self._depth())
+            self._dispatch()
+            while ticket["slot"] is None:
+                remaining = None if timeout is None else start_time + timeout - time.time()
+                if remaining is not None and remaining <= 0:
+                    tickets = self._waiting.get(client_id)
+                    if tickets is not None and ticket in tickets:
+                        tickets.remove(ticket)
+                        if not tickets:
+                            del self._waiting[client_id]
+                    raise queue.Empty
+                self._cond.wait(remaining)
+            self._waits.append(time.time() - start_time)
+            return ticket["slot"]
+
+    def _depth(self):
+        """대기 중인 요청 수 (잠금 상태에서 호출)"""
+        return sum(len(tickets) for tickets in self._waiting.values())
+
+    def qsize(self):
+        """유휴 슬롯 수"""
+        with self._cond:
+            return len(self._idle)
+
+    def stats(self):
+        """대기열 길이와 대기 시간(초) 통계 반환"""
+        with self._cond:
+            stats = {
+                "idle": len(self._idle),
+                "queue_depth": self._depth(),
+                "waiting_sessions": len(self._waiting),
+                "max_queue_depth": self.max_depth,
+            }
+            waits = list(self._waits)
+        stats.update({f"wait_{key}": value for key, value in _latency_stats(waits).items()})
+        return stats
+
+def find_soffice():
+    """LibreOffice 실행 파일 경로 반환 (찾지 못하면 None)"""
+    for name in ("soffice", "libreoffice"):
+        path = shutil.which(name)
+        if path:
+            return path
+    for path in SOFFICE_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+_SOFFICE_VERSIONS = {}
+
+def soffice_version(soffice_path=None):
+    """LibreOffice 버전 문자열 (soffice --version 출력, 실행 파일별로 한 번만 확인)
+
+    LibreOffice를 찾을 수 없거나 버전을 확인할 수 없으면 "unknown"을 반환합니다.
+    """
+    soffice_path = soffice_path or find_soffice()
+    if not soffice_path:
+        return "unknown"
+    if soffice_path not in _SOFFICE_VERSIONS:
+        try:
+            result = subprocess.run([soffice_path, "--version"], stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, timeout=30)
+            version = result.stdout.decode("utf-8", errors="ignore").strip()
+        except (OSError, subprocess.SubprocessError):
+            version = ""
+        _SOFFICE_VERSIONS[soffice_path] = version or "unknown"
+    return _SOFFICE_VERSIONS[soffice_path]
+
+def _free_port():
+    """로컬에서 사용 가능한 TCP 포트 번호 반환"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _property(name, value):
+    """UNO PropertyValue 생성"""
+    prop = load_uno()[1]()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+class SofficeInstance:
+    """UNO 소켓으로 연결된 헤드리스 soffice 프로세스 하나 (전용 사용자 프로필 사용)
+
+    한 번에 한 스레드만 사용해야 합니다 (OfficeConverterPool이 대기열로 보장).
+    """
+
+    def __init__(self, soffice_path, profile_dir, startup_timeout=60):
+        self.soffice_path = soffice_path
+        self.profile_dir = profile_dir
+        self.startup_timeout = startup_timeout
+
+        self.process = None
+        self.desktop = None
+        self.port = None
+        self.conversions = 0
+
+    def start(self):
+        """soffice를 실행하고 UNO 연결이 될 때까지 대기 (실패 시 RuntimeError)"""
+        self.stop()
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self.port = _free_port()
+        uno = load_uno()[0]
+        connection = f"socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        cmd = [
+            self.soffice_path,
+            f"-env:UserInstallation={uno.systemPathToFileUrl(os.path.abspath(self.profile_dir))}",
+            "--headless", "--invisible", "--nologo", "--nodefault", "--norestore", "--nolockcheck",
+            f"--accept={connection}",
+        ]
+        # 프로세스 그룹을 분리하여 Streamlit 프로세스의 시그널이 전달되지 않고, 그룹 단위로 종료할 수 있도록 함
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                        **_new_session_kwargs())
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context)
+
+        deadline = time.time() + self.startup_timeout
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"soffice가 시작 중 종료되었습니다 (종료 코드 {self.process.returncode})")
+            try:
+                context = resolver.resolve(f"uno:{connection}")
+                self.desktop = context.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", context)
+                self.conversions = 0
+                return
+            except Exception:
+                if time.time() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"soffice UNO 연결 대기 시간({self.startup_timeout}초)을 초과했습니다")
+                time.sleep(0.25)
+
+    def is_healthy(self):
+        """프로세스가 살아 있고 UNO 호출에 응답하는지 확인"""
+        if self.process is None or self.process.poll() is not None or self.desktop is None:
+            return False
+        try:
+            self.desktop.getFrames()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, input_path, output_path, filter_name):
+        """문서를 열어 PDF로 저장"""
+        uno = load_uno()[0]
+        document = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(input_path)), "_blank", 0,
+            (_property("Hidden", True), _property("ReadOnly", True)))
+        if document is None:
+            raise RuntimeError("LibreOffice가 문서를 열 수 없습니다")
+        try:
+            document.storeToURL(uno.systemPathToFileUrl(os.path.abspath(output_path)),
+                                (_property("FilterName", filter_name),))
+        finally:
+            document.close(True)
+        self.conversions += 1
+
+    def kill(self):
+        """프로세스 그룹 강제 종료 (변환 감시 타이머에서 호출, 진행 중인 UNO 호출은 오류로 끝남)"""
+        kill_process_tree(self.process)
+
+    def stop(self):
+        """UNO로 종료를 요청하고, 응답이 없으면 프로세스를 강제 종료"""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+            self.desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                kill_process_tree(self.process)
+            self.process = None
+
+class OfficeConverterPool:
+    """미리 실행해 둔 soffice 인스턴스 풀 (여러 스레드/Streamlit 세션에서 동시에 사용 가능)
+
+    유휴 인스턴스는 FairSlotQueue에 보관하며, 변환 요청은 유휴 인스턴스가 생길 때까지 세션별로
+    번갈아 대기합니다.
+    인스턴스는 생성 직후 백그라운드에서 시작되고, 상태 확인 실패나 변환 오류가 나면 다시
+    시작됩니다. max_conversions회 변환한 인스턴스도 메모리 누적을 막기 위해 다시 시작합니다.
+    """
+
+    def __init__(self, size=2, soffice_path=None, base_dir=None, startup_timeout=60, max_conversions=200):
+        self.size = max(1, int(size))
+        self.soffice_path = soffice_path or find_soffice()
+        self.max_conversions = max_conversions
+        self.base_dir = base_dir or tempfile.mkdtemp(prefix="dmtx-soffice-")
+
+        self._idle = FairSlotQueue()
+        self._lock = threading.Lock()
+        self._instances = [
+            SofficeInstance(self.soffice_path, os.path.join(self.base_dir, f"profile_{index}"), startup_timeout)
+            for index in range(self.size)
+        ]
+        self._ready = 0
+
+        self.conversions = 0
+        self.failures = 0
+        self.restarts = 0
+        self.last_error = None
+        self._consecutive_failures = 0
+
+        if have_uno() and self.soffice_path:
+            threading.Thread(target=self._warm_up, name="soffice-warm-up", daemon=True).start()
+
+    @property
+    def available(self):
+        """UNO 모듈과 soffice 실행 파일이 있고, 인스턴스 시작이 연속으로 실패하고 있지 않은지
+
+        시작에 성공하면 연속 실패 횟수를 다시 0부터 세므로, 드문드문 일어나는 일시적인 실패로는
+        풀이 비활성화되지 않습니다.
+        """
+        return have_uno() and bool(self.soffice_path) and self._consecutive_failures < self.size * 3
+
+    def _warm_up(self):
+        """인스턴스를 차례로 시작하여 유휴 대기열에 추가"""
+        for instance in self._instances:
+            # 시작에 실패한 인스턴스도 대기열에 넣어 변환 요청 시 다시 시작을 시도
+            self._restart(instance, count=False)
+            self._idle.put(instance)
+
+    def _restart(self, instance, count=True):
+        """인스턴스 (재)시작 - 성공 여부 반환"""
+        try:
+            instance.start()
+            with self._lock:
+                self._consecutive_failures = 0
+                if count:
+                    self.restarts += 1
+                else:
+                    self._ready += 1
+            return True
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+                self._consecutive_failures += 1
+                self.last_error = str(e)
+            return False
+
+    def _restart_in_background(self, instance):
+        """인스턴스를 백그라운드 스레드에서 다시 시작한 뒤 유휴 대기열에 되돌림 (시작에 실패해도 되돌려
+        다음 변환 요청 때 다시 시작을 시도)"""
+        def restart():
+            self._restart(instance)
+            self._idle.put(instance)
+
+        threading.Thread(target=restart, name="soffice-restart", daemon=True).start()
+
+    def convert(self, file_content, file_extension, wait_timeout=120, timeout=None, client_id=None):
+        """Office 파일 바이트를 PDF 바이트로 변환
+
+        client_id는 공정 대기열에서 요청을 구분하는 세션 식별자입니다.
+        유휴 인스턴스를 wait_timeout초 안에 얻지 못하거나 변환에 실패하면 RuntimeError를 발생시킵니다.
+        변환이 timeout초를 넘으면 인스턴스를 강제 종료하고 바로 ConversionTimeout을 발생시킵니다
+        (종료한 인스턴스는 백그라운드에서 다시 시작하므로 호출한 쪽은 재시작을 기다리지 않음).
+        """
+        if not self.available:
+            raise RuntimeError("Office 변환 서버를 사용할 수 없습니다")
+        filter_name = PDF_EXPORT_FILTERS.get(file_extension.lower())
+        if filter_name is None:
+            raise RuntimeError(f"지원하지 않는 파일 형식입니다: {file_extension}")
+
+        try:
+            instance = self._idle.get(client_id, timeout=wait_timeout)
+        except queue.Empty:
+            raise RuntimeError(f"Office 변환 서버 대기 시간({wait_timeout}초)을 초과했습니다")
+
+        temp_dir = tempfile.mkdtemp(prefix="dmtx-convert-")
+        try:
+            # 상태 확인에 실패했거나 변환 횟수 한도에 도달한 인스턴스는 다시 시작
+            if not instance.is_healthy() or instance.conversions >= self.max_conversions:
+                if not self._restart(instance):
+                    raise RuntimeError(f"soffice 인스턴스를 다시 시작할 수 없습니다: {self.last_error}")
+
+            input_path = os.path.join(temp_dir, f"input.{file_extension}")
+            output_path = os.path.join(temp_dir, "output.pdf")
+            with open(input_path, "wb") as f:
+                f.write(file_content)
+
+            # 감시 타이머: 제한 시간이 지나면 인스턴스를 강제 종료하여 멈춘 UNO 호출을 끝냄
+            expired = threading.Event()
+
+            def expire():
+                expired.set()
+                instance.kill()
+
+            watchdog = None
+            if timeout:
+                watchdog = threading.Timer(timeout, expire)
+                watchdog.daemon = True
+                watchdog.start()
+            try:
+                instance.convert(input_path, output_path, filter_name)
+            except Exception:
+                if watchdog is not None:
+                    watchdog.cancel()
+                if expired.is_set():
+                    # 제한 시간 초과: 재시작은 백그라운드에서 하고 대기열에도 그쪽에서 되돌림
+                    self._restart_in_background(instance)
+                    instance = None
+                    raise ConversionTimeout(f"LibreOffice 변환이 제한 시간({timeout:.0f}초)을 초과했습니다")
+                # 변환 중 오류가 난 인스턴스는 상태를 알 수 없으므로 다시 시작
+                self._restart(instance)
+                raise
+            if watchdog is not None:
+                watchdog.cancel()
+
+            with open(output_path, "rb") as f:
+                pdf_content = f.read()
+            with self._lock:
+                self.conversions += 1
+            return pdf_content
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            if instance is not None:
+                self._idle.put(instance)
+
+    def close(self):
+        """모든 인스턴스 종료 및 프로필 디렉토리 삭제"""
+        for instance in self._instances:
+            instance.stop()
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def stats(self):
+        """풀 상태 통계 반환"""
+        with self._lock:
+            stats = {
+                "size": self.size,
+                "ready": self._ready,
+                "conversions": self.conversions,
+                "restarts": self.restarts,
+                "failures": self.failures,
+                "last_error": self.last_error,
+            }
+        stats.update(self._idle.stats())
+        return stats
+
+class CommandConverterPool:
+    """soffice --convert-to 실행 슬롯 풀 (UNO 모듈이 없을 때 사용)
+
+    슬롯마다 전용 사용자 프로필(-env:UserInstallation)을 사용하므로 여러 세션이 동시에 변환해도
+    기본 프로필 잠금에 걸리지 않습니다. 동시에 실행하는 soffice 수는 size개로 제한되며, 나머지
+    요청은 FairSlotQueue에서 세션별로 번갈아 대기합니다.
+    """
+
+    def __init__(self, size=2, soffice_path=None, base_dir=None):
+        self.size = max(1, int(size))
+        self.soffice_path = soffice_path or find_soffice()
+        self.base_dir = base_dir or tempfile.mkdtemp(prefix="dmtx-soffice-cli-")
+
+        self._slots = FairSlotQueue()
+        for index in range(self.size):
+            self._slots.put(os.path.join(self.base_dir, f"profile_{index}"))
+
+        self._lock = threading.Lock()
+        self.conversions = 0
+        self.failures = 0
+        self.last_error = None
+
+    @property
+    def available(self):
+        """soffice 실행 파일을 찾았는지"""
+        return bool(self.soffice_path)
+
+    def convert(self, file_content, file_extension, wait_timeout=120, timeout=None, client_id=None):
+        """Office 파일 바이트를 PDF 바이트로 변환
+
+        슬롯을 wait_timeout초 안에 얻지 못하거나 변환에 실패하면 RuntimeError, 변환이 timeout초를
+        넘으면 프로세스 그룹을 강제 종료하고 ConversionTimeout을 발생시킵니다.
+        """
+        if not self.available:
+            raise RuntimeError("LibreOffice를 찾을 수 없습니다")
+        try:
+            profile_dir = self._slots.get(client_id, timeout=wait_timeout)
+        except queue.Empty:
+            raise RuntimeError(f"Office 변환 대기 시간({wait_timeout}초)을 초과했습니다")
+
+        temp_dir = tempfile.mkdtemp(prefix="dmtx-convert-")
+        try:
+            input_path = os.path.join(temp_dir, f"input.{file_extension}")
+            # --convert-to는 입력 파일 이름에 확장자만 바꾼 파일을 만듦
+            output_path = os.path.join(temp_dir, "input.pdf")
+            with open(input_path, "wb") as f:
+                f.write(file_content)
+
+            profile_url = pathlib.Path(os.path.abspath(profile_dir)).as_uri()
+            cmd = [self.soffice_path, f"-env:UserInstallation={profile_url}", "--headless", "--norestore",
+                   "--convert-to", "pdf", "--outdir", temp_dir, input_path]
+            try:
+                returncode, stderr = run_conversion_command(cmd, timeout=timeout)
+            except ConversionTimeout as e:
+                self._record_failure(str(e))
+                raise
+            if returncode != 0:
+                message = f"LibreOffice 변환 실패: {stderr.decode('utf-8', errors='ignore')}"
+                self._record_failure(message)
+                raise RuntimeError(message)
+
+            try:
+                with open(output_path, "rb") as f:
+                    pdf_content = f.read()
+            except FileNotFoundError:
+                message = "변환된 PDF 파일을 찾을 수 없습니다. LibreOffice가 제대로 설치되어 있는지 확인하세요."
+                self._record_failure(message)
+                raise RuntimeError(message)
+            with self._lock:
+                self.conversions += 1
+            return pdf_content
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            self._slots.put(profile_dir)
+
+    def _record_failure(self, message):
+        """실패 건수와 마지막 오류 기록"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = message
+
+    def close(self):
+        """프로필 디렉토리 삭제"""
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def stats(self):
+        """슬롯 상태 통계 반환"""
+        with self._lock:
+            stats = {
+                "size": self.size,
+                "conversions": self.conversions,
+                "failures": self.failures,
+                "last_error": self.last_error,
+            }
+        stats.update(self._slots.stats())
+        return stats
+
+class ConversionCache:
+    """변환된 PDF 디스크 캐시 (크기 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거)
+
+    마지막 사용 시각은 파일 수정 시각으로 기록하므로 재시작 후에도 제거 순서가 유지됩니다.
+    여러 스레드(Streamlit 세션)에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> 파일 크기 (오래 사용하지 않은 순)
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        # 기존 캐시 파일을 마지막 사용 시각 순으로 불러옴
+        existing = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pdf"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            existing.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def make_key(file_content, file_extension, version, variant=""):
+        """Office 파일 내용, 확장자, LibreOffice 버전으로 캐시 키 생성
+
+        variant는 같은 파일에서 만든 다른 변환 입력(일부 슬라이드만 남긴 파일 등)을 구분하는 값입니다.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{version}|{file_extension.lower()}|{variant}|".encode("utf-8"))
+        digest.update(file_content)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        """캐시 파일 경로"""
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def _evict(self):
+        """크기 한도를 넘으면 오래된 항목부터 삭제 (잠금 상태에서 호출)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, key):
+        """캐시된 PDF 바이트 반환 (없으면 None)"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                pdf_content = f.read()
+            os.utime(self._path(key))
+        except OSError:
+            # 다른 프로세스가 지운 파일
+            with self._lock:
+                if key in self._entries:
+                    self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return pdf_content
+
+    def put(self, key, pdf_content):
+        """변환된 PDF 저장 (한도보다 큰 파일은 저장하지 않음)"""
+        size = len(pdf_content)
+        if size > self.max_bytes:
+            return
+        # 임시 파일에 쓴 뒤 이름을 바꿔 읽는 쪽이 쓰다 만 파일을 보지 않도록 함
+        temp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(pdf_content)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def clear(self):
+        """모든 캐시 파일 삭제"""
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """캐시 적중/미적중 통계 반환"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
@@ -0,0 +1,53 @@
+"""batch_validate 테스트 (문서 수집, 종료 코드)"""
+
+import os
+
+import pytest
+
+import batch_validate
+from batch_validate import collect_documents, exit_code
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch):
+    """하위 디렉토리와 지원하지 않는 확장자가 섞인 문서 디렉토리 (작업 디렉토리를 tmp_path로 변경)"""
+    for name in ("docs/a.pdf", "docs/b.XLSX", "docs/notes.txt", "docs/sub/c.pptx", "docs/sub/deep/d.pdf",
+                 "docs/sub/image.png", "other/e.pdf"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    (tmp_path / "docs" / "folder.pdf").mkdir()  # 확장자가 있어도 디렉토리는 제외
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def paths(*names):
+    """"/"로 적은 상대 경로를 현재 OS의 경로 형식으로 변환"""
+    return [os.path.join(*name.split("/")) for name in names]
+
+def test_collect_documents_walks_directories_recursively(documents):
+    assert collect_documents(["docs"]) == paths("docs/a.pdf", "docs/b.XLSX", "docs/sub/c.pptx",
+                                                "docs/sub/deep/d.pdf")
+
+def test_collect_documents_filters_unsupported_extensions(documents):
+    # 직접 지정한 파일도 지원하지 않는 확장자면 제외
+    assert collect_documents(["docs/notes.txt", "docs/sub/image.png", "docs/a.pdf"]) == paths("docs/a.pdf")
+
+def test_collect_documents_expands_glob_patterns(documents):
+    assert collect_documents(["**/*.pdf"]) == paths("docs/a.pdf", "docs/sub/deep/d.pdf", "other/e.pdf")
+    assert collect_documents(["missing/*.pdf", "missing.pdf"]) == []
+
+def test_collect_documents_removes_duplicates(documents):
+    targets = ["docs/sub", "docs/sub/c.pptx", "./docs/sub/c.pptx", "docs/sub/", "docs/**/*.pptx",
+               str(documents / "other")]
+
+    assert collect_documents(targets) == sorted(paths("docs/sub/c.pptx", "docs/sub/deep/d.pdf")
+                                                + [str(documents / "other" / "e.pdf")])
+
+@pytest.mark.parametrize("statuses, code", [
+    ([], batch_validate.EXIT_PASS),
+    (["pass", "warning"], batch_validate.EXIT_PASS),  # 확인 필요 항목은 통과로 처리
+    (["pass", "fail", "warning"], batch_validate.EXIT_VALIDATION_FAILED),
+    (["fail", "error", "pass"], batch_validate.EXIT_PROCESSING_ERROR),  # 처리 오류가 검증 실패보다 우선
+    (["error"], batch_validate.EXIT_PROCESSING_ERROR),
+])
+def test_exit_code(statuses, code):
+    assert exit_code([{"file": f"{index}.pdf", "status": status} for index, status in enumerate(statuses)]) == code
@@ -0,0 +1,280 @@
+"""datamatrix_engine 테스트 (Streamlit, LibreOffice, libdmtx 없이 실행되는 부분)"""
+
+import io
+import zipfile
+
+import pytest
+from PIL import Image
+
+import datamatrix_engine as engine
+
+def make_pdf(page_count=1):
+    """흰 페이지로 된 PDF 바이트 생성"""
+    pages = [Image.new("L", (200, 200), 255) for _ in range(page_count)]
+    output = io.BytesIO()
+    pages[0].save(output, format="PDF", save_all=True, append_images=pages[1:])
+    return output.getvalue()
+
+def make_xlsx():
+    """그림이 없는 Excel 파일 바이트 생성"""
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    workbook.active["A1"] = "text"
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+def make_picture_workbook(sheets, print_areas=None, row_breaks=None):
+    """그림이 있는 Excel 파일 바이트 생성
+
+    sheets는 (시트 이름, 그림 앵커 셀 목록) 목록이며, 앵커 셀이 없는 시트는 텍스트만 넣습니다.
+    print_areas(시트 이름 -> 셀 범위)가 있으면 사용자가 지정한 인쇄 영역으로, row_breaks(시트 이름 ->
+    행 번호 목록)가 있으면 해당 행 다음의 수동 페이지 나누기로 저장합니다.
+    """
+    openpyxl = pytest.importorskip("openpyxl")
+    from openpyxl.drawing.image import Image as SheetImage
+    from openpyxl.worksheet.pagebreak import Break
+
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, anchors in sheets:
+        worksheet = workbook.create_sheet(sheet_name)
+        worksheet["A1"] = sheet_name
+        for anchor in anchors:
+            picture = io.BytesIO()
+            Image.new("L", (60, 60), 0).save(picture, format="PNG")
+            worksheet.add_image(SheetImage(picture), anchor)
+    for sheet_name, print_area in (print_areas or {}).items():
+        workbook[sheet_name].print_area = print_area
+    for sheet_name, rows in (row_breaks or {}).items():
+        for row in rows:
+            workbook[sheet_name].row_breaks.append(Break(id=row))
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+def replace_xlsx_parts(file_content, replace):
+    """replace(파트 이름, 바이트)가 돌려준 바이트로 파트를 바꾼 Excel 파일 생성"""
+    source = zipfile.ZipFile(io.BytesIO(file_content))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            target.writestr(item, replace(item.filename, source.read(item.filename)))
+    return output.getvalue()
+
+# =========================================================
+# Excel 그림 직접 추출
+# =========================================================
+
+def test_extract_xlsx_sheet_images_groups_pictures_per_sheet():
+    file_content = make_picture_workbook([("Data", ["B2"]), ("Labels", ["A1", "D30"])])
+
+    slide_images, page_sources = engine.extract_xlsx_sheet_images(file_content)
+
+    assert [len(slide_images[page_num]) for page_num in sorted(slide_images)] == [1, 1, 1]
+    assert [page_sources[page_num][0] for page_num in sorted(page_sources)] == ["Data", "Labels", "Labels"]
+
+def test_extract_xlsx_sheet_images_falls_back_when_a_picture_cannot_be_read():
+    file_content = make_picture_workbook([("Data", ["B2"]), ("Labels", ["A1"])])
+    broken = replace_xlsx_parts(file_content,
+                                lambda name, data: b"not an image" if name == "xl/media/image2.png" else data)
+
+    # 읽을 수 없는 그림이 있는 페이지를 빈 페이지("not_expected")로 넘기지 않고 문서 변환으로 검출
+    assert engine.extract_xlsx_sheet_images(broken) is None
+
+def test_build_xlsx_print_subset_round_trips_through_openpyxl():
+    openpyxl = pytest.importorskip("openpyxl")
+    file_content = make_picture_workbook([("Notes", []), ("Data", ["B2"]), ("Labels", ["C3", "C40"])],
+                                         print_areas={"Notes": "A1:B2", "Data": "A1:Z99"})
+
+    subset_content, sheet_blocks = engine.build_xlsx_print_subset(file_content)
+    workbook = openpyxl.load_workbook(io.BytesIO(subset_content))
+
+    assert sorted(sheet_blocks) == ["Data", "Labels"]
+    # 그림이 없는 시트는 숨기고 사용자가 지정한 인쇄 영역도 제거
+    assert workbook["Notes"].sheet_state == "hidden"
+    assert not workbook["Notes"].print_area
+    # 기존 인쇄 영역을 그림 영역으로 교체하고, 시트 순서(localSheetId)에 맞는 시트에 지정
+    assert workbook["Data"].print_area == "'Data'!$A$1:$D$6"
+    assert workbook["Labels"].print_area == "'Labels'!$B$2:$E$7,'Labels'!$B$39:$E$44"
+    for sheet_name in ("Data", "Labels"):
+        worksheet = workbook[sheet_name]
+        assert worksheet.sheet_state == "visible"
+        assert worksheet.sheet_properties.pageSetUpPr.fitToPage
+        assert (worksheet.page_setup.fitToWidth, worksheet.page_setup.fitToHeight) == (1, 0)
+    assert workbook.active.title == "Data"
+    # 그림은 그대로 남아 직접 추출 결과가 같음
+    slide_images, page_sources = engine.extract_xlsx_sheet_images(subset_content)
+    assert [page_sources[page_num][0] for page_num in sorted(page_sources)] == ["Data", "Labels", "Labels"]
+
+def test_write_xlsx_xml_keeps_original_prefixes():
+    blob = (b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            b'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+            b'xmlns:x14ac="http://schemas.microsoft.com/office/spreadsheetml/2009/9/ac" '
+            b'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+            b'mc:Ignorable="x14ac"><sheetData/><drawing r:id="rId1"/></worksheet>')
+    registered = dict(engine.ET._namespace_map)
+
+    root, namespaces = engine.parse_xlsx_xml(blob)
+    engine.fit_xlsx_sheet_to_width(root)
+    written = engine.write_xlsx_xml(root, namespaces)
+
+    # mc:Ignorable이 참조하는 x14ac 선언과 원래 접두사가 그대로 남음
+    assert b'xmlns:x14ac="http://schemas.microsoft.com/office/spreadsheetml/2009/9/ac"' in written
+    assert b'mc:Ignorable="x14ac"' in written
+    assert b'<drawing r:id="rId1"' in written
+    assert b'<sheetPr><pageSetUpPr fitToPage="1"' in written
+    # 프로세스 전역 네임스페이스 접두사 등록을 바꾸지 않음
+    assert engine.ET._namespace_map == registered
+    reparsed = engine.ET.fromstring(written)
+    assert reparsed.find("main:drawing", engine.XLSX_NS).get(f"{{{engine.XLSX_NS['r']}}}id") == "rId1"
+
+def test_build_xlsx_print_subset_skips_workbook_without_pictures():
+    assert engine.build_xlsx_print_subset(make_xlsx()) is None
+
+def test_group_xlsx_pictures_splits_on_row_gap_without_breaks():
+    pictures = [("b.png", 30, 34, None), ("a.png", 0, 4, None),
+                ("c.png", 4 + engine.XLSX_PAGE_ROW_GAP, 50, None)]
+
+    pages = engine.group_xlsx_pictures(pictures, [])
+
+    # 행 순서로 정렬하고, 이전 그림의 끝 행에서 XLSX_PAGE_ROW_GAP행 이내면 같은 페이지
+    assert [(start, end, [p[0] for p in members]) for start, end, members in pages] == [
+        (0, 50, ["a.png", "c.png", "b.png"]),
+    ]
+    assert len(engine.group_xlsx_pictures([("a.png", 0, 4, None), ("b.png", 30, 34, None)], [])) == 2
+
+def test_group_xlsx_pictures_uses_manual_row_breaks():
+    pictures = [("a.png", 0, 4, None), ("b.png", 9, 12, None), ("c.png", 10, 14, None), ("d.png", 200, 204, None)]
+
+    # 10행 다음에서 나뉘므로(0부터 센 행 번호 10부터 다음 페이지) 가까운 b와 c도 다른 페이지
+    pages = engine.group_xlsx_pictures(pictures, [10, 100])
+
+    assert [(start, end, [p[0] for p in members]) for start, end, members in pages] == [
+        (0, 12, ["a.png", "b.png"]),
+        (10, 14, ["c.png"]),
+        (200, 204, ["d.png"]),
+    ]
+
+def test_extract_xlsx_sheet_images_follows_sheet_row_breaks():
+    plain = engine.extract_xlsx_sheet_images(make_picture_workbook([("Labels", ["A1", "A5"])]))[1]
+    split = engine.extract_xlsx_sheet_images(make_picture_workbook([("Labels", ["A1", "A5"])],
+                                                                   row_breaks={"Labels": [3]}))[1]
+
+    # 가까운 두 그림도 3행 다음의 페이지 나누기를 기준으로 다른 페이지
+    assert [source[:2] for source in plain.values()] == [("Labels", 1)]
+    assert [source[:2] for source in split.values()] == [("Labels", 1), ("Labels", 5)]
+
+def anchor(xml):
+    """드로잉 앵커 XML 조각을 요소로 변환"""
+    return engine.ET.fromstring(
+        f'<xdr:anchor xmlns:xdr="{engine.XLSX_NS["xdr"]}">{xml}</xdr:anchor>')
+
+def test_xlsx_anchor_box_for_each_anchor_type():
+    col, row = engine.XLSX_DEFAULT_COL_EMU, engine.XLSX_DEFAULT_ROW_EMU
+    marker = "<xdr:{0}><xdr:col>{1}</xdr:col><xdr:colOff>0</xdr:colOff><xdr:row>{2}</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:{0}>"
+
+    # twoCellAnchor: 시작/끝 셀 그대로
+    assert engine.xlsx_anchor_box(anchor(marker.format("from", 1, 2) + marker.format("to", 3, 8))) == (1, 2, 3, 8)
+    # oneCellAnchor: 크기를 기본 열 폭/행 높이로 나누어 올림
+    one_cell = marker.format("from", 1, 2) + f'<xdr:ext cx="{col * 2 + 1}" cy="{row * 3}"/>'
+    assert engine.xlsx_anchor_box(anchor(one_cell)) == (1, 2, 4, 5)
+    # absoluteAnchor: 위치도 기본 열 폭/행 높이로 환산
+    absolute = f'<xdr:pos x="{col * 2}" y="{row * 10 + 1}"/><xdr:ext cx="{col}" cy="{row}"/>'
+    assert engine.xlsx_anchor_box(anchor(absolute)) == (2, 10, 3, 11)
+
+# =========================================================
+# Office 파일 이미지 추출
+# =========================================================
+
+@pytest.mark.skipif(not engine.have_library("pdfium"), reason="pypdfium2 필요")
+@pytest.mark.parametrize("progress", [None, "callback"])
+def test_extract_images_from_office_file_with_or_without_progress(monkeypatch, progress):
+    calls = []
+
+    def fake_convert(file_content, file_extension, progress_callback=None, **kwargs):
+        if progress_callback:
+            progress_callback(100)
+        return make_pdf(page_count=2)
+
+    monkeypatch.setattr(engine, "convert_office_to_pdf", fake_convert)
+    callback = (lambda p, status: calls.append((p, status))) if progress else None
+
+    slide_images = engine.extract_images_from_office_file(make_xlsx(), "xlsx", callback)
+
+    assert sorted(slide_images) == [1, 2]
+    assert all(len(images) == 1 for images in slide_images.values())
+    if progress:
+        assert calls[-1] == (100, "이미지 추출 완료")
+        assert (40.0, "Office 파일을 PDF로 변환 중...") in calls
+
+# =========================================================
+# 문서 전체 판정
+# =========================================================
+
+def page_result(validation_mode, detection_status="complete", passed=True, **fields):
+    """검증 모드에 맞는 페이지 결과 생성 (passed이면 모드의 바코드가 모두 발견되고 규격에 맞음)"""
+    result = engine.new_page_result(validation_mode)
+    result["detection_status"] = detection_status
+    if passed:
+        if validation_mode != "18x18":
+            result.update({"44x44_found": True, "44x44_valid": True})
+        if validation_mode != "44x44":
+            result.update({"18x18_found": True, "18x18_valid": True})
+        result["cross_valid"] = validation_mode == "both"
+    result.update(fields)
+    return result
+
+@pytest.mark.parametrize("validation_mode", ["44x44", "18x18", "both"])
+def test_summarize_page_results_fails_when_no_page_can_be_judged(validation_mode):
+    only_text_slides = {page_num: page_result(validation_mode, "not_expected", passed=False)
+                        for page_num in (1, 2)}
+
+    assert engine.summarize_page_results(only_text_slides, validation_mode) == {"status": "fail", "issue_pages": []}
+    assert engine.summarize_page_results({}, validation_mode) == {"status": "fail", "issue_pages": []}
+
+SUMMARY_CASES = [
+    # (검증 모드, 페이지 결과 필드, 판정)
+    ("44x44", {}, "pass"),
+    ("44x44", {"has_warnings": True}, "warning"),
+    ("44x44", {"s_value_warning": True}, "warning"),
+    ("44x44", {"s_value_invalid": True}, "warning"),
+    ("44x44", {"s_value_invalid": True, "s_duplicate_with": 1}, "fail"),
+    ("44x44", {"has_duplicate_44x44": True}, "fail"),
+    ("44x44", {"44x44_valid": False}, "fail"),
+    ("18x18", {}, "pass"),
+    ("18x18", {"has_warnings": True}, "pass"),  # 18x18만 검증할 때는 확인 필요 항목 없음
+    ("18x18", {"p_value_duplicate": True}, "fail"),
+    ("18x18", {"18x18_found": False}, "fail"),
+    ("both", {}, "pass"),
+    ("both", {"has_warnings": True}, "warning"),
+    ("both", {"cross_valid": False}, "fail"),
+    ("both", {"p_value_duplicate": True}, "fail"),
+    ("both", {"has_duplicate_44x44": True}, "fail"),
+    ("both", {"s_value_invalid": True, "s_duplicate_with": 1}, "fail"),
+    ("both", {"18x18_valid": False}, "fail"),
+]
+
+@pytest.mark.parametrize("validation_mode, fields, status", SUMMARY_CASES)
+def test_summarize_page_results_for_each_mode(validation_mode, fields, status):
+    page_results = {1: page_result(validation_mode), 2: page_result(validation_mode, **fields)}
+
+    summary = engine.summarize_page_results(page_results, validation_mode)
+
+    assert summary == {"status": status, "issue_pages": [2] if status == "fail" else []}
+
+@pytest.mark.parametrize("validation_mode", ["44x44", "18x18", "both"])
+def test_summarize_page_results_ignores_pages_without_images(validation_mode):
+    page_results = {
+        3: page_result(validation_mode, passed=False),
+        1: page_result(validation_mode, "not_expected", passed=False),
+        2: page_result(validation_mode),
+        4: page_result(validation_mode, "deadline", passed=False),
+    }
+
+    summary = engine.summarize_page_results(page_results, validation_mode)
+
+    # 시간 예산을 넘겨 중단된 페이지는 판단에 포함, 바코드가 없는 슬라이드는 제외
+    assert summary == {"status": "fail", "issue_pages": [3, 4]}
+    del page_results[3], page_results[4]
+    assert engine.summarize_page_results(page_results, validation_mode) == {"status": "pass", "issue_pages": []}
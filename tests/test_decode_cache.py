@@ -0,0 +1,100 @@
+"""decode_cache.DecodeCache 테스트 (메모리 LRU 크기 한도, SQLite 디스크 캐시)"""
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from decode_cache import DecodeCache
+
+def payload_size(value):
+    """캐시가 크기 계산에 사용하는 직렬화 길이"""
+    return len(json.dumps(value, ensure_ascii=False))
+
+def test_memory_lru_evicts_least_recently_used_within_byte_budget():
+    value = {"barcodes": ["x" * 20]}
+    size = payload_size(value)
+    cache = DecodeCache(max_memory_bytes=size * 2)
+
+    cache.put("a", value)
+    cache.put("b", value)
+    assert cache.get("a") == value  # a를 최근 사용으로 갱신
+    cache.put("c", value)  # 한도 초과 -> 가장 오래 사용하지 않은 b 제거
+
+    assert cache.get("b") is None
+    assert cache.get("a") == value
+    assert cache.get("c") == value
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2
+    assert stats["memory_bytes"] == size * 2
+
+def test_replacing_key_does_not_double_count_bytes():
+    cache = DecodeCache(max_memory_bytes=1000)
+    cache.put("a", {"barcodes": ["old"]})
+    cache.put("a", {"barcodes": ["new value"]})
+
+    assert cache.stats()["memory_bytes"] == payload_size({"barcodes": ["new value"]})
+    assert cache.get("a") == {"barcodes": ["new value"]}
+
+def test_oversize_entry_is_not_kept_in_memory():
+    cache = DecodeCache(max_memory_bytes=10)
+    cache.put("small", [1])
+    cache.put("big", {"barcodes": ["x" * 100]})
+
+    assert cache.get("big") is None
+    assert cache.get("small") == [1]
+    assert cache.stats()["memory_bytes"] == payload_size([1])
+
+def test_disk_cache_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "cache" / "decode.sqlite")
+    DecodeCache(db_path=db_path).put("page", {"barcodes": ["A", "B"]})
+
+    reopened = DecodeCache(db_path=db_path)
+    assert reopened.get("page") == {"barcodes": ["A", "B"]}
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1
+    # 디스크에서 읽은 값은 메모리 캐시에도 올라감
+    assert reopened.get("page") == {"barcodes": ["A", "B"]}
+    assert reopened.stats()["memory_hits"] == 1
+
+def test_oversize_entry_is_still_written_to_disk(tmp_path):
+    db_path = str(tmp_path / "decode.sqlite")
+    DecodeCache(max_memory_bytes=10, db_path=db_path).put("big", {"barcodes": ["x" * 100]})
+
+    assert DecodeCache(db_path=db_path).get("big") == {"barcodes": ["x" * 100]}
+
+def test_disk_entries_are_trimmed_by_last_use(tmp_path):
+    db_path = str(tmp_path / "decode.sqlite")
+    cache = DecodeCache(max_memory_bytes=0, db_path=db_path, max_disk_entries=2)
+    cache.put("a", 1)
+    time.sleep(0.01)
+    cache.put("b", 2)
+    time.sleep(0.01)
+    assert cache.get("a") == 1  # a의 마지막 사용 시각 갱신
+    time.sleep(0.01)
+    cache.put("c", 3)  # 한도 초과 -> 가장 오래 사용하지 않은 b 제거
+
+    reopened = DecodeCache(db_path=db_path)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == 1
+    assert reopened.get("c") == 3
+
+def test_disk_connections_are_closed(tmp_path):
+    connections = []
+
+    class TrackingCache(DecodeCache):
+        def _connect(self):
+            conn = super()._connect()
+            connections.append(conn)
+            return conn
+
+    cache = TrackingCache(max_memory_bytes=0, db_path=str(tmp_path / "decode.sqlite"))
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    cache.clear()
+
+    assert len(connections) == 4
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
@@ -0,0 +1,55 @@
+"""office_converter 테스트 (LibreOffice 없이 실행되는 부분)"""
+
+import queue
+import threading
+import time
+
+import pytest
+
+from office_converter import FairSlotQueue
+
+def wait_for_depth(slots, depth, timeout=5):
+    """대기 중인 요청 수가 depth가 될 때까지 대기"""
+    deadline = time.time() + timeout
+    while slots.stats()["queue_depth"] != depth:
+        assert time.time() < deadline, "대기열에 요청이 쌓이지 않았습니다."
+        time.sleep(0.005)
+
+def test_fair_slot_queue_alternates_between_waiting_sessions():
+    slots = FairSlotQueue()
+    slots.put("slot")
+    held = slots.get("main")  # 슬롯을 잡아 두고 두 세션의 요청을 쌓음
+    grants = []
+
+    def convert(client_id):
+        slot = slots.get(client_id, timeout=5)
+        grants.append(client_id)  # 슬롯이 하나뿐이므로 기록 순서가 배정 순서
+        slots.put(slot)
+
+    threads = []
+    # 세션 A가 먼저 4건을 쌓은 뒤 세션 B가 2건을 요청
+    for client_id in ["A"] * 4 + ["B"] * 2:
+        thread = threading.Thread(target=convert, args=(client_id,))
+        thread.start()
+        threads.append(thread)
+        wait_for_depth(slots, len(threads))
+
+    slots.put(held)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert grants == ["A", "B", "A", "B", "A", "A"]
+    stats = slots.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 6
+    assert stats["idle"] == 1
+
+def test_fair_slot_queue_timeout_withdraws_request():
+    slots = FairSlotQueue()
+
+    with pytest.raises(queue.Empty):
+        slots.get("A", timeout=0.05)
+
+    assert slots.stats()["waiting_sessions"] == 0
+    slots.put("slot")
+    assert slots.get("B", timeout=1) == "slot"
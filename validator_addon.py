@@ -140,47 +140,60 @@ def validate_pages_s_values(page_results):
     
     return page_results
 
-def process_page_validation(page_results, slide_images, page_tabs, session_state):
+def validate_cross_page(page_results, validation_mode):
     """
-    페이지간 검증 처리를 수행하는 통합 함수
+    페이지간 검증 수행 (화면 출력 없음)
     
     Parameters:
     -----------
     page_results : dict
         각 페이지의 검증 결과를 담은 딕셔너리
-    slide_images : dict
-        각 슬라이드/페이지의 이미지 정보를 담은 딕셔너리
-    page_tabs : list
-        각 페이지 탭 객체의 리스트
-    session_state : object
-        StreamLit 세션 상태 객체
+    validation_mode : str
+        검증 모드 ("both", "44x44", "18x18")
         
     Returns:
     --------
     dict : 업데이트된 page_results 딕셔너리
     """
-    import streamlit as st
-    
     if not page_results:
         return page_results
         
     # 1. 18x18의 P 값 중복 검사 (18x18 검증 모드일 때만)
-    if session_state.validation_mode in ["both", "18x18"]:
+    if validation_mode in ["both", "18x18"]:
         page_results = validate_pages_p_values(page_results)
     
     # 2. 44x44의 S 값 검증 (중복 및 B 순서 확인) (44x44 검증 모드일 때만)
-    if session_state.validation_mode in ["both", "44x44"]:
+    if validation_mode in ["both", "44x44"]:
         page_results = validate_pages_s_values(page_results)
     
+    return page_results
+
+def display_page_validation(page_results, slide_images, page_tabs, validation_mode):
+    """
+    페이지간 검증 결과를 각 페이지 탭에 표시
+    
+    Parameters:
+    -----------
+    page_results : dict
+        validate_cross_page로 검증한 page_results 딕셔너리
+    slide_images : dict
+        각 슬라이드/페이지의 이미지 정보를 담은 딕셔너리
+    page_tabs : list
+        각 페이지 탭 객체의 리스트
+    validation_mode : str
+        검증 모드 ("both", "44x44", "18x18")
+    """
+    import streamlit as st
+    
     # 페이지간 유효성 검사 결과 표시
     for page_num, result in page_results.items():
         # P 값 중복 관련 오류 표시 (18x18 검증 모드일 때만)
-        if session_state.validation_mode in ["both", "18x18"] and result.get("p_value_duplicate", False):
+        if validation_mode in ["both", "18x18"] and result.get("p_value_duplicate", False):
             with page_tabs[list(sorted(slide_images.keys())).index(page_num)]:
                 st.error(f"\u274c 페이지간 검증 오류: {result.get('p_duplicate_message')}")
         
         # S 값 관련 오류/경고 표시 (44x44 검증 모드일 때만)
-        if session_state.validation_mode in ["both", "44x44"]:
+        if validation_mode in ["both", "44x44"]:
             # S 값 중복은 오류로 표시
             if result.get("s_value_invalid", False) and result.get("s_duplicate_with", None):
                 with page_tabs[list(sorted(slide_images.keys())).index(page_num)]:
@@ -189,5 +202,30 @@ def process_page_validation(page_results, slide_images, page_tabs, session_state
             elif result.get("s_value_warning", False) or (result.get("s_value_invalid", False) and not result.get("s_duplicate_with", None)):
                 with page_tabs[list(sorted(slide_images.keys())).index(page_num)]:
                     st.warning(f"\u26a0\ufe0f 페이지간 검증 확인 필요: {result.get('s_invalid_message')}")
+
+def process_page_validation(page_results, slide_images, page_tabs, session_state):
+    """
+    페이지간 검증 처리를 수행하는 통합 함수 (검증 후 결과 표시)
+    
+    Parameters:
+    -----------
+    page_results : dict
+        각 페이지의 검증 결과를 담은 딕셔너리
+    slide_images : dict
+        각 슬라이드/페이지의 이미지 정보를 담은 딕셔너리
+    page_tabs : list
+        각 페이지 탭 객체의 리스트
+    session_state : object
+        StreamLit 세션 상태 객체
+        
+    Returns:
+    --------
+    dict : 업데이트된 page_results 딕셔너리
+    """
+    if not page_results:
+        return page_results
+    
+    page_results = validate_cross_page(page_results, session_state.validation_mode)
+    display_page_validation(page_results, slide_images, page_tabs, session_state.validation_mode)
     
     return page_results